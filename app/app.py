@@ -1,5 +1,6 @@
 from pathlib import Path
 import panel as pn
+from src.framework.data.shard_catalog import ShardCatalog
 from .database_explorer import DatabaseExplorer
 
 def find_repo_root():
@@ -16,6 +17,10 @@ def main():
     # Get the root directory and construct database path
     repo_root = find_repo_root()
     db_path = repo_root / "simulation.duckdb"
+
+    # Runs written to per-run shards are listed in the catalog at db_path
+    shard_dir = repo_root / "runs"
+    shard_catalog = ShardCatalog(str(db_path), str(shard_dir)) if shard_dir.exists() else None
     
     if not db_path.exists():
         raise FileNotFoundError(
@@ -25,8 +30,15 @@ def main():
     
     print(f"Using database at: {db_path}")
     
+    # Historical event archive written by the EventIndexer, if any
+    archive_dir = repo_root / "event_archive"
+
     # Create and launch the application
-    app = DatabaseExplorer(str(db_path))
+    app = DatabaseExplorer(
+        str(db_path),
+        archive_dir=str(archive_dir) if archive_dir.exists() else None,
+        shard_catalog=shard_catalog
+    )
     return pn.serve(app.show())
 
 if __name__ == "__main__":
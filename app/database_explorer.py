@@ -294,9 +294,15 @@ class DatabaseExplorer(param.Parameterized):
     sql_query     = param.String(default='')
     current_query = param.String(default='')
 
-    def __init__(self, db_path):
+    def __init__(self, db_path, archive_dir=None, shard_catalog=None):
         super().__init__()
-        self.conn = duckdb.connect(db_path, read_only=True)
+        # With a shard catalog, runs are browsed through union views over their shards
+        if shard_catalog is not None:
+            self.conn = shard_catalog.connect()
+        else:
+            self.conn = duckdb.connect(db_path, read_only=True)
+        if archive_dir:
+            self._attach_event_archive(archive_dir)
 
         self.tables  = self._get_tables()
         self.schemas = self._get_schemas()
@@ -305,6 +311,18 @@ class DatabaseExplorer(param.Parameterized):
         self.current_df = pd.DataFrame()
         self.create_layout()
 
+    def _attach_event_archive(self, archive_dir):
+        """Expose the Parquet event archive as the `historical_events` view."""
+        pattern = str(Path(archive_dir) / '**' / '*.parquet')
+        try:
+            self.conn.execute(f"""
+                CREATE OR REPLACE TEMP VIEW historical_events AS
+                SELECT * FROM read_parquet('{pattern}', hive_partitioning = true,
+                                           hive_types_autocast = false, union_by_name = true)
+            """)
+        except Exception as e:
+            print(f"Error attaching event archive at {archive_dir}: {e}")
+
     def _load_queries(self):
         queries = {'Custom Query': None}
         try:
@@ -325,9 +343,10 @@ class DatabaseExplorer(param.Parameterized):
 
     def _get_tables(self):
         rows = self.conn.execute(
-            "SELECT table_name FROM information_schema.tables WHERE table_schema='main'"
+            "SELECT table_name FROM information_schema.tables WHERE table_schema='main' "
+            "AND table_catalog NOT LIKE 'run\\_%' ESCAPE '\\'"
         ).fetchall()
-        return sorted([r[0] for r in rows])
+        return sorted({r[0] for r in rows})
 
     def _get_schemas(self):
         schemas = {}
@@ -0,0 +1,14 @@
+-- Events sent by the agents of one profile; the join runs on address keys
+SELECT 
+    a.name AS profile,
+    e.event_name,
+    COUNT(*) AS events,
+    COUNT(DISTINCT e.transaction_hash) AS transactions
+FROM events e
+JOIN agent_addresses aa 
+    ON aa.address_id = e.tx_from_id 
+    AND aa.simulation_run_id = e.simulation_run_id
+JOIN agents a ON a.agent_id = aa.agent_id
+WHERE a.name = 'arbitrage_user'
+GROUP BY a.name, e.event_name
+ORDER BY events DESC
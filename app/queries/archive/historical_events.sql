@@ -0,0 +1,11 @@
+SELECT 
+    contract,
+    event,
+    block_number,
+    block_timestamp,
+    transaction_hash,
+    tx_from,
+    tx_to
+FROM historical_events 
+ORDER BY block_number DESC 
+LIMIT 100
@@ -0,0 +1,9 @@
+SELECT 
+    simulation_run_id,
+    coalesce(id::VARCHAR, id_raw) as token_id,
+    count(*) as transfers,
+    sum(value) as total_transferred
+FROM event_TransferSingle 
+GROUP BY ALL
+ORDER BY total_transferred DESC 
+LIMIT 100
@@ -4,6 +4,6 @@ SELECT
     event_name,
     contract_address,
     json_pretty(event_data) as event_data
-FROM events 
+FROM events_view 
 ORDER BY block_timestamp DESC 
 LIMIT 100
\ No newline at end of file
@@ -9,6 +9,7 @@ setup(
         "eth-ape[recommended-plugins]",
         "pandas",
         "duckdb>=0.9.0",
+        "pyarrow>=14.0.0",
         "click>=8.0.0",
         "python-dotenv>=0.19.0",
         "requests>=2.32.3",
@@ -2,10 +2,12 @@
 from .profile import AgentProfile, ActionConfig 
 from .base_agent import BaseAgent
 from .agent_manager import AgentManager
+from .scheduler import AgentScheduler
 
 __all__ = [
     'ActionConfig', 
     'AgentProfile',
     'BaseAgent',
-    'AgentManager'
+    'AgentManager',
+    'AgentScheduler'
 ]
\ No newline at end of file
@@ -40,14 +40,18 @@ class AgentManager:
 
     def create_agent(self, profile_name: str) -> BaseAgent:
         """Create a new agent given a profile name."""
-        profile = self._create_profile(profile_name)
-        agent_id = str(uuid.uuid4())
-        
-        agent = BaseAgent(agent_id, profile, self.data_collector)
+        agent = self._build_agent(self._create_profile(profile_name))
         
         # Record agent BEFORE creating any addresses
         if self.data_collector and self.data_collector.current_run_id:
             self.data_collector.record_agent(agent)
+
+        return agent
+
+    def _build_agent(self, profile: AgentProfile) -> BaseAgent:
+        """Create an agent and register it and its addresses, without recording it"""
+        agent_id = str(uuid.uuid4())
+        agent = BaseAgent(agent_id, profile, self.data_collector)
         
         # Store agent in agents dictionary
         self.agents[agent_id] = agent
@@ -58,15 +62,25 @@ class AgentManager:
 
         return agent
 
-    def create_agents(self, distribution: Optional[Dict[str, int]] = None) -> List[BaseAgent]:
-        """Create multiple agents according to distribution"""
+    def create_agents(self, distribution: Optional[Dict[str, int]] = None, bulk: bool = True) -> List[BaseAgent]:
+        """
+        Create multiple agents according to distribution.
+
+        In bulk mode all agents are recorded with one collector call once
+        they are created, rather than one insert and commit per agent.
+        """
         distribution = distribution or self.agent_distribution
         created_agents = []
         
         for profile_name, count in distribution.items():
+            if not bulk:
+                created_agents.extend(self.create_agent(profile_name) for _ in range(count))
+                continue
             for _ in range(count):
-                agent = self.create_agent(profile_name)
-                created_agents.append(agent)
+                created_agents.append(self._build_agent(self._create_profile(profile_name)))
+
+        if bulk and self.data_collector and self.data_collector.current_run_id:
+            self.data_collector.record_agents(created_agents)
                 
         logger.info(f"Created {len(created_agents)} agents across {len(distribution)} profiles")
         return created_agents
@@ -11,6 +11,8 @@ import logging
 
 logger = get_logger(__name__, logging.INFO)
 
+# Blocks before a failed sequence may be started or continued again
+SEQUENCE_RETRY_BLOCKS = 300
 
 
 class BaseAgent:
@@ -169,7 +171,7 @@ class BaseAgent:
                     # Continue active sequence if not in cooldown
                     if seq_state["active"]:
                         if not seq_state.get("last_failed_block") or \
-                        (current_block - seq_state["last_failed_block"]) >= 300:
+                        (current_block - seq_state["last_failed_block"]) >= SEQUENCE_RETRY_BLOCKS:
                             action_tuple = self._execute_sequence_step(address, seq_def, seq_state, current_block)
                             if action_tuple:
                                 # Return only action name and address
@@ -190,7 +192,7 @@ class BaseAgent:
                         seq_state["sequence_executions"] >= seq_def.max_executions):
                         continue
                     if seq_state.get("last_failed_block") and \
-                    (current_block - seq_state["last_failed_block"]) < 300:
+                    (current_block - seq_state["last_failed_block"]) < SEQUENCE_RETRY_BLOCKS:
                         continue
 
                     # Start new sequence
@@ -213,6 +215,49 @@ class BaseAgent:
                 
         return None, ""
     
+    def next_eligible_block(self, current_block: int) -> Optional[int]:
+        """
+        Earliest block at which select_action may return an action.
+
+        Derived from the same state select_action reads (last_action_blocks
+        with cooldown_blocks, execution limits, sequence failure backoff),
+        and never later than the true block, so a scheduler can skip the
+        agent until then without missing anything.
+
+        Returns:
+            A block >= current_block, or None when no action can ever be
+            selected again (all limits reached)
+        """
+        seq_probability = getattr(self.profile.base_config, "sequence_probability", 0.0)
+        blocked_until = current_block
+        candidates = []
+
+        for address in self.accounts:
+            for seq_def in self.profile.sequences:
+                seq_state = self.sequence_states[address][seq_def.name]
+                if seq_state.get("active"):
+                    return current_block
+                failed_block = seq_state.get("last_failed_block")
+                if failed_block and seq_state.get("failed_action"):
+                    # Nothing is selected while a failed action cools down
+                    action_config = self.profile.get_action_config(seq_state["failed_action"])
+                    if action_config:
+                        blocked_until = max(blocked_until, failed_block + action_config.cooldown_blocks)
+                if seq_probability > 0 and (
+                    seq_def.max_executions is None or
+                    seq_state["sequence_executions"] < seq_def.max_executions
+                ):
+                    candidates.append(failed_block + SEQUENCE_RETRY_BLOCKS if failed_block else current_block)
+
+            for action_name, config in self.profile.action_configs.items():
+                if config.sequence_only or self._max_executions_reached(action_name, address):
+                    continue
+                candidates.append(self.last_action_blocks[address].get(action_name, 0) + config.cooldown_blocks)
+
+        if not candidates:
+            return None
+        return max(blocked_until, min(candidates))
+
     def _prepare_master_params(self, action_config: Dict[str, Any], address: str) -> Dict[str, Any]:
         """New method to prepare master interface parameters"""
         params = {
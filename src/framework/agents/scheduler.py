@@ -0,0 +1,89 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import heapq
+from .base_agent import BaseAgent
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class AgentScheduler:
+    """
+    Agents in a min-heap keyed by the next block they can act in.
+
+    Each iteration only the agents that are due are handed out (see
+    BaseAgent.next_eligible_block), so the cost of an iteration follows the
+    number of agents able to act rather than the population. Agents whose
+    every action is exhausted are looked at again every `dormant_interval`
+    blocks, in case they gain accounts or actions.
+
+    Due agents must be handed back with reschedule() once they have acted;
+    any that are not are simply due again on the next call to due().
+    """
+
+    def __init__(self, dormant_interval: int = 1000):
+        self.dormant_interval = dormant_interval
+        self._heap: List[Tuple[int, int, str]] = []
+        self._scheduled: Dict[str, int] = {}  # agent_id -> block of its live heap entry
+        self._agents: Dict[str, BaseAgent] = {}
+        self._in_flight: Dict[str, BaseAgent] = {}
+        self._counter = 0
+        self.visited = 0
+        self.skipped = 0
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def _push(self, agent: BaseAgent, block: int):
+        self._counter += 1
+        self._scheduled[agent.agent_id] = block
+        heapq.heappush(self._heap, (block, self._counter, agent.agent_id))
+
+    def sync(self, agents: Iterable[BaseAgent], current_block: int):
+        """Schedule agents not seen before (due immediately)"""
+        for agent in agents:
+            if agent.agent_id not in self._agents:
+                self._agents[agent.agent_id] = agent
+                self._push(agent, current_block)
+
+    def reschedule(self, agent: BaseAgent, current_block: int):
+        """Put an agent back at its next eligible block"""
+        self._in_flight.pop(agent.agent_id, None)
+        block = agent.next_eligible_block(current_block)
+        if block is None:
+            block = current_block + self.dormant_interval
+        self._push(agent, max(block, current_block + 1))
+
+    def due(self, current_block: int) -> List[BaseAgent]:
+        """
+        Remove and return every agent that can act at current_block.
+
+        Agents handed out by the previous call and never rescheduled are
+        due again.
+        """
+        for agent in list(self._in_flight.values()):
+            self._push(agent, current_block)
+        self._in_flight.clear()
+
+        due = []
+        while self._heap and self._heap[0][0] <= current_block:
+            block, _, agent_id = heapq.heappop(self._heap)
+            # Skip entries superseded by a later reschedule
+            if self._scheduled.get(agent_id) != block:
+                continue
+            del self._scheduled[agent_id]
+            agent = self._agents[agent_id]
+            self._in_flight[agent_id] = agent
+            due.append(agent)
+
+        self.visited += len(due)
+        self.skipped += len(self._agents) - len(due)
+        return due
+
+    def next_block(self) -> Optional[int]:
+        """Earliest block at which some agent is due"""
+        while self._heap and self._scheduled.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def stats(self) -> Dict[str, int]:
+        return {'agents': len(self._agents), 'visited': self.visited, 'skipped': self.skipped}
@@ -42,6 +42,7 @@ class SimulationContext:
         self.graph_manager: Optional[GraphManager] = None
         self._last_graph_rebuild: Optional[datetime] = None
         self.current_action: Optional[str] = None 
+        self.action_metrics: Dict[str, Any] = {}  # Timings and cost of the current action (MasterClient.execute)
 
         
     def rebuild_graph(self) -> None:
@@ -1,9 +1,11 @@
 from typing import Dict, Optional, Any, List, Tuple
 from datetime import datetime
 import random
+import time
 from ape import chain
 from src.framework.agents.agent_manager import AgentManager
 from src.framework.agents.base_agent import BaseAgent
+from src.framework.agents.scheduler import AgentScheduler
 from src.framework.data import DataCollector
 from src.framework.logging import get_logger
 from .context import SimulationContext
@@ -18,12 +20,20 @@ class NetworkEvolver():
         agent_manager: AgentManager,
         collector: Optional[DataCollector] = None,
         gas_limits: Optional[Dict] = None,
+        scheduler: Optional[AgentScheduler] = None,
+        fast_forward: bool = False
     ):
         self.clients = clients
         self.agent_manager = agent_manager
         self.collector = collector
         self.gas_limits = gas_limits
+        # Only agents out of cooldown are visited when set; otherwise all, every iteration
+        self.scheduler = scheduler
         self._iteration_cache = {}
+        # Fast-forward mode: skip idle blocks and mine with one anvil_mine call
+        self.fast_forward = fast_forward
+        # Cleared once the provider rejects anvil_mine
+        self._anvil_mine = fast_forward
         
         self.network_state = {
             'current_block': 0,
@@ -79,16 +89,28 @@ class NetworkEvolver():
     def advance_time(self, blocks: int, block_time: int = 5) -> bool:
         """
         Advance chain time by specified blocks
+
+        In fast-forward mode all blocks are mined, `block_time` seconds
+        apart, with a single anvil_mine call; otherwise (or when the provider
+        lacks it) they are mined in small batches.
         """
         try:
-            batch_size = 5
-            total_mined = 0
-            
-            while total_mined < blocks:
-                current_batch = min(batch_size, blocks - total_mined)
-                chain.mine(current_batch)
-                chain.pending_timestamp += current_batch * block_time
-                total_mined += current_batch
+            if self._anvil_mine:
+                try:
+                    chain.provider.make_request('anvil_mine', [hex(blocks), hex(block_time)])
+                except Exception as e:
+                    logger.warning(f"anvil_mine unavailable, mining in batches: {e}")
+                    self._anvil_mine = False
+
+            if not self._anvil_mine:
+                batch_size = 5
+                total_mined = 0
+
+                while total_mined < blocks:
+                    current_batch = min(batch_size, blocks - total_mined)
+                    chain.mine(current_batch)
+                    chain.pending_timestamp += current_batch * block_time
+                    total_mined += current_batch
 
             logger.debug(
                 f"Advanced chain by {blocks} blocks. "
@@ -100,6 +122,31 @@ class NetworkEvolver():
         except Exception as e:
             logger.error(f"Failed to advance time: {e}", exc_info=True)
             return False
+
+    def blocks_to_next_activity(self, blocks: int, max_blocks: int) -> int:
+        """
+        Blocks to mine so the next iteration lands where some agent can act.
+
+        Without a scheduler, or before it knows every agent, this is just
+        `blocks`; otherwise idle blocks up to the scheduler's next due block
+        are skipped, at most `max_blocks` at a time.
+
+        Args:
+            blocks: Blocks per iteration
+            max_blocks: Largest jump allowed
+
+        Returns:
+            Number of blocks to mine (never fewer than `blocks`)
+        """
+        if not self.scheduler or len(self.scheduler) != len(self.agent_manager.agents):
+            return blocks
+        next_block = self.scheduler.next_block()
+        if next_block is None:
+            return blocks
+        gap = next_block - chain.blocks.head.number
+        if gap <= blocks:
+            return blocks
+        return max(blocks, min(gap, max_blocks))
             
     def evolve_network(self, iteration: int) -> Dict[str, int]:
         """Main evolution loop"""
@@ -111,14 +158,20 @@ class NetworkEvolver():
             logger.debug(f"Master handler present: {self.master_handler is not None}")
             logger.debug(f"Master client present: {bool(self.clients.get('master'))}")
 
-            all_agents = list(self.agent_manager.agents.values())
-            random.shuffle(all_agents)
-
             self.network_state.update({
                 'current_block': chain.blocks.head.number,
                 'current_time': chain.blocks.head.timestamp,
             })
 
+            if self.scheduler:
+                if len(self.scheduler) != len(self.agent_manager.agents):
+                    self.scheduler.sync(self.agent_manager.agents.values(), self.network_state['current_block'])
+                all_agents = self.scheduler.due(self.network_state['current_block'])
+            else:
+                all_agents = list(self.agent_manager.agents.values())
+            random.shuffle(all_agents)
+
+            executed_actions = []
             for agent in all_agents:
                 logger.debug(f"Processing agent {agent.agent_id}")
                 context = SimulationContext(
@@ -133,13 +186,17 @@ class NetworkEvolver():
                     iteration_cache=self._iteration_cache
                 )
 
+                started = time.perf_counter()
                 implementation, acting_address = agent.select_action(
                     self.network_state['current_block'],
                     self.network_state
                 )
+                selection_ms = (time.perf_counter() - started) * 1000
 
                 if not implementation:
                     logger.debug("No implementation selected")
+                    if self.scheduler:
+                        self.scheduler.reschedule(agent, self.network_state['current_block'])
                     continue
 
                 if not self.master_handler:
@@ -167,6 +224,22 @@ class NetworkEvolver():
                     success=success,
                     context=context
                 )
+                if self.scheduler:
+                    self.scheduler.reschedule(agent, self.network_state['current_block'])
+                executed_actions.append({
+                    'agent_id': agent.agent_id,
+                    'address': acting_address,
+                    'action_type': implementation,
+                    'block_number': self.network_state['current_block'],
+                    'timestamp': datetime.fromtimestamp(self.network_state['current_time']),
+                    'success': bool(success),
+                    'selection_ms': selection_ms,
+                    **context.action_metrics
+                })
+
+            # One bulk write per iteration
+            if self.collector and executed_actions:
+                self.collector.record_agent_actions(executed_actions)
 
             return stats
             
@@ -1,4 +1,5 @@
 from .base_collector import BaseDataCollector
 from .collector import DataCollector
+from .parquet_collector import ParquetDataCollector
 
-__all__ = ['BaseDataCollector', 'DataCollector']
\ No newline at end of file
+__all__ = ['BaseDataCollector', 'DataCollector', 'ParquetDataCollector']
\ No newline at end of file
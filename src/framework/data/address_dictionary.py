@@ -0,0 +1,82 @@
+from typing import Any, Dict, Iterable, List, Optional
+from pathlib import Path
+import threading
+import duckdb
+import pyarrow as pa
+from eth_utils import is_hex_address, to_checksum_address
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+ADDRESS_SCHEMA = pa.schema([('address_id', pa.int32()), ('address', pa.string())])
+
+
+class AddressDictionary:
+    """
+    Integer keys for addresses, backed by the addresses table.
+
+    Fact tables (events, agent_addresses) store the key instead of the
+    42-character hex string; the *_view views resolve it back. Keys are
+    handed out in memory as addresses are first seen and new entries are
+    written with the next batch, before the rows that reference them.
+    """
+
+    def __init__(self, connection: duckdb.DuckDBPyConnection, sql_dir: Optional[Path] = None):
+        self.con = connection
+        sql_dir = sql_dir or Path(__file__).parent / "duckdb"
+        self.con.execute((sql_dir / "schema" / "addresses.up.sql").read_text())
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {
+            address.lower(): address_id
+            for address_id, address in self.con.execute("SELECT address_id, address FROM addresses").fetchall()
+        }
+        self._next_id = max(self._ids.values(), default=0) + 1
+        self._pending: List[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def key(self, address: Any) -> Optional[int]:
+        """Key of an address, assigning a new one on first sight"""
+        if address is None or address == '':
+            return None
+        address = str(address)
+        lookup = address.lower()
+        address_id = self._ids.get(lookup)
+        if address_id is not None:
+            return address_id
+        with self._lock:
+            address_id = self._ids.get(lookup)
+            if address_id is None:
+                address_id = self._next_id
+                self._next_id += 1
+                self._ids[lookup] = address_id
+                self._pending.append((address_id, to_checksum_address(address) if is_hex_address(address) else address))
+        return address_id
+
+    def keys(self, addresses: Iterable[Any]) -> List[Optional[int]]:
+        return [self.key(address) for address in addresses]
+
+    def take(self) -> Optional[pa.Table]:
+        """Addresses added since the last take, as an Arrow table"""
+        with self._lock:
+            if not self._pending:
+                return None
+            pending, self._pending = self._pending, []
+        ids, addresses = zip(*pending)
+        return pa.table({'address_id': list(ids), 'address': list(addresses)}, schema=ADDRESS_SCHEMA)
+
+    def write(self, batch: Optional[pa.Table] = None):
+        """Insert new addresses (from take() unless given); the caller commits"""
+        batch = batch if batch is not None else self.take()
+        if batch is None:
+            return
+        self.con.register('_address_batch', batch)
+        try:
+            # A key taken by another address means two dictionaries share the table
+            self.con.execute(
+                "INSERT INTO addresses (address_id, address) SELECT address_id, address FROM _address_batch"
+            )
+        finally:
+            self.con.unregister('_address_batch')
+        logger.debug(f"Recorded {batch.num_rows} new addresses")
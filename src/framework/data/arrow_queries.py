@@ -0,0 +1,108 @@
+from typing import Any, List, Optional, Sequence, Tuple
+import duckdb
+import pyarrow as pa
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Comparison operators accepted in filters (pyarrow.parquet filter form)
+FILTER_OPERATORS = {
+    '=': '=', '==': '=', '!=': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>=',
+    'in': 'IN', 'not in': 'NOT IN',
+}
+
+Filter = Tuple[str, str, Any]
+
+
+def _quote(name: str) -> str:
+    if '"' in name:
+        raise ValueError(f"Invalid identifier: {name}")
+    return f'"{name}"'
+
+
+def build_scan(
+    con: duckdb.DuckDBPyConnection,
+    source: str,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Sequence[Filter]] = None,
+    run_id: Optional[int] = None,
+    order_by: Optional[Sequence[str]] = None,
+    limit: Optional[int] = None
+) -> Tuple[str, List[Any]]:
+    """
+    Build a projected, filtered SELECT over a table or view.
+
+    Column names are checked against the source and values are bound as
+    parameters, so the projection and predicates reach DuckDB's scan
+    (zonemaps for tables, row group statistics for Parquet) as written.
+
+    Args:
+        con: Connection the source lives in
+        source: Table or view name
+        columns: Columns to return (all when None)
+        filters: (column, op, value) tuples, ANDed; op is one of
+            =, ==, !=, <, <=, >, >=, in, not in
+        run_id: Only rows of this run (simulation_run_id, or run_id)
+        order_by: Column names, each optionally followed by " DESC"
+        limit: Maximum number of rows
+
+    Returns:
+        (sql, params)
+    """
+    available = [d[0] for d in con.execute(f"SELECT * FROM {_quote(source)} LIMIT 0").description]
+
+    def checked(name: str) -> str:
+        if name not in available:
+            raise ValueError(f"Unknown column {name!r} in {source}")
+        return _quote(name)
+
+    projection = ', '.join(checked(c) for c in columns) if columns else '*'
+    where, params = [], []
+    if run_id is not None:
+        run_column = 'simulation_run_id' if 'simulation_run_id' in available else 'run_id'
+        where.append(f"{checked(run_column)} = ?")
+        params.append(run_id)
+    for column, op, value in filters or []:
+        sql_op = FILTER_OPERATORS.get(op.lower())
+        if sql_op is None:
+            raise ValueError(f"Unsupported filter operator {op!r}")
+        if sql_op in ('IN', 'NOT IN'):
+            values = list(value)
+            if not values:
+                # Empty IN matches nothing, empty NOT IN everything
+                where.append('FALSE' if sql_op == 'IN' else 'TRUE')
+                continue
+            where.append(f"{checked(column)} {sql_op} ({', '.join('?' * len(values))})")
+            params.extend(values)
+        else:
+            where.append(f"{checked(column)} {sql_op} ?")
+            params.append(value)
+
+    sql = f"SELECT {projection} FROM {_quote(source)}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    if order_by:
+        terms = []
+        for term in order_by:
+            name, _, direction = term.partition(' ')
+            direction = direction.strip().upper()
+            if direction not in ('', 'ASC', 'DESC'):
+                raise ValueError(f"Invalid sort direction in {term!r}")
+            terms.append(f"{checked(name)} {direction}".strip())
+        sql += " ORDER BY " + ", ".join(terms)
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    return sql, params
+
+
+def arrow_reader(
+    con: duckdb.DuckDBPyConnection,
+    sql: str,
+    params: Optional[List[Any]] = None,
+    batch_size: int = 122880
+) -> pa.RecordBatchReader:
+    """Run a query and stream its result as Arrow record batches"""
+    result = con.execute(sql, params or [])
+    if hasattr(result, 'to_arrow_reader'):
+        return result.to_arrow_reader(batch_size)
+    return result.fetch_record_batch(batch_size)
@@ -0,0 +1,118 @@
+from typing import Any, Callable, Dict, Optional
+from concurrent.futures import Future
+import queue
+import threading
+import time
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """
+    Runs database work on one dedicated thread.
+
+    Work items are queued in submission order on a bounded queue. When the
+    queue is full, submit() blocks until the writer catches up, so a slow
+    disk throttles the simulation instead of growing memory without bound.
+    barrier() waits until everything submitted before it has been written.
+    """
+
+    def __init__(self, maxsize: int = 1000, name: str = "collector-writer"):
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, maxsize))
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._metrics_lock = threading.Lock()
+        self._closed = False
+
+        self.writes = 0
+        self.errors = 0
+        self.blocked_submits = 0
+        self.max_queue_depth = 0
+        self._write_time = 0.0
+        self._max_write_time = 0.0
+        self._wait_time = 0.0
+
+        self._thread.start()
+
+    def is_writer_thread(self) -> bool:
+        """True when called from the writer thread itself"""
+        return threading.current_thread() is self._thread
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Queue fn(*args, **kwargs) for the writer thread.
+
+        Blocks while the queue is full. The returned future holds the result
+        or the exception raised by fn.
+        """
+        if self._closed:
+            raise RuntimeError("Writer is closed")
+        future: Future = Future()
+        item = (fn, args, kwargs, future, time.perf_counter())
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._metrics_lock:
+                self.blocked_submits += 1
+            self._queue.put(item)
+        with self._metrics_lock:
+            self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return future
+
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn on the writer thread and wait for its result"""
+        if self.is_writer_thread():
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result()
+
+    def barrier(self, timeout: Optional[float] = None):
+        """Wait until all work submitted so far has been processed"""
+        if self.is_writer_thread():
+            return
+        self.submit(lambda: None).result(timeout)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            fn, args, kwargs, future, queued_at = item
+            started = time.perf_counter()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+                with self._metrics_lock:
+                    self.errors += 1
+                logger.error(f"Background write {getattr(fn, '__name__', fn)} failed: {e}")
+            finished = time.perf_counter()
+            with self._metrics_lock:
+                self.writes += 1
+                self._wait_time += started - queued_at
+                self._write_time += finished - started
+                self._max_write_time = max(self._max_write_time, finished - started)
+
+    def close(self, timeout: Optional[float] = None):
+        """Drain the queue and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and write latency metrics"""
+        with self._metrics_lock:
+            writes = self.writes or 1
+            return {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self.max_queue_depth,
+                'writes': self.writes,
+                'errors': self.errors,
+                'blocked_submits': self.blocked_submits,
+                'avg_write_ms': 1000 * self._write_time / writes,
+                'max_write_ms': 1000 * self._max_write_time,
+                'avg_queue_wait_ms': 1000 * self._wait_time / writes,
+            }
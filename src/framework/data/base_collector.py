@@ -1,6 +1,16 @@
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 from abc import ABC, abstractmethod
 from datetime import datetime
+import json
+import pyarrow as pa
+from .state_snapshots import KEYFRAME, replay
+
+# Rows of get_state_history_arrow
+STATE_HISTORY_SCHEMA = pa.schema([
+    ('block_number', pa.int64()),
+    ('block_timestamp', pa.timestamp('us')),
+    ('state_data', pa.string()),
+])
 
 class BaseDataCollector(ABC):
     """Abstract base class defining data collection interface"""
@@ -21,12 +31,22 @@ class BaseDataCollector(ABC):
         """Record agent details"""
         pass
 
+    def record_agents(self, agents: List[Any]):
+        """Record many agents at once"""
+        for agent in agents:
+            self.record_agent(agent)
+
     @abstractmethod
     def record_agent_address(self, agent_id: str, address: str, 
                             is_primary: bool = False):
         """Record agent address"""
         pass
 
+    @abstractmethod
+    def record_agent_actions(self, actions: List[Dict[str, Any]]):
+        """Record executed agent actions with their timings"""
+        pass
+
     @property
     @abstractmethod
     def current_run_id(self) -> Optional[int]:
@@ -37,9 +57,13 @@ class BaseDataCollector(ABC):
     def close(self):
         """Close collector resources"""
         pass
+
+    def flush(self):
+        """Write any buffered records. No-op for unbuffered collectors"""
+        pass
    
     @abstractmethod
-    def record_network_statistics(self, block_number: int, timestamp: datetime):
+    def record_network_statistics(self, block_number: int, timestamp: datetime, stats: Dict[str, Any]):
         """Record network statistics"""
         pass
 
@@ -78,8 +102,20 @@ class BaseDataCollector(ABC):
         pass
 
     @abstractmethod
-    def record_state(self, block_number: int, block_timestamp: datetime, state_data: Dict[str, Any]):
-        """Record simulation state at a given block"""
+    def record_state(
+        self,
+        block_number: int,
+        block_timestamp: datetime,
+        state_data: Dict[str, Any],
+        changes: Optional[List[Tuple]] = None
+    ):
+        """
+        Record simulation state at a given block.
+
+        Args:
+            changes: Paths of `state_data` written since the previous call,
+                when the simulation tracks them (see StateChanges)
+        """
         pass
 
     @abstractmethod
@@ -88,9 +124,112 @@ class BaseDataCollector(ABC):
         pass
 
 
+    @abstractmethod
+    def scan(self, source: str, columns: Optional[Sequence[str]] = None,
+             filters: Optional[Sequence[Tuple[str, str, Any]]] = None,
+             run_id: Optional[int] = None, order_by: Optional[Sequence[str]] = None,
+             limit: Optional[int] = None, batch_size: int = 122880) -> pa.RecordBatchReader:
+        """Stream a table or view as Arrow record batches (see arrow_queries.build_scan)"""
+        pass
+
+    def query_arrow(self, source: str, **kwargs) -> pa.Table:
+        """Read a table or view into one Arrow table; takes the arguments of scan()"""
+        return self.scan(source, **kwargs).read_all()
+
+    def get_events_arrow(self, event_name: Optional[str] = None,
+                         start_time: Optional[datetime] = None,
+                         end_time: Optional[datetime] = None,
+                         run_id: Optional[int] = None,
+                         columns: Optional[Sequence[str]] = None,
+                         filters: Optional[Sequence[Tuple[str, str, Any]]] = None,
+                         limit: Optional[int] = None) -> pa.RecordBatchReader:
+        """
+        Stream events as Arrow record batches.
+
+        Unlike get_events, event_data stays a JSON string and nothing is
+        converted to Python objects.
+        """
+        filters = list(filters or [])
+        if event_name:
+            filters.append(('event_name', '=', event_name))
+        if start_time:
+            filters.append(('block_timestamp', '>=', start_time))
+        if end_time:
+            filters.append(('block_timestamp', '<=', end_time))
+        return self.scan(
+            'events_view',
+            columns=columns,
+            filters=filters,
+            run_id=run_id or self.current_run_id,
+            order_by=['block_number', 'log_index'],
+            limit=limit
+        )
+
+    def get_state_history_arrow(self, run_id: Optional[int] = None,
+                                start_block: Optional[int] = None,
+                                end_block: Optional[int] = None,
+                                batch_size: int = 100) -> pa.RecordBatchReader:
+        """
+        Stream the decoded state of a run at each snapshot block.
+
+        Snapshots are replayed from the last keyframe at or before
+        start_block, so only that stretch of the run is decoded. Like
+        event_data in get_events_arrow, state_data is a JSON string.
+
+        Args:
+            run_id: Run to read (defaults to the current one)
+            start_block: First block to return
+            end_block: Last block to return
+            batch_size: States per record batch
+
+        Returns:
+            Record batches of STATE_HISTORY_SCHEMA, in block order
+        """
+        run_id = run_id or self.current_run_id
+        filters = []
+        if start_block is not None:
+            keyframes = self.query_arrow(
+                'state_snapshots',
+                columns=['block_number'],
+                filters=[('kind', '=', KEYFRAME), ('block_number', '<=', start_block)],
+                run_id=run_id,
+                order_by=['block_number DESC'],
+                limit=1
+            )
+            if keyframes.num_rows:
+                filters.append(('block_number', '>=', keyframes['block_number'][0].as_py()))
+        if end_block is not None:
+            filters.append(('block_number', '<=', end_block))
+        snapshots = self.scan(
+            'state_snapshots',
+            columns=['block_number', 'block_timestamp', 'kind', 'compression', 'raw_size', 'payload'],
+            filters=filters,
+            run_id=run_id,
+            order_by=['block_number']
+        )
+
+        def batches():
+            state = None
+            rows = {name: [] for name in STATE_HISTORY_SCHEMA.names}
+            for batch in snapshots:
+                for row in batch.to_pylist():
+                    state = replay([(row['kind'], row['compression'], row['raw_size'], row['payload'])], state)
+                    if start_block is not None and row['block_number'] < start_block:
+                        continue
+                    rows['block_number'].append(row['block_number'])
+                    rows['block_timestamp'].append(row['block_timestamp'])
+                    rows['state_data'].append(json.dumps(state, separators=(',', ':')))
+                    if len(rows['block_number']) >= batch_size:
+                        yield pa.record_batch(rows, schema=STATE_HISTORY_SCHEMA)
+                        rows = {name: [] for name in STATE_HISTORY_SCHEMA.names}
+            if rows['block_number']:
+                yield pa.record_batch(rows, schema=STATE_HISTORY_SCHEMA)
+
+        return pa.RecordBatchReader.from_batches(STATE_HISTORY_SCHEMA, batches())
+
     @abstractmethod 
-    def export_to_csv(self, output_dir: str = "analysis_results"):
-        """Export data to CSV"""
+    def export_to_parquet(self, output_dir: str = "analysis_results", run_id: Optional[int] = None) -> Dict[str, Any]:
+        """Export data to Parquet"""
         pass
 
     @abstractmethod
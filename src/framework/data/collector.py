@@ -1,19 +1,100 @@
 import duckdb
+import pandas as pd
+import pyarrow as pa
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Sequence, Tuple, Any
 import json
+import copy
+import functools
+from contextlib import contextmanager
 from ape import Contract
 from collections import defaultdict
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from src.framework.agents.base_agent import BaseAgent
-from .event_logging import EventLogger, ContractEventHandler
+from .event_logging import (
+    EventLogger, ContractEventHandler, DecodedReceiptCache, EventABIRegistry, EventBus, EventCapturePolicy, Subscription
+)
 from .base_collector import BaseDataCollector
+from .address_dictionary import AddressDictionary
+from .arrow_queries import Filter, arrow_reader, build_scan
+from .background_writer import BackgroundWriter
+from .shard_catalog import ShardCatalog
+from .state_snapshots import StateSnapshotEncoder, replay
+from .state_replay import REPLAYED_EVENTS, hub_state_from_snapshot, replay_hub_events
+from src.framework.state.graph_converter import StateToGraphConverter
 from src.framework.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Column layouts of the bulk agent inserts (see record_agents)
+AGENT_SCHEMA = pa.schema([
+    ('agent_id', pa.string()),
+    ('simulation_run_id', pa.int32()),
+    ('name', pa.string()),
+    ('description', pa.string()),
+    ('total_accounts', pa.int32()),
+    ('max_executions', pa.int32()),
+])
+AGENT_CONFIG_SCHEMA = pa.schema([
+    ('agent_id', pa.string()),
+    ('action_type', pa.string()),
+    ('probability', pa.float64()),
+    ('cooldown_blocks', pa.int32()),
+    ('constraints', pa.string()),
+])
+AGENT_ADDRESS_SCHEMA = pa.schema([
+    ('agent_id', pa.string()),
+    ('address_id', pa.int32()),
+    ('is_primary', pa.bool_()),
+    ('simulation_run_id', pa.int32()),
+])
+AGENT_ACTION_SCHEMA = pa.schema([
+    ('simulation_run_id', pa.int32()),
+    ('agent_id', pa.string()),
+    ('address_id', pa.int32()),
+    ('action_type', pa.string()),
+    ('block_number', pa.int64()),
+    ('timestamp', pa.timestamp('us')),
+    ('success', pa.bool_()),
+    ('selection_ms', pa.float64()),
+    ('call_generation_ms', pa.float64()),
+    ('transaction_ms', pa.float64()),
+    ('state_update_ms', pa.float64()),
+    ('gas_used', pa.int64()),
+    ('n_calls', pa.int32()),
+])
+
+
+def _on_writer(wait: bool):
+    """
+    Run a collector method on the background writer, when one is enabled.
+
+    Args:
+        wait: Block for the result (reads, run lifecycle) instead of
+            returning immediately (fire-and-forget writes)
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            writer = self._writer
+            if writer is None or writer.is_writer_thread():
+                return method(self, *args, **kwargs)
+            future = writer.submit(method, self, *args, **kwargs)
+            return future.result() if wait else None
+        return wrapper
+    return decorator
+
+
+# Tables whose layout changed: schema file, and a column only the current layout has
+LEGACY_LAYOUTS = {
+    'events': ('events.up.sql', 'tx_from_id'),
+    'agent_addresses': ('agent_addresses.up.sql', 'address_id'),
+    'agent_action_history': ('agent_actions.up.sql', 'simulation_run_id'),
+}
+
+
 class DataCollector(BaseDataCollector):
     """
     Enhanced data collection system for the Circles network that maintains SQL queries
@@ -23,11 +104,45 @@ class DataCollector(BaseDataCollector):
     def __init__(self, 
         db_path: str = "rings_network.duckdb", 
         sql_dir: Optional[str] = None,
-        abis: Optional[List[Dict[str, Any]]] = None
+        abis: Optional[List[Dict[str, Any]]] = None,
+        receipt_cache: Optional[DecodedReceiptCache] = None,
+        event_batch_size: int = 1000,
+        abi_registry: Optional[EventABIRegistry] = None,
+        typed_events: bool = True,
+        state_keyframe_interval: int = 50,
+        state_compression: Optional[str] = "zstd",
+        async_writes: bool = False,
+        write_queue_size: int = 1000,
+        bulk_load: bool = False,
+        analyze_after_run: bool = True,
+        shard_dir: Optional[str] = None,
+        event_capture: Optional[EventCapturePolicy] = None
     ):
-        """Initialize the data collector with a DuckDB database connection."""
+        """
+        Initialize the data collector with a DuckDB database connection.
+
+        With async_writes, a dedicated writer thread owns the connection:
+        record_* calls are queued and return immediately, while reads and
+        run start/end wait for everything queued before them.
+
+        Runs write into the events table without indexes. With bulk_load,
+        the indexes are built in one pass when the run ends (see
+        build_indexes) and dropped again when the next one starts. They
+        cover every run in the database, so this pays off with shard_dir,
+        where each run has a database of its own.
+
+        With shard_dir, each run is written to its own database in that
+        directory and db_path is the catalog listing them (see ShardCatalog).
+
+        With event_capture, only the receipt logs it selects are decoded and
+        recorded (see EventCapturePolicy).
+        """
         self.db_path = db_path
+        self.bulk_load = bulk_load
+        self.analyze_after_run = analyze_after_run
         self.abis = abis or []  # Store ABIs for event decoding
+        self.receipt_cache = receipt_cache or DecodedReceiptCache(self.abis)
+        self.event_capture = event_capture
         
         if sql_dir is None:
             module_dir = Path(__file__).parent
@@ -38,19 +153,46 @@ class DataCollector(BaseDataCollector):
         if not self.sql_dir.exists():
             raise FileNotFoundError(f"SQL directory not found at {self.sql_dir}")
             
-        # Initialize database connection
-        self.con = duckdb.connect(db_path)
+        # SQL is read once; writes in the hot path never touch the file system
+        self._sql = self._load_sql_files()
+
         self._last_timestamp = defaultdict(lambda: datetime.min)
         self.sequence_number = defaultdict(int)
         self._current_run_id = None
-        
-        # Set up database schema
+        self._shard_run_id: Optional[int] = None  # Run whose shard self.con is
+        self.state_encoder = StateSnapshotEncoder(state_keyframe_interval, state_compression)
+        self.event_batch_size = event_batch_size
+        self._typed_registry = abi_registry if typed_events else None
+        self._writer = BackgroundWriter(maxsize=write_queue_size) if async_writes else None
+        self.catalog = ShardCatalog(db_path, shard_dir, self.sql_dir) if shard_dir else None
+        # Live consumers of recorded events; outlives the per-run shard connections
+        self.event_bus = EventBus()
+
+        # Runs get their own shard; until the first one starts, work in memory
+        self._open_database(":memory:" if self.catalog else db_path)
+        logger.info(f"Initialized DataCollector with {'shard catalog' if self.catalog else 'database'} at {db_path}")
+
+    def _open_database(self, db_path: str):
+        """Connect to a database, set up its schema and the event logging writing to it"""
+        self.con = duckdb.connect(db_path)
         self._initialize_database()
-        logger.info(f"Initialized DataCollector with database at {db_path}")
+
+        # Integer keys for every address stored
+        self.addresses = AddressDictionary(self.con, self.sql_dir)
 
         # Initialize event logging components
-        self.event_logger = EventLogger(self.con)
-        self.event_handler = ContractEventHandler(self.event_logger, self._current_run_id, self.abis)  
+        self.event_logger = EventLogger(
+            self.con,
+            batch_size=self.event_batch_size,
+            registry=self._typed_registry,
+            addresses=self.addresses,
+            bus=self.event_bus
+        )
+        self.event_logger.writer = self._writer
+        self.event_handler = ContractEventHandler(
+            self.event_logger, self._current_run_id, self.abis, self.receipt_cache,
+            capture=self.event_capture
+        )
 
     def _get_unique_timestamp(self, base_timestamp: datetime, table_name: str) -> datetime:
         """Generate a unique timestamp for database operations."""
@@ -64,21 +206,26 @@ class DataCollector(BaseDataCollector):
         self._last_timestamp[table_name] = unique_timestamp
         return unique_timestamp
 
+    def _load_sql_files(self) -> Dict[str, str]:
+        """Load every .sql file under the SQL directory, keyed by relative path"""
+        queries = {}
+        for sql_file in self.sql_dir.rglob("*.sql"):
+            try:
+                queries[sql_file.relative_to(self.sql_dir).as_posix()] = sql_file.read_text()
+            except Exception as e:
+                logger.error(f"Error reading SQL file {sql_file}: {e}")
+        logger.debug(f"Loaded {len(queries)} SQL files from {self.sql_dir}")
+        return queries
+
     def _read_sql_file(self, filename: str) -> str:
-        """Read SQL query from the file system."""
-        sql_file = self.sql_dir / filename
-        if not sql_file.exists():
+        """Get a SQL query loaded at startup."""
+        try:
+            return self._sql[filename]
+        except KeyError:
             raise FileNotFoundError(
-                f"SQL file '{filename}' not found at {sql_file}. "
+                f"SQL file '{filename}' not found at {self.sql_dir / filename}. "
                 f"Please ensure the file exists in the {self.sql_dir} directory."
-            )
-            
-        try:
-            with open(sql_file, 'r') as f:
-                return f.read()
-        except Exception as e:
-            logger.error(f"Error reading SQL file {filename}: {e}")
-            raise
+            ) from None
 
     def _initialize_database(self):
         """Initialize database using SQL files from the schema directory."""
@@ -89,17 +236,25 @@ class DataCollector(BaseDataCollector):
                 "simulation_runs.up.sql",  # Must come first as other tables reference it
                 "agents.up.sql",           # Depends on simulation_runs
                 "agents_config.up.sql",
+                "addresses.up.sql",        # Address dictionary referenced by the fact tables
                 "agent_addresses.up.sql",  # Depends on agents and simulation_runs
+                "agent_actions.up.sql",    # Depends on agents and simulation_runs
                 "network_stats.up.sql",    # Depends on simulation_runs
                 "events.up.sql",
-                "state.up.sql",
-             #   "events_indexes.up.sql"
+                "state_snapshots.up.sql",
             ]
-            
             for table_file in tables:
                 sql = self._read_sql_file('schema/' + table_file)
                 self.con.execute(sql)
                 logger.info(f"Created table from {table_file}")   
+
+            # Tables of an existing database may predate the current layout
+            self._migrate_legacy_tables()
+
+            # Views resolving address keys, after all tables. The events
+            # indexes are not created here: runs write without them, and
+            # bulk_load builds them when a run ends.
+            self.con.execute(self._read_sql_file('schema/address_views.up.sql'))
                 
             self.con.commit()
             
@@ -107,27 +262,262 @@ class DataCollector(BaseDataCollector):
             logger.error(f"Database initialization failed: {e}")
             raise
 
+    def _migrate_legacy_tables(self):
+        """
+        Move tables written with an earlier layout to the current one.
+
+        Each is moved to <table>_legacy, recreated from its schema file and
+        refilled by migrations/<table>.sql. A legacy table without a
+        migration is dropped when empty and otherwise kept as it is.
+        """
+        columns = defaultdict(set)
+        for table, column in self.con.execute(
+            "SELECT table_name, column_name FROM information_schema.columns WHERE table_schema = 'main'"
+        ).fetchall():
+            columns[table].add(column)
+        legacy = [
+            table for table, (_, marker) in LEGACY_LAYOUTS.items()
+            if columns.get(table) and marker not in columns[table]
+        ]
+        if not legacy:
+            return
+
+        logger.warning(f"Migrating tables written with an earlier layout: {', '.join(legacy)}")
+        self.con.begin()
+        try:
+            # Indexes would block the drop; they are rebuilt afterwards
+            self.con.execute(self._read_sql_file("schema/events_indexes.down.sql"))
+            for table in legacy:
+                schema_file, _ = LEGACY_LAYOUTS[table]
+                # Copied rather than renamed: DuckDB can hang recreating a renamed stored table
+                self.con.execute(f"CREATE TABLE {table}_legacy AS SELECT * FROM {table}")
+                self.con.execute(f"DROP TABLE {table}")
+                self.con.execute(self._read_sql_file('schema/' + schema_file))
+                migration = self._sql.get(f"migrations/{table}.sql")
+                if migration:
+                    self.con.execute(migration)
+                rows = self.con.execute(f"SELECT COUNT(*) FROM {table}_legacy").fetchone()[0]
+                if migration or not rows:
+                    self.con.execute(f"DROP TABLE {table}_legacy")
+                    logger.info(f"Migrated {rows} rows of {table}")
+                else:
+                    logger.warning(f"No migration for {table}: kept its {rows} rows as {table}_legacy")
+            self.con.commit()
+        except Exception:
+            self.con.rollback()
+            raise
+
+    def _drop_indexes(self):
+        """Drop the events indexes so a bulk load does not maintain them row by row"""
+        self.con.execute(self._read_sql_file("schema/events_indexes.down.sql"))
+        self.con.commit()
+        logger.debug("Dropped events indexes for bulk load")
+
+    @_on_writer(wait=True)
+    def build_indexes(self, analyze: Optional[bool] = None):
+        """
+        Build the events indexes in one pass over the loaded data.
+
+        Args:
+            analyze: Also CHECKPOINT the database and refresh optimizer
+                statistics (defaults to analyze_after_run)
+        """
+        try:
+            start = datetime.now()
+            self.con.execute(self._read_sql_file("schema/events_indexes.up.sql"))
+            self.con.commit()
+            if self.analyze_after_run if analyze is None else analyze:
+                self.con.execute("CHECKPOINT")
+                self.con.execute("ANALYZE")
+            logger.info(f"Built events indexes in {(datetime.now() - start).total_seconds():.2f}s")
+
+        except Exception as e:
+            logger.error(f"Failed to build events indexes: {e}")
+
 
-    def record_state(self, block_number: int, block_timestamp: datetime, state_data: Dict[str, Any]):
-        """Record simulation state at a given block"""
+    def record_state(
+        self,
+        block_number: int,
+        block_timestamp: datetime,
+        state_data: Dict[str, Any],
+        changes: Optional[List[Tuple]] = None
+    ):
+        """
+        Record simulation state at a given block.
+
+        Stored as a keyframe every `state_keyframe_interval` snapshots and as
+        a delta against the previous snapshot otherwise. The snapshot is
+        encoded here, on the caller's thread, so only the encoded payload
+        goes to the background writer rather than a copy of the live state.
+
+        Args:
+            changes: Paths written since the previous snapshot (see
+                StateChanges), to build deltas from those values only
+        """
         if not self._current_run_id:
             raise ValueError("No active simulation run")
-            
+
+        try:
+            kind, compression, raw_size, payload = self.state_encoder.encode(state_data, changes)
+        except Exception as e:
+            self.state_encoder.reset()
+            logger.error(f"Failed to encode state: {e}")
+            raise
+        self._insert_state_snapshot(block_number, block_timestamp, kind, compression, raw_size, payload)
+
+    @_on_writer(wait=False)
+    def _insert_state_snapshot(
+        self,
+        block_number: int,
+        block_timestamp: datetime,
+        kind: str,
+        compression: Optional[str],
+        raw_size: int,
+        payload: bytes
+    ):
+        """Insert one encoded state snapshot"""
         try:
-            sql = self._read_sql_file("queries/insert_state.sql")
+            sql = self._read_sql_file("queries/insert_state_snapshot.sql")
             self.con.execute(sql, [
                 self._current_run_id,
                 block_number,
                 block_timestamp,
-                state_data
+                kind,
+                compression,
+                raw_size,
+                payload
             ])
             self.con.commit()
-            logger.debug(f"Recorded state at block {block_number}")
+            logger.debug(f"Recorded state {kind} at block {block_number} ({len(payload)} bytes)")
             
         except Exception as e:
+            # The next snapshot must not be a delta against a state that was never stored
+            self.state_encoder.reset()
             logger.error(f"Failed to record state: {e}")
             raise
 
+    def _run_connection(self, run_id: Optional[int]) -> duckdb.DuckDBPyConnection:
+        """
+        Connection holding the data of a run.
+
+        In shard mode self.con is only the shard of the latest run; any
+        other run is read through the catalog, with its shard attached
+        read-only. The caller closes a connection other than self.con.
+        """
+        if not self.catalog or run_id is None or run_id == self._shard_run_id:
+            return self.con
+        con = self.catalog.connect(run_ids=[run_id])
+        attached = con.execute(
+            "SELECT 1 FROM duckdb_databases() WHERE database_name = ?", [f"run_{int(run_id)}"]
+        ).fetchone()
+        if not attached:
+            con.close()
+            raise ValueError(f"No readable shard for run {run_id}")
+        return con
+
+    @contextmanager
+    def _reading(self, run_id: Optional[int]):
+        """_run_connection for the duration of a with block"""
+        con = self._run_connection(run_id)
+        try:
+            yield con
+        finally:
+            if con is not self.con:
+                con.close()
+
+    def _load_snapshot(
+        self,
+        con: duckdb.DuckDBPyConnection,
+        run_id: int,
+        block_number: int
+    ) -> Tuple[Optional[int], Optional[datetime], Any]:
+        """Block, timestamp and rebuilt state of the last snapshot at or before a block"""
+        sql = self._read_sql_file("queries/get_state_snapshots.sql")
+        rows = con.execute(sql, [run_id, block_number]).fetchall()
+        if not rows:
+            return None, None, None
+        return rows[-1][0], rows[-1][1], replay([row[2:] for row in rows])
+
+    @_on_writer(wait=True)
+    def reconstruct_state(self, block_number: int, run_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild the recorded state at a block.
+
+        Loads the last keyframe at or before the block and applies the deltas
+        recorded after it, up to the block.
+
+        Args:
+            block_number: Block to rebuild the state at
+            run_id: Simulation run (defaults to current run)
+
+        Returns:
+            The last recorded state at or before the block (JSON types, dict
+            keys as strings), or None if nothing was recorded
+        """
+        try:
+            run_id = run_id or self._current_run_id
+            if not run_id:
+                raise ValueError("No simulation run specified")
+            with self._reading(run_id) as con:
+                return self._load_snapshot(con, run_id, block_number)[2]
+
+        except Exception as e:
+            logger.error(f"Failed to reconstruct state at block {block_number}: {e}")
+            return None
+
+    @_on_writer(wait=True)
+    def get_state_at(
+        self,
+        run_id: int,
+        block_number: int,
+        current_time: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Trust and balance tables of the CirclesHub at a block.
+
+        Starts from the nearest state snapshot at or before the block and
+        replays the Trust and transfer events recorded between the snapshot
+        and the block.
+
+        Args:
+            run_id: Simulation run
+            block_number: Block to rebuild the state at
+            current_time: Timestamp used for trust expiry and demurrage
+                (defaults to the latest timestamp seen up to the block)
+
+        Returns:
+            (df_trusts, df_balances), as taken by GraphManager
+        """
+        try:
+            self.event_logger.flush()
+            with self._reading(run_id) as con:
+                snapshot_block, snapshot_time, state = self._load_snapshot(con, run_id, block_number)
+                if state is None:
+                    logger.warning(f"No state snapshot at or before block {block_number}, replaying events only")
+                hub_state, hub_address = hub_state_from_snapshot(state)
+
+                sql = self._read_sql_file("queries/get_events_between.sql")
+                events = con.execute(sql, [
+                    run_id,
+                    snapshot_block if snapshot_block is not None else -1,
+                    block_number,
+                    list(REPLAYED_EVENTS),
+                    hub_address
+                ]).fetchall()
+            replay_hub_events(hub_state, events)
+            logger.debug(f"Replayed {len(events)} events on snapshot at block {snapshot_block}")
+
+            if current_time is None:
+                latest = events[-1][1] if events else snapshot_time
+                current_time = int(latest.timestamp()) if latest else int(datetime.now().timestamp())
+
+            return StateToGraphConverter.convert_state_to_dataframes(hub_state, current_time)
+
+        except Exception as e:
+            logger.error(f"Failed to get state at block {block_number}: {e}")
+            raise
+
+    @_on_writer(wait=True)
     def get_state_history(self, run_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get state history for a simulation run"""
         try:
@@ -136,8 +526,18 @@ class DataCollector(BaseDataCollector):
             if not run_id:
                 raise ValueError("No simulation run specified")
                 
-            result = self.con.execute(sql, [run_id]).fetchdf()
-            return result.to_dict('records')
+            with self._reading(run_id) as con:
+                rows = con.execute(sql, [run_id]).fetchall()
+            history = []
+            state = None
+            for block_number, block_timestamp, *snapshot in rows:
+                state = replay([snapshot], state)
+                history.append({
+                    'block_number': block_number,
+                    'block_timestamp': block_timestamp,
+                    'state_data': copy.deepcopy(state)
+                })
+            return history
             
         except Exception as e:
             logger.error(f"Failed to get state history: {e}")
@@ -153,20 +553,37 @@ class DataCollector(BaseDataCollector):
             all(c in '0123456789abcdefABCDEF' for c in address[2:])
         )
 
+    @_on_writer(wait=True)
     def start_simulation_run(self, parameters: Dict = None, description: str = None) -> int:
         """Start a new simulation run and return its ID."""
         try:
+            run_id = None
+            if self.catalog:
+                # Switch to a fresh shard for this run
+                self.event_logger.flush()
+                run_id, shard_path = self.catalog.allocate_run()
+                self.con.close()
+                self._open_database(str(shard_path))
+                self._shard_run_id = run_id
+
             sql = self._read_sql_file("queries/insert_simulation_run.sql")
             result = self.con.execute(sql, [
+                run_id,
                 datetime.now(),
                 json.dumps(parameters) if parameters else None,
                 description
             ]).fetchone()
             
             self._current_run_id = result[0]
+            self.state_encoder.reset()
+            if self.bulk_load:
+                self._drop_indexes()
             
             # Initialize event handler with current run ID
-            self.event_handler = ContractEventHandler(self.event_logger, self._current_run_id, self.abis)
+            self.event_handler = ContractEventHandler(
+                self.event_logger, self._current_run_id, self.abis, self.receipt_cache,
+                capture=self.event_capture
+            )
             
             self.con.commit()
             logger.info(f"Started simulation run {self._current_run_id}")
@@ -189,6 +606,7 @@ class DataCollector(BaseDataCollector):
             except Exception as e:
                 logger.error(f"Failed to set up listeners for {name}: {e}")
 
+    @_on_writer(wait=True)
     def get_events(self, event_name: Optional[str] = None, 
                   start_time: Optional[datetime] = None,
                   end_time: Optional[datetime] = None,
@@ -206,6 +624,7 @@ class DataCollector(BaseDataCollector):
             limit=limit
         )
 
+    @_on_writer(wait=True)
     def get_event_statistics(self) -> List[Dict]:
         """Get event statistics for current simulation run"""
         if not self._current_run_id:
@@ -214,6 +633,7 @@ class DataCollector(BaseDataCollector):
             
         return self.event_logger.get_event_stats(self._current_run_id)
             
+    @_on_writer(wait=True)
     def end_simulation_run(self):
         """Mark the current simulation run as completed."""
         if not self._current_run_id:
@@ -221,9 +641,13 @@ class DataCollector(BaseDataCollector):
             return
             
         try:
+            # Raises rather than ending the run with events unwritten
+            self.event_logger.flush(strict=True)
             sql = self._read_sql_file("queries/update_simulation_run.sql")
             self.con.execute(sql, [datetime.now(), self._current_run_id])
             self.con.commit()
+            if self.bulk_load:
+                self.build_indexes()
             logger.info(f"Ended simulation run {self._current_run_id}")
             self._current_run_id = None
             
@@ -234,52 +658,94 @@ class DataCollector(BaseDataCollector):
     def record_agent(self, agent: 'BaseAgent'):
         """
         Record a comprehensive representation of a BaseAgent
-        
+
+        Its rows are built here, on the caller's thread, while the agent
+        cannot change under the background writer (see record_agents).
+
         Args:
             agent: The BaseAgent instance to record
         """
-        try:
-            sql = self._read_sql_file("queries/insert_agent.sql")
-            self.con.execute(sql, [
-                agent.agent_id,
-                self._current_run_id,
-                agent.profile.name,
-                agent.profile.description,
-                len(agent.accounts),
-                agent.profile.max_executions,
-              #  agent.profile.risk_tolerance,
-              #  agent.profile.preferred_contracts
-            ])
-            
-            # Insert action configurations
-            sql = self._read_sql_file("queries/insert_agent_config.sql")
-            
+        self.record_agents([agent])
+
+    def record_agents(self, agents: List['BaseAgent']):
+        """
+        Record many agents at once.
+
+        Agent, action config and address rows are built as columnar batches
+        and appended with three bulk inserts in a single transaction, instead
+        of a commit per agent.
+
+        Args:
+            agents: The BaseAgent instances to record
+        """
+        if not agents:
+            return
+        agent_rows = {name: [] for name in AGENT_SCHEMA.names}
+        config_rows = {name: [] for name in AGENT_CONFIG_SCHEMA.names}
+        address_rows = {name: [] for name in AGENT_ADDRESS_SCHEMA.names}
+
+        for agent in agents:
+            agent_rows['agent_id'].append(agent.agent_id)
+            agent_rows['simulation_run_id'].append(self._current_run_id)
+            agent_rows['name'].append(agent.profile.name)
+            agent_rows['description'].append(agent.profile.description)
+            agent_rows['total_accounts'].append(len(agent.accounts))
+            agent_rows['max_executions'].append(agent.profile.max_executions)
+
             for action_type, config in agent.profile.action_configs.items():
-                self.con.execute(sql, [
-                    agent.agent_id,
-                    action_type,  
-                    config.probability,
-                    config.cooldown_blocks,
-                    json.dumps(config.constraints)
-                ])
-                       
-            # Insert agent addresses
-            sql = self._read_sql_file("queries/insert_agent_address.sql")
-            for i, (address, private_key) in enumerate(agent.accounts.items()):
-                self.con.execute(sql, [
-                    agent.agent_id,
-                    address,
-                    i == 0,  
-                    self._current_run_id
-                ])
+                config_rows['agent_id'].append(agent.agent_id)
+                config_rows['action_type'].append(action_type)
+                config_rows['probability'].append(config.probability)
+                config_rows['cooldown_blocks'].append(config.cooldown_blocks)
+                config_rows['constraints'].append(json.dumps(config.constraints))
+
+            for i, address in enumerate(agent.accounts):
+                address_rows['agent_id'].append(agent.agent_id)
+                address_rows['address_id'].append(self.addresses.key(address))
+                address_rows['is_primary'].append(i == 0)
+                address_rows['simulation_run_id'].append(self._current_run_id)
+
+        self._write_agent_batches(
+            pa.table(agent_rows, schema=AGENT_SCHEMA),
+            pa.table(config_rows, schema=AGENT_CONFIG_SCHEMA),
+            pa.table(address_rows, schema=AGENT_ADDRESS_SCHEMA),
+            self.addresses.take()
+        )
+
+    @_on_writer(wait=False)
+    def _write_agent_batches(
+        self,
+        agents: pa.Table,
+        configs: pa.Table,
+        addresses: pa.Table,
+        new_addresses: Optional[pa.Table] = None
+    ):
+        """Append agent, config and address batches in one transaction"""
+        try:
+            self.con.begin()
+            self.addresses.write(new_addresses)
+            for table, batch in (
+                ("agents", agents),
+                ("agent_action_configs", configs),
+                ("agent_addresses", addresses)
+            ):
+                if not batch.num_rows:
+                    continue
+                columns = ', '.join(batch.schema.names)
+                self.con.register('_agent_batch', batch)
+                try:
+                    self.con.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM _agent_batch")
+                finally:
+                    self.con.unregister('_agent_batch')
             self.con.commit()
-            logger.info(f"Recorded agent {agent.agent_id} with {len(agent.accounts)} addresses")
-            
+            logger.info(f"Recorded {agents.num_rows} agents with {addresses.num_rows} addresses")
+
         except Exception as e:
-            logger.error(f"Failed to record agent {agent.agent_id}: {e}")
+            logger.error(f"Failed to record {agents.num_rows} agents: {e}")
             self.con.rollback()
             raise
-            
+
+    @_on_writer(wait=False)
     def record_agent_address(self, agent_id: str, address: str, is_primary: bool = False):
         """Record an address associated with an agent."""
         if not self._current_run_id:
@@ -287,9 +753,11 @@ class DataCollector(BaseDataCollector):
             
         try:
             sql = self._read_sql_file("queries/insert_agent_address.sql")
+            address_id = self.addresses.key(address)
+            self.addresses.write()
             self.con.execute(sql, [
                 agent_id,
-                address,
+                address_id,
                 is_primary,
                 self._current_run_id
             ])
@@ -301,36 +769,80 @@ class DataCollector(BaseDataCollector):
             raise
 
    
+    def record_agent_actions(self, actions: List[Dict[str, Any]]):
+        """
+        Record executed agent actions in one bulk insert.
+
+        Args:
+            actions: One dict per action with agent_id, address, action_type,
+                block_number, timestamp, success, the *_ms phase timings,
+                gas_used and n_calls
+        """
+        if not actions:
+            return
+        rows = {name: [] for name in AGENT_ACTION_SCHEMA.names}
+        for action in actions:
+            for name in AGENT_ACTION_SCHEMA.names:
+                rows[name].append(action.get(name))
+        rows['simulation_run_id'] = [self._current_run_id] * len(actions)
+        rows['address_id'] = self.addresses.keys(action.get('address') for action in actions)
+        self._write_action_batch(pa.table(rows, schema=AGENT_ACTION_SCHEMA), self.addresses.take())
+
+    @_on_writer(wait=False)
+    def _write_action_batch(self, actions: pa.Table, new_addresses: Optional[pa.Table] = None):
+        """Append an agent action batch (and its new addresses) in one transaction"""
+        try:
+            self.con.begin()
+            self.addresses.write(new_addresses)
+            columns = ', '.join(actions.schema.names)
+            self.con.register('_action_batch', actions)
+            try:
+                self.con.execute(
+                    f"INSERT INTO agent_action_history ({columns}) SELECT {columns} FROM _action_batch"
+                )
+            finally:
+                self.con.unregister('_action_batch')
+            self.con.commit()
+            logger.debug(f"Recorded {actions.num_rows} agent actions")
+
+        except Exception as e:
+            logger.error(f"Failed to record {actions.num_rows} agent actions: {e}")
+            self.con.rollback()
+            raise
+
+    @_on_writer(wait=False)
     def record_network_statistics(
         self,
         block_number: int,
-        timestamp: datetime
+        timestamp: datetime,
+        stats: Dict[str, Any]
     ):
-        """Record network-wide statistics for the current simulation run."""
+        """
+        Record network-wide statistics for the current simulation run.
+
+        Args:
+            block_number: Block the statistics were taken at
+            timestamp: Block timestamp
+            stats: total_humans, total_active_trusts, total_supply,
+                average_balance and trust_density, as kept by
+                NetworkStatsTracker
+        """
         if not self._current_run_id:
             raise ValueError("No active simulation run")
             
         try:
             unique_timestamp = self._get_unique_timestamp(timestamp, 'network_stats')
             
-            # Calculate statistics using the SQL file
-            calc_sql = self._read_sql_file("analysis/calculate_network_stats.sql")
-            stats = self.con.execute(calc_sql).fetchone()
-            
-            if not stats:
-                raise ValueError("Failed to calculate network statistics")
-                
-            # Insert using the SQL file
             sql = self._read_sql_file("queries/insert_network_stats.sql")
             self.con.execute(sql, [
                 self._current_run_id,
                 unique_timestamp,
                 block_number,
-                stats[0],  # total_humans
-                stats[1],  # total_active_trusts
-                stats[2],  # total_supply
-                stats[3],  # average_balance
-                stats[4]   # trust_density
+                stats['total_humans'],
+                stats['total_active_trusts'],
+                stats['total_supply'],
+                stats['average_balance'],
+                stats['trust_density']
             ])
             self.con.commit()
             
@@ -340,12 +852,24 @@ class DataCollector(BaseDataCollector):
             logger.error(f"Failed to record network statistics: {e}")
             raise
 
+    def subscribe_events(self, callback, **options) -> Subscription:
+        """
+        Attach a live consumer of recorded events.
+
+        The callback runs on its own thread with a bounded queue. By
+        default a full queue blocks the simulation until the consumer
+        catches up; policy='drop_newest' or 'drop_oldest' never blocks but
+        loses events. Options are those of EventBus.subscribe.
+        """
+        return self.event_bus.subscribe(callback, **options)
+
     def record_transaction_events(self, tx, context: Optional['SimulationContext'] = None) -> None:
         """Forward transaction events to event handler"""
         if self.event_handler:
             self.event_handler.handle_transaction_events(tx, context)
 
 
+    @_on_writer(wait=True)
     def get_simulation_results(self, run_id: int) -> Dict:
         """
         Retrieve comprehensive results for a specific simulation run.
@@ -359,18 +883,19 @@ class DataCollector(BaseDataCollector):
         try:
             # Get basic simulation information
             sql = self._read_sql_file("queries/get_simulation_results.sql")
-            results = self.con.execute(sql, [run_id]).fetchone()
-            
-            if not results:
-                raise ValueError(f"No simulation found with ID {run_id}")
-                
-            # Get agent details
-            agent_sql = self._read_sql_file("queries/get_agent_details.sql")
-            agents = self.con.execute(agent_sql, [run_id]).fetchall()
-            
-            # Get network evolution over time
-            network_stats_sql = self._read_sql_file("queries/get_network_stats_evolution.sql")
-            network_evolution = self.con.execute(network_stats_sql, [run_id]).fetchall()
+            with self._reading(run_id) as con:
+                results = con.execute(sql, [run_id]).fetchone()
+
+                if not results:
+                    raise ValueError(f"No simulation found with ID {run_id}")
+
+                # Get agent details
+                agent_sql = self._read_sql_file("queries/get_agent_details.sql")
+                agents = con.execute(agent_sql, [run_id]).fetchall()
+
+                # Get network evolution over time
+                network_stats_sql = self._read_sql_file("queries/get_network_stats_evolution.sql")
+                network_evolution = con.execute(network_stats_sql, [run_id]).fetchall()
             
             return {
                 "simulation_info": {
@@ -395,6 +920,7 @@ class DataCollector(BaseDataCollector):
             raise
 
 
+    @_on_writer(wait=True)
     def get_agent_history(self, agent_id: str, run_id: Optional[int] = None) -> Dict:
         """
         Get the complete history of an agent's activities in a simulation.
@@ -414,18 +940,19 @@ class DataCollector(BaseDataCollector):
             
             # Get agent profile
             sql = self._read_sql_file("queries/get_agent_profile.sql")
-            profile = self.con.execute(sql, [agent_id, run_id]).fetchone()
-            
-            if not profile:
-                raise ValueError(f"No agent found with ID {agent_id} in run {run_id}")
-                
-            # Get balance changes
-            balance_sql = self._read_sql_file("queries/get_agent_balance_history.sql")
-            balance_history = self.con.execute(balance_sql, [agent_id, run_id]).fetchall()
-            
-            # Get trust relationships
-            trust_sql = self._read_sql_file("queries/get_agent_trust_history.sql")
-            trust_history = self.con.execute(trust_sql, [agent_id, run_id]).fetchall()
+            with self._reading(run_id) as con:
+                profile = con.execute(sql, [agent_id, run_id]).fetchone()
+
+                if not profile:
+                    raise ValueError(f"No agent found with ID {agent_id} in run {run_id}")
+
+                # Get balance changes
+                balance_sql = self._read_sql_file("queries/get_agent_balance_history.sql")
+                balance_history = con.execute(balance_sql, [agent_id, run_id]).fetchall()
+
+                # Get trust relationships
+                trust_sql = self._read_sql_file("queries/get_agent_trust_history.sql")
+                trust_history = con.execute(trust_sql, [agent_id, run_id]).fetchall()
             
             return {
                 "profile": dict(zip([
@@ -440,6 +967,7 @@ class DataCollector(BaseDataCollector):
             logger.error(f"Failed to get agent history: {e}")
             raise
 
+    @_on_writer(wait=True)
     def get_network_graph(self, run_id: Optional[int] = None) -> Tuple[List, List]:
         """
         Get the trust network graph data for visualization.
@@ -457,11 +985,12 @@ class DataCollector(BaseDataCollector):
                 
             # Get all nodes (agents)
             node_sql = self._read_sql_file("queries/get_network_nodes.sql")
-            nodes = self.con.execute(node_sql, [run_id]).fetchall()
-            
-            # Get all edges (trust relationships)
-            edge_sql = self._read_sql_file("queries/get_network_edges.sql")
-            edges = self.con.execute(edge_sql, [run_id]).fetchall()
+            with self._reading(run_id) as con:
+                nodes = con.execute(node_sql, [run_id]).fetchall()
+
+                # Get all edges (trust relationships)
+                edge_sql = self._read_sql_file("queries/get_network_edges.sql")
+                edges = con.execute(edge_sql, [run_id]).fetchall()
             
             return nodes, edges
             
@@ -470,44 +999,163 @@ class DataCollector(BaseDataCollector):
             raise
 
 
-    def export_to_csv(self, output_dir: str = "analysis_results"):
-        """Export all tables to CSV files with metadata."""
+    @_on_writer(wait=True)
+    def export_to_parquet(
+        self,
+        output_dir: str = "analysis_results",
+        run_id: Optional[int] = None,
+        compression: str = "zstd",
+        row_group_size: int = 122880
+    ) -> Dict[str, Any]:
+        """
+        Export the simulation tables to partitioned Parquet datasets.
+
+        Each table is written by DuckDB's COPY straight from the database to
+        disk, partitioned by run (and events also by event name), so nothing
+        is materialized in Python.
+
+        Args:
+            output_dir: Directory receiving one dataset directory per table
+            run_id: Only export this run (defaults to all runs)
+            compression: Parquet compression codec
+            row_group_size: Rows per Parquet row group
+
+        Returns:
+            Export metadata, also written to export_metadata.json
+        """
         try:
+            self.flush()
             output_path = Path(output_dir)
             output_path.mkdir(parents=True, exist_ok=True)
-            
-            tables = ["humans", "trusts", "balance_changes", "network_stats"]
-            
+
+            # dataset -> (source table or view, partition columns); address
+            # keys are exported resolved to their strings
+            tables = {
+                "events": ("events_view", ["simulation_run_id", "event_name"]),
+                "state_snapshots": ("state_snapshots", ["simulation_run_id"]),
+                "agents": ("agents", ["simulation_run_id"]),
+                "agent_addresses": ("agent_addresses_view", ["simulation_run_id"]),
+                "agent_action_history": ("agent_action_history_view", ["simulation_run_id"]),
+                "network_stats": ("network_stats", ["simulation_run_id"]),
+            }
+            where = f" WHERE simulation_run_id = {int(run_id)}" if run_id is not None else ""
+
             metadata = {
                 "export_timestamp": datetime.now().isoformat(),
                 "database_path": str(self.db_path),
+                "format": "parquet",
+                "compression": compression,
+                "run_id": run_id,
                 "table_statistics": {}
             }
-            
-            for table in tables:
-                df = self.con.execute(f"SELECT * FROM {table}").df()
-                csv_path = output_path / f"{table}.csv"
-                df.to_csv(csv_path, index=False)
-                
-                metadata["table_statistics"][table] = {
-                    "row_count": len(df),
-                    "columns": list(df.columns),
-                    "export_path": str(csv_path)
-                }
-                
-            # Save metadata
+
+            # In shard mode every run but the one in self.con comes through the catalog
+            sources = [self._run_connection(run_id)]
+            if self.catalog and run_id is None:
+                others = self.catalog.connect(exclude=[self._shard_run_id] if self._shard_run_id else [])
+                sources = [others] if self._shard_run_id is None else [others, self.con]
+
+            try:
+                for table, (source, partitions) in tables.items():
+                    table_path = output_path / table
+                    row_count = 0
+                    for con in sources:
+                        if not con.execute(
+                            "SELECT 1 FROM information_schema.tables WHERE table_name = ?", [source]
+                        ).fetchone():
+                            continue  # A catalog without other shards
+                        con.execute(f"""
+                            COPY (SELECT * FROM {source}{where}) TO '{table_path.as_posix()}' (
+                                FORMAT PARQUET,
+                                PARTITION_BY ({', '.join(partitions)}),
+                                COMPRESSION {compression},
+                                ROW_GROUP_SIZE {int(row_group_size)},
+                                OVERWRITE_OR_IGNORE
+                            )
+                        """)
+                        row_count += con.execute(f"SELECT COUNT(*) FROM {source}{where}").fetchone()[0]
+                    metadata["table_statistics"][table] = {
+                        "row_count": row_count,
+                        "partition_by": partitions,
+                        "export_path": str(table_path)
+                    }
+            finally:
+                for con in sources:
+                    if con is not self.con:
+                        con.close()
+
             with open(output_path / "export_metadata.json", "w") as f:
                 json.dump(metadata, f, indent=2)
-                
-            logger.info(f"Exported all tables to CSV in {output_dir}")
-            
+
+            logger.info(f"Exported {len(tables)} tables to Parquet in {output_dir}")
+            return metadata
+
         except Exception as e:
             logger.error(f"Failed to export data: {e}")
             raise
 
+    def scan(
+        self,
+        source: str,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        run_id: Optional[int] = None,
+        order_by: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 122880
+    ) -> pa.RecordBatchReader:
+        """
+        Stream a table or view as Arrow record batches.
+
+        Buffered writes are flushed first; the query then runs on its own
+        cursor, so reading the batches does not hold up the writer. In shard
+        mode a run other than the latest is read from its shard through the
+        catalog, and a run_id is required.
+
+        Args:
+            source: Table or view (e.g. events_view, state_snapshots, network_stats)
+            columns: Columns to return (all when None)
+            filters: (column, op, value) predicates, ANDed
+            run_id: Only rows of this run
+            order_by: Column names, each optionally followed by " DESC"
+            limit: Maximum number of rows
+            batch_size: Rows per record batch
+
+        Returns:
+            A pyarrow RecordBatchReader
+        """
+        try:
+            self.flush()
+            if self.catalog and run_id is None:
+                raise ValueError("Shard mode reads one run at a time; pass run_id or use ShardCatalog.connect()")
+            con = self._run_connection(run_id)
+            # A catalog connection is kept alive by the reader's result
+            cursor = self.con.cursor() if con is self.con else con
+            sql, params = build_scan(cursor, source, columns, filters, run_id, order_by, limit)
+            return arrow_reader(cursor, sql, params, batch_size)
+
+        except Exception as e:
+            logger.error(f"Failed to scan {source}: {e}")
+            raise
+
+    def flush(self):
+        """Write all buffered events and wait for queued writes to finish"""
+        self.event_logger.flush()
+        if self._writer:
+            self._writer.barrier()
+            logger.debug(f"Collector writer stats: {self._writer.stats()}")
+
+    def writer_stats(self) -> Dict[str, Any]:
+        """Queue depth and write latency of the background writer, if enabled"""
+        return self._writer.stats() if self._writer else {}
+
     def close(self):
         """Safely close the database connection."""
         try:
+            self.flush()
+            self.event_bus.close()
+            if self._writer:
+                self._writer.close()
             self.con.close()
             logger.info("Closed database connection")
         except Exception as e:
@@ -0,0 +1,21 @@
+-- Migrates agent_addresses written before address keys (address strings),
+-- renamed to agent_addresses_legacy, to the current table
+
+-- Key the addresses the legacy rows store as strings
+INSERT INTO addresses (address_id, address)
+SELECT
+    (SELECT COALESCE(MAX(address_id), 0) FROM addresses) + row_number() OVER (ORDER BY address),
+    address
+FROM (
+    SELECT MIN(address) AS address
+    FROM (SELECT address FROM agent_addresses_legacy)
+    WHERE address IS NOT NULL AND address <> ''
+        AND lower(address) NOT IN (SELECT lower(address) FROM addresses)
+    GROUP BY lower(address)
+);
+
+-- Copy the rows with their address keys
+INSERT INTO agent_addresses (agent_id, address_id, is_primary, simulation_run_id)
+SELECT aa.agent_id, a.address_id, aa.is_primary, aa.simulation_run_id
+FROM agent_addresses_legacy aa
+JOIN addresses a ON lower(a.address) = lower(aa.address);
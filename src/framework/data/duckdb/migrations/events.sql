@@ -0,0 +1,34 @@
+-- Migrates events written before address keys (tx_from / tx_to /
+-- contract_address strings), renamed to events_legacy, to the current table
+
+-- Key the addresses the legacy rows store as strings
+INSERT INTO addresses (address_id, address)
+SELECT
+    (SELECT COALESCE(MAX(address_id), 0) FROM addresses) + row_number() OVER (ORDER BY address),
+    address
+FROM (
+    SELECT MIN(address) AS address
+    FROM (
+        SELECT tx_from AS address FROM events_legacy
+        UNION ALL SELECT tx_to FROM events_legacy
+        UNION ALL SELECT contract_address FROM events_legacy
+    )
+    WHERE address IS NOT NULL AND address <> ''
+        AND lower(address) NOT IN (SELECT lower(address) FROM addresses)
+    GROUP BY lower(address)
+);
+
+-- Copy the rows with their address keys
+INSERT INTO events (
+    simulation_run_id, action_name, event_name, block_number, block_timestamp,
+    transaction_hash, tx_from_id, tx_to_id, tx_index, log_index,
+    contract_address_id, topic0, event_data
+)
+SELECT
+    e.simulation_run_id, e.action_name, e.event_name, e.block_number, e.block_timestamp,
+    e.transaction_hash, f.address_id, t.address_id, e.tx_index, e.log_index,
+    c.address_id, e.topic0, e.event_data
+FROM events_legacy e
+LEFT JOIN addresses f ON lower(f.address) = lower(e.tx_from)
+LEFT JOIN addresses t ON lower(t.address) = lower(e.tx_to)
+LEFT JOIN addresses c ON lower(c.address) = lower(e.contract_address);
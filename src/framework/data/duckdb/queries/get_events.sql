@@ -1,5 +1,5 @@
 SELECT * 
-FROM events 
+FROM events_view 
 WHERE simulation_run_id = ?
     AND event_name = ?
     AND block_timestamp >= ?
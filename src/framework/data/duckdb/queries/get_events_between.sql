@@ -0,0 +1,12 @@
+-- Events of the given names in the block range (after_block, up_to_block],
+-- optionally limited to one contract, in chain order
+SELECT event_name, block_timestamp, event_data
+FROM events
+WHERE simulation_run_id = $1
+  AND block_number > $2
+  AND block_number <= $3
+  AND list_contains($4, event_name)
+  AND ($5 IS NULL OR contract_address_id = (
+      SELECT address_id FROM addresses WHERE lower(address) = lower($5)
+  ))
+ORDER BY block_number, tx_index, log_index;
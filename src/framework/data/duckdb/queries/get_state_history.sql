@@ -0,0 +1,4 @@
+SELECT block_number, block_timestamp, kind, compression, raw_size, payload
+FROM state_snapshots
+WHERE simulation_run_id = ?
+ORDER BY block_number;
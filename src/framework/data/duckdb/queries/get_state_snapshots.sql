@@ -0,0 +1,12 @@
+-- Snapshots needed to rebuild the state at a block: the last keyframe at or
+-- before the block and every delta after it, in block order
+SELECT block_number, block_timestamp, kind, compression, raw_size, payload
+FROM state_snapshots
+WHERE simulation_run_id = $1
+  AND block_number <= $2
+  AND block_number >= (
+      SELECT coalesce(max(block_number), 0)
+      FROM state_snapshots
+      WHERE simulation_run_id = $1 AND block_number <= $2 AND kind = 'keyframe'
+  )
+ORDER BY block_number;
@@ -1,6 +1,6 @@
 INSERT INTO agent_addresses (
     agent_id, 
-    address, 
+    address_id, 
     is_primary,
     simulation_run_id
 ) VALUES (?, ?, ?, ?)
\ No newline at end of file
@@ -1,5 +1,5 @@
 INSERT INTO events (
     simulation_run_id, action_name, event_name, block_number, block_timestamp,
-    transaction_hash, tx_from, tx_to, tx_index, log_index,
-    contract_address, topic0, event_data 
+    transaction_hash, tx_from_id, tx_to_id, tx_index, log_index,
+    contract_address_id, topic0, event_data 
 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
\ No newline at end of file
@@ -4,7 +4,7 @@ INSERT INTO simulation_runs (
     parameters,
     description
 ) VALUES (
-    (SELECT COALESCE(MAX(run_id), 0) + 1 FROM simulation_runs),
+    COALESCE(?, (SELECT COALESCE(MAX(run_id), 0) + 1 FROM simulation_runs)),  -- Given run id (shards) or next
     ?,
     ?,
     ?
@@ -1,6 +0,0 @@
-INSERT INTO states (
-    simulation_run_id,
-    block_number,
-    block_timestamp,
-    state_data
-) VALUES (?, ?, ?, ?);
\ No newline at end of file
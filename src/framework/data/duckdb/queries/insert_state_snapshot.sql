@@ -0,0 +1,9 @@
+INSERT INTO state_snapshots (
+    simulation_run_id,
+    block_number,
+    block_timestamp,
+    kind,
+    compression,
+    raw_size,
+    payload
+) VALUES (?, ?, ?, ?, ?, ?, ?);
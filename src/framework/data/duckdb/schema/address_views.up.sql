@@ -0,0 +1,52 @@
+-- Fact tables with their address keys resolved back to checksum strings
+CREATE OR REPLACE VIEW events_view AS
+SELECT
+    e.simulation_run_id,
+    e.action_name,
+    e.event_name,
+    e.block_number,
+    e.block_timestamp,
+    e.transaction_hash,
+    f.address AS tx_from,
+    t.address AS tx_to,
+    e.tx_index,
+    e.log_index,
+    c.address AS contract_address,
+    e.topic0,
+    e.event_data,
+    e.tx_from_id,
+    e.tx_to_id,
+    e.contract_address_id
+FROM events e
+LEFT JOIN addresses f ON f.address_id = e.tx_from_id
+LEFT JOIN addresses t ON t.address_id = e.tx_to_id
+LEFT JOIN addresses c ON c.address_id = e.contract_address_id;
+
+CREATE OR REPLACE VIEW agent_addresses_view AS
+SELECT
+    aa.agent_id,
+    a.address,
+    aa.is_primary,
+    aa.simulation_run_id,
+    aa.address_id
+FROM agent_addresses aa
+JOIN addresses a ON a.address_id = aa.address_id;
+
+CREATE OR REPLACE VIEW agent_action_history_view AS
+SELECT
+    ah.simulation_run_id,
+    ah.agent_id,
+    a.address,
+    ah.action_type,
+    ah.block_number,
+    ah.timestamp,
+    ah.success,
+    ah.selection_ms,
+    ah.call_generation_ms,
+    ah.transaction_ms,
+    ah.state_update_ms,
+    ah.gas_used,
+    ah.n_calls,
+    ah.address_id
+FROM agent_action_history ah
+LEFT JOIN addresses a ON a.address_id = ah.address_id;
@@ -0,0 +1,5 @@
+-- Dictionary of every address stored by the collector; fact tables keep the integer key
+CREATE TABLE IF NOT EXISTS addresses (
+    address_id INTEGER PRIMARY KEY,
+    address VARCHAR NOT NULL UNIQUE          -- Checksum address
+);
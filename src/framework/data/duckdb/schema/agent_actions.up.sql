@@ -1,8 +1,21 @@
 CREATE TABLE IF NOT EXISTS agent_action_history (
+    simulation_run_id INTEGER NOT NULL,      -- Reference to simulation run
     agent_id VARCHAR NOT NULL,
-    action_type VARCHAR NOT NULL,            -- Type of action performed
-    block_number INTEGER NOT NULL,           -- Block when action was performed
+    address_id INTEGER,                      -- Acting address (addresses.address_id)
+    action_type VARCHAR NOT NULL,            -- Implementation executed
+    block_number BIGINT NOT NULL,            -- Block when action was performed
     timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    
-    FOREIGN KEY(agent_id) REFERENCES agents(agent_id)
-);
\ No newline at end of file
+    success BOOLEAN NOT NULL,
+
+    -- Wall time of each phase, in milliseconds
+    selection_ms DOUBLE,                     -- Agent choosing the implementation
+    call_generation_ms DOUBLE,               -- Implementation building its calls
+    transaction_ms DOUBLE,                   -- Sending the calls
+    state_update_ms DOUBLE,                  -- Applying receipts to the simulation state
+
+    gas_used BIGINT,                         -- Summed over the action's receipts
+    n_calls INTEGER,                         -- Calls generated by the implementation
+
+    FOREIGN KEY(agent_id) REFERENCES agents(agent_id),
+    FOREIGN KEY(simulation_run_id) REFERENCES simulation_runs(run_id)
+);
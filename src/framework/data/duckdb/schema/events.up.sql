@@ -6,13 +6,13 @@ CREATE TABLE IF NOT EXISTS events (
     block_number BIGINT NOT NULL,
     block_timestamp TIMESTAMP NOT NULL,
     transaction_hash VARCHAR NOT NULL,
-    tx_from VARCHAR,
-    tx_to VARCHAR,
+    tx_from_id INTEGER,                -- addresses.address_id
+    tx_to_id INTEGER,
     tx_index INTEGER,
     log_index INTEGER,
-    contract_address VARCHAR NOT NULL,
+    contract_address_id INTEGER NOT NULL,
     topic0 VARCHAR NOT NULL,           -- Store topic0 as plain text/hex string
-    event_data JSON,       -- Store event data as text
+    event_data JSON,       -- Decoded arguments; address arguments stay hex strings (not keyed)
     
     FOREIGN KEY(simulation_run_id) REFERENCES simulation_runs(run_id)
 );
\ No newline at end of file
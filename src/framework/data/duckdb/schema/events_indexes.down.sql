@@ -0,0 +1,5 @@
+-- Drop the events indexes before a bulk load; events_indexes.up.sql rebuilds them
+DROP INDEX IF EXISTS idx_events_combo;
+DROP INDEX IF EXISTS idx_events_tx_hash;
+DROP INDEX IF EXISTS idx_events_block_timestamp;
+DROP INDEX IF EXISTS idx_events_simulation_event;
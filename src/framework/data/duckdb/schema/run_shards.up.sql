@@ -0,0 +1,6 @@
+-- Catalog of per-run shard databases (see ShardCatalog)
+CREATE TABLE IF NOT EXISTS run_shards (
+    run_id INTEGER PRIMARY KEY,              -- Simulation run stored in the shard
+    path VARCHAR NOT NULL,                   -- Shard database file
+    created_at TIMESTAMP NOT NULL
+);
@@ -0,0 +1,11 @@
+CREATE TABLE IF NOT EXISTS state_snapshots (
+    simulation_run_id INTEGER NOT NULL,
+    block_number BIGINT NOT NULL,
+    block_timestamp TIMESTAMP NOT NULL,
+    kind VARCHAR NOT NULL,             -- 'keyframe' (full state) or 'delta' (changes since previous snapshot)
+    compression VARCHAR,               -- NULL for plain JSON, otherwise the codec (e.g. 'zstd')
+    raw_size BIGINT NOT NULL,          -- Size of the uncompressed JSON payload
+    payload BLOB NOT NULL,
+    PRIMARY KEY(simulation_run_id, block_number),
+    FOREIGN KEY(simulation_run_id) REFERENCES simulation_runs(run_id)
+);
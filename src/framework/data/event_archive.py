@@ -0,0 +1,225 @@
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime
+from pathlib import Path
+import json
+import pyarrow as pa
+import pyarrow.parquet as pq
+from .event_logging import ContractEvent
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Columns shared by every archived event, before the decoded arguments
+BASE_COLUMNS: List[Tuple[str, pa.DataType]] = [
+    ('event_name', pa.string()),
+    ('block_number', pa.int64()),
+    ('block_timestamp', pa.timestamp('us')),
+    ('transaction_hash', pa.string()),
+    ('tx_from', pa.string()),
+    ('tx_to', pa.string()),
+    ('tx_index', pa.int32()),
+    ('log_index', pa.int32()),
+    ('contract_address', pa.string()),
+    ('topic0', pa.string()),
+]
+
+
+def arrow_type_for(abi_type: str) -> pa.DataType:
+    """
+    Map a Solidity ABI type to an Arrow column type.
+
+    Integers up to 64 bits are stored natively. Wider integers (uint256 and
+    friends) exceed every Parquet integer type and are stored as exact
+    decimal strings, converted back to int on read.
+    """
+    if abi_type == 'address':
+        return pa.string()
+    if abi_type == 'bool':
+        return pa.bool_()
+    if abi_type.endswith(']') or abi_type.startswith('('):
+        return pa.string()  # arrays and tuples are stored as JSON
+    if abi_type.startswith('uint'):
+        bits = int(abi_type[4:] or 256)
+        return pa.uint64() if bits <= 64 else pa.string()
+    if abi_type.startswith('int'):
+        bits = int(abi_type[3:] or 256)
+        return pa.int64() if bits <= 64 else pa.string()
+    if abi_type.startswith('bytes'):
+        return pa.binary()
+    return pa.string()
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return '0x' + value.hex()
+    if isinstance(value, (list, tuple)):
+        return [_to_json_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _to_json_value(v) for k, v in value.items()}
+    return value if isinstance(value, (str, int, float)) or value is None else str(value)
+
+
+class EventArchive:
+    """
+    Local Parquet archive of historical contract events.
+
+    Files are laid out Hive-style so DuckDB can query the whole archive with
+    `read_parquet(..., hive_partitioning = true, hive_types_autocast = false)`:
+
+        <root>/contract=<address>/event=<name>/blocks_<start>_<end>.parquet
+
+    Each file covers an inclusive block range, even when it holds no events,
+    so the archive itself records which ranges are already indexed.
+    """
+
+    def __init__(self, root: str = "event_archive", compression: str = "zstd"):
+        self.root = Path(root)
+        self.compression = compression
+
+    def partition_dir(self, address: str, event_name: str) -> Path:
+        """Directory holding the files of one (contract, event)"""
+        return self.root / f"contract={str(address).lower()}" / f"event={event_name}"
+
+    def glob(self, address: Optional[str] = None, event_name: Optional[str] = None) -> str:
+        """Glob pattern for DuckDB read_parquet over (part of) the archive"""
+        contract = f"contract={str(address).lower()}" if address else "contract=*"
+        event = f"event={event_name}" if event_name else "event=*"
+        return str(self.root / contract / event / "*.parquet")
+
+    def _ranges(self, address: str, event_name: str) -> List[Tuple[int, int, Path]]:
+        """Archived block ranges, sorted by start block"""
+        directory = self.partition_dir(address, event_name)
+        if not directory.exists():
+            return []
+        ranges = []
+        for path in directory.glob("blocks_*.parquet"):
+            try:
+                _, start, end = path.stem.split('_')
+                ranges.append((int(start), int(end), path))
+            except ValueError:
+                logger.warning(f"Skipping unexpected archive file {path}")
+        return sorted(ranges)
+
+    def covered_until(self, address: str, event_name: str, start_block: int) -> Optional[int]:
+        """
+        Last block of the contiguous archived range beginning at start_block.
+
+        Returns None if start_block itself is not archived.
+        """
+        cursor = start_block - 1
+        for start, end, _ in self._ranges(address, event_name):
+            if end <= cursor:
+                continue
+            if start > cursor + 1:
+                break
+            cursor = end
+        return cursor if cursor >= start_block else None
+
+    def _schema(self, event_abi: Any) -> pa.Schema:
+        """Arrow schema for an event: base columns plus one column per argument"""
+        fields = [pa.field(name, dtype) for name, dtype in BASE_COLUMNS]
+        taken = {name for name, _ in BASE_COLUMNS}
+        abi_types = {}
+        for item in event_abi.inputs:
+            column = item.name if item.name not in taken else f"arg_{item.name}"
+            abi_type = getattr(item, 'canonical_type', item.type)
+            fields.append(pa.field(column, arrow_type_for(abi_type)))
+            abi_types[column] = {'arg': item.name, 'type': abi_type}
+            taken.add(column)
+        return pa.schema(fields, metadata={'abi_types': json.dumps(abi_types)})
+
+    def write(
+        self,
+        address: str,
+        event_name: str,
+        event_abi: Any,
+        events: List[ContractEvent],
+        start_block: int,
+        end_block: int
+    ) -> Path:
+        """Write the events of one indexed block range as a Parquet file"""
+        schema = self._schema(event_abi)
+        abi_types = json.loads(schema.metadata[b'abi_types'])
+        columns: Dict[str, List[Any]] = {f.name: [] for f in schema}
+
+        for event in events:
+            for name, _ in BASE_COLUMNS:
+                columns[name].append(getattr(event, name))
+            for column, info in abi_types.items():
+                value = (event.event_data or {}).get(info['arg'])
+                dtype = schema.field(column).type
+                if value is None:
+                    columns[column].append(None)
+                elif pa.types.is_string(dtype):
+                    if isinstance(value, (list, tuple, dict)):
+                        value = json.dumps(_to_json_value(value))
+                    columns[column].append(str(value))
+                elif pa.types.is_binary(dtype):
+                    columns[column].append(bytes(value))
+                else:
+                    columns[column].append(value)
+
+        table = pa.table(columns, schema=schema)
+        directory = self.partition_dir(address, event_name)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"blocks_{start_block}_{end_block}.parquet"
+        tmp_path = path.with_suffix('.parquet.tmp')
+        pq.write_table(table, tmp_path, compression=self.compression)
+        tmp_path.replace(path)
+
+        logger.info(f"Archived {len(events)} {event_name} events for blocks {start_block}-{end_block}")
+        return path
+
+    def read(
+        self,
+        address: str,
+        event_name: str,
+        start_block: Optional[int] = None,
+        end_block: Optional[int] = None
+    ) -> List[ContractEvent]:
+        """Read archived events of one (contract, event) within a block range"""
+        events = []
+        for start, end, path in self._ranges(address, event_name):
+            if (end_block is not None and start > end_block) or \
+               (start_block is not None and end < start_block):
+                continue
+            table = pq.read_table(path)
+            abi_types = json.loads((table.schema.metadata or {}).get(b'abi_types', b'{}'))
+            for row in table.to_pylist():
+                block_number = row['block_number']
+                if (start_block is not None and block_number < start_block) or \
+                   (end_block is not None and block_number > end_block):
+                    continue
+                events.append(self._to_event(row, abi_types))
+
+        events.sort(key=lambda e: (e.block_number, e.log_index or 0))
+        return events
+
+    @staticmethod
+    def _to_event(row: Dict[str, Any], abi_types: Dict[str, Dict[str, str]]) -> ContractEvent:
+        """Rebuild a ContractEvent from an archived row"""
+        event_data = {}
+        for column, info in abi_types.items():
+            value = row.get(column)
+            abi_type = info['type']
+            if isinstance(value, str):
+                if abi_type.endswith(']') or abi_type.startswith('('):
+                    value = json.loads(value)
+                elif abi_type.startswith(('uint', 'int')):
+                    value = int(value)
+            event_data[info['arg']] = value
+
+        return ContractEvent(
+            simulation_run_id=0,
+            event_name=row['event_name'],
+            block_number=row['block_number'],
+            block_timestamp=row['block_timestamp'],
+            transaction_hash=row['transaction_hash'],
+            tx_from=row['tx_from'],
+            tx_to=row['tx_to'],
+            tx_index=row['tx_index'],
+            log_index=row['log_index'],
+            contract_address=row['contract_address'],
+            topic0=row['topic0'],
+            event_data=event_data
+        )
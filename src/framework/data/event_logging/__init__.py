@@ -1,8 +1,19 @@
 from .event_logger import EventLogger, ContractEvent
 from .event_handler import ContractEventHandler
+from .event_bus import EventBus, Subscription
+from .capture_policy import EventCapturePolicy
+from .receipt_cache import DecodedReceiptCache
+from .abi_registry import EventABIRegistry
+from .typed_tables import TypedEventTables
 
 __all__ = [
     'EventLogger',
     'ContractEvent',
-    'ContractEventHandler'
+    'ContractEventHandler',
+    'EventBus',
+    'EventCapturePolicy',
+    'Subscription',
+    'DecodedReceiptCache',
+    'EventABIRegistry',
+    'TypedEventTables'
 ]
\ No newline at end of file
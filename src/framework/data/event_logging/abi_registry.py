@@ -0,0 +1,207 @@
+from typing import Any, Dict, Iterator, List, Optional
+from pathlib import Path
+import hashlib
+import json
+from ethpm_types.abi import EventABI
+from eth_utils import encode_hex, keccak
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the cache file layout changes
+CACHE_VERSION = 1
+
+
+def topic_hex(topic: Any) -> str:
+    """Normalize a log topic (bytes or hex string) to lowercase 0x-hex"""
+    if isinstance(topic, (bytes, bytearray)):
+        return encode_hex(bytes(topic))
+    topic = str(topic).lower()
+    return topic if topic.startswith('0x') else f"0x{topic}"
+
+
+def event_topic0(event_abi: EventABI) -> str:
+    """topic0 of an event: keccak of its canonical signature"""
+    return encode_hex(keccak(text=event_abi.selector))
+
+
+class EventABIRegistry:
+    """
+    Event ABIs indexed by topic0.
+
+    Built once from every ABI file under the ABI directory, with duplicate
+    events (the same event copied across per-address ABI files) collapsed to
+    a single entry. Entries are keyed by topic0 and then by the number of
+    indexed arguments, since events like ERC20 and ERC721 `Transfer` share a
+    signature but differ in which arguments are indexed.
+
+    The registry is persisted to a JSON cache file tagged with a hash of the
+    ABI directory listing, so later startups skip re-parsing the ABI files
+    until one of them changes.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, Dict[int, Dict[str, Any]]]] = None):
+        self._raw = entries or {}
+        self._events: Dict[str, Dict[int, EventABI]] = {
+            topic: {n_indexed: self._to_abi(item) for n_indexed, item in variants.items()}
+            for topic, variants in self._raw.items()
+        }
+
+    @staticmethod
+    def _to_abi(item: Dict[str, Any]) -> EventABI:
+        return EventABI(
+            name=item['name'],
+            inputs=item.get('inputs', []),
+            anonymous=item.get('anonymous', False)
+        )
+
+    @staticmethod
+    def directory_hash(abi_dir: Path) -> str:
+        """Hash of the ABI files' paths, sizes and modification times"""
+        digest = hashlib.sha256()
+        for path in sorted(Path(abi_dir).rglob("*.json")):
+            stat = path.stat()
+            digest.update(f"{path.relative_to(abi_dir)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def build(cls, abi_dir: Path) -> 'EventABIRegistry':
+        """Parse every ABI file under abi_dir and index its events"""
+        entries: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        files = 0
+        for abi_path in sorted(Path(abi_dir).rglob("*.json")):
+            try:
+                with open(abi_path) as f:
+                    contract_abi = json.load(f)
+                if not isinstance(contract_abi, list):
+                    continue
+                files += 1
+                for item in contract_abi:
+                    if item.get('type') != 'event' or item.get('anonymous', False):
+                        continue
+                    item = {
+                        'name': item['name'],
+                        'inputs': item.get('inputs', []),
+                        'anonymous': False
+                    }
+                    topic = event_topic0(cls._to_abi(item))
+                    n_indexed = sum(1 for i in item['inputs'] if i.get('indexed'))
+                    entries.setdefault(topic, {}).setdefault(n_indexed, item)
+            except Exception as e:
+                logger.error(f"Failed to load ABI from {abi_path}: {e}")
+
+        registry = cls(entries)
+        logger.info(f"Indexed {len(registry)} unique events from {files} ABI files")
+        return registry
+
+    @classmethod
+    def load(cls, abi_dir: Path, cache_path: Optional[Path] = None) -> 'EventABIRegistry':
+        """
+        Load the registry from cache_path, rebuilding it if the ABI
+        directory changed since the cache was written.
+        """
+        abi_dir = Path(abi_dir)
+        digest = cls.directory_hash(abi_dir)
+
+        if cache_path and Path(cache_path).exists():
+            try:
+                with open(cache_path) as f:
+                    cached = json.load(f)
+                if cached.get('version') == CACHE_VERSION and cached.get('digest') == digest:
+                    entries = {
+                        topic: {int(n): item for n, item in variants.items()}
+                        for topic, variants in cached['events'].items()
+                    }
+                    registry = cls(entries)
+                    logger.info(f"Loaded {len(registry)} events from ABI registry cache {cache_path}")
+                    return registry
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable ABI registry cache {cache_path}: {e}")
+
+        registry = cls.build(abi_dir)
+        if cache_path:
+            registry.save(Path(cache_path), digest)
+        return registry
+
+    def save(self, cache_path: Path, digest: str):
+        """Persist the registry; writes are atomic"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(cache_path.suffix + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'digest': digest, 'events': self._raw}, f)
+            tmp_path.replace(cache_path)
+        except Exception as e:
+            logger.warning(f"Failed to write ABI registry cache {cache_path}: {e}")
+
+    def __len__(self) -> int:
+        return sum(len(variants) for variants in self._events.values())
+
+    def __iter__(self) -> Iterator[EventABI]:
+        for variants in self._events.values():
+            yield from variants.values()
+
+    @property
+    def abis(self) -> List[EventABI]:
+        """All unique event ABIs"""
+        return list(self)
+
+    def get(self, topic0: Any, n_indexed: Optional[int] = None) -> Optional[EventABI]:
+        """
+        Look up an event ABI by topic0.
+
+        Args:
+            topic0: First log topic, as bytes or hex string
+            n_indexed: Number of indexed arguments (log topics minus one),
+                used to pick between events sharing a signature
+
+        Returns:
+            The matching EventABI, or None if unknown
+        """
+        variants = self._events.get(topic_hex(topic0))
+        if not variants:
+            return None
+        if n_indexed is not None:
+            return variants.get(n_indexed)
+        return next(iter(variants.values()))
+
+    def variants(self, topic0: Any) -> Dict[int, EventABI]:
+        """Event ABIs sharing a topic0, by number of indexed arguments"""
+        return self._events.get(topic_hex(topic0), {})
+
+    def topics(self, event_name: str) -> List[str]:
+        """topic0 of every known signature of an event name"""
+        return [
+            topic for topic, variants in self._events.items()
+            if any(abi.name == event_name for abi in variants.values())
+        ]
+
+    def abi_for_log(self, log: Dict[str, Any]) -> Optional[EventABI]:
+        """Event ABI of a raw receipt log"""
+        topics = log.get('topics') or []
+        if not topics:
+            return None
+        return self.get(topics[0], len(topics) - 1)
+
+    def decode_logs(self, tx: Any) -> List[Any]:
+        """
+        Decode the logs of a receipt with one dict lookup per log.
+
+        Logs of unknown events are skipped, like ReceiptAPI.decode_logs.
+        """
+        ecosystem = tx.provider.network.ecosystem
+        decoded = []
+        for log in tx.logs:
+            decoded.extend(self.decode_log(log, ecosystem))
+        return decoded
+
+    def decode_log(self, log: Dict[str, Any], ecosystem: Any) -> List[Any]:
+        """Decode one raw log; empty if its event is unknown or undecodable"""
+        event_abi = self.abi_for_log(log)
+        if event_abi is None:
+            return []
+        try:
+            return list(ecosystem.decode_logs([log], event_abi))
+        except Exception as e:
+            logger.debug(f"Failed to decode {event_abi.name} log: {e}")
+            return []
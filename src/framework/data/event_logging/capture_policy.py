@@ -0,0 +1,109 @@
+from typing import Any, Dict, Iterable, Optional, Set
+import zlib
+from .abi_registry import EventABIRegistry
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _names(values: Optional[Iterable[str]]) -> Optional[Set[str]]:
+    return set(values) if values else None
+
+
+def _addresses(values: Optional[Iterable[str]]) -> Optional[Set[str]]:
+    return {str(v).lower() for v in values} if values else None
+
+
+class EventCapturePolicy:
+    """
+    Which receipt logs are decoded and recorded.
+
+    Logs are matched on their raw form (topic0, emitting contract) and the
+    implementation that sent the transaction, so rejected logs are never
+    decoded. Include lists keep only what they name (empty means all);
+    exclude lists win over include lists. Sampling keeps a fraction of an
+    event's logs, chosen by a hash of (tx hash, log index) so reruns keep
+    the same logs.
+
+    Config (network_config `event_capture`):
+        include_events / exclude_events: event names
+        include_contracts / exclude_contracts: contract addresses
+        include_implementations / exclude_implementations: implementation names
+        sample_rates: event name -> fraction of logs kept (0..1)
+    """
+
+    def __init__(
+        self,
+        registry: EventABIRegistry,
+        include_events: Optional[Iterable[str]] = None,
+        exclude_events: Optional[Iterable[str]] = None,
+        include_contracts: Optional[Iterable[str]] = None,
+        exclude_contracts: Optional[Iterable[str]] = None,
+        include_implementations: Optional[Iterable[str]] = None,
+        exclude_implementations: Optional[Iterable[str]] = None,
+        sample_rates: Optional[Dict[str, float]] = None
+    ):
+        self.registry = registry
+        self.include_events = _names(include_events)
+        self.exclude_events = _names(exclude_events) or set()
+        self.include_contracts = _addresses(include_contracts)
+        self.exclude_contracts = _addresses(exclude_contracts) or set()
+        self.include_implementations = _names(include_implementations)
+        self.exclude_implementations = _names(exclude_implementations) or set()
+        self.sample_rates = {name: float(rate) for name, rate in (sample_rates or {}).items()}
+        self.seen = 0
+        self.captured = 0
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]], registry: EventABIRegistry) -> Optional['EventCapturePolicy']:
+        """Policy from the event_capture config section; None when it sets nothing"""
+        if not config or not any(config.values()):
+            return None
+        policy = cls(registry, **config)
+        logger.info(f"Event capture policy: {policy}")
+        return policy
+
+    def __repr__(self) -> str:
+        settings = {
+            key: value for key, value in vars(self).items()
+            if key not in ('registry', 'seen', 'captured') and value
+        }
+        return f"EventCapturePolicy({settings})"
+
+    def captures_implementation(self, implementation: Optional[str]) -> bool:
+        """Whether logs of transactions sent by this implementation may be captured"""
+        if implementation in self.exclude_implementations:
+            return False
+        return self.include_implementations is None or implementation in self.include_implementations
+
+    def _event_name(self, topics: list) -> Optional[str]:
+        event_abi = self.registry.get(topics[0], len(topics) - 1)
+        return event_abi.name if event_abi else None
+
+    def captures(self, log: Dict[str, Any], tx_hash: str, log_index: Optional[int]) -> bool:
+        """Whether a raw log is decoded and recorded"""
+        self.seen += 1
+        topics = log.get('topics') or []
+        if not topics:
+            return False
+        address = str(log.get('address', '')).lower()
+        if address in self.exclude_contracts:
+            return False
+        if self.include_contracts is not None and address not in self.include_contracts:
+            return False
+
+        name = self._event_name(topics)
+        if name in self.exclude_events:
+            return False
+        if self.include_events is not None and name not in self.include_events:
+            return False
+
+        rate = self.sample_rates.get(name)
+        if rate is not None and rate < 1.0:
+            if zlib.crc32(f"{tx_hash}:{log_index}".encode()) / 0x100000000 >= rate:
+                return False
+        self.captured += 1
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {'seen': self.seen, 'captured': self.captured}
@@ -0,0 +1,232 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import asyncio
+import queue
+import threading
+import time
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+# What publish() does when a subscriber's queue is full
+POLICIES = ('block', 'drop_newest', 'drop_oldest')
+
+
+class Subscription:
+    """
+    One consumer of the event bus, with its own bounded queue and thread.
+
+    The consumer thread takes events off the queue in batches of up to
+    `batch_size` (waiting at most `max_wait` seconds to fill one) and hands
+    them to the callback: the whole list when `batch` is set, otherwise one
+    event at a time. Coroutine callbacks run on the given asyncio loop.
+
+    A full queue blocks the publisher by default, so no event is lost; the
+    drop policies trade completeness for never stalling the simulation.
+    """
+
+    def __init__(
+        self,
+        callback: Callable,
+        name: str,
+        event_names: Optional[Iterable[str]] = None,
+        maxsize: int = 10_000,
+        batch_size: int = 100,
+        max_wait: float = 0.5,
+        policy: str = 'block',
+        batch: bool = False,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}, expected one of {POLICIES}")
+        self.callback = callback
+        self.name = name
+        self.event_names = set(event_names) if event_names else None
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+        self.policy = policy
+        self.batch = batch
+        self.loop = loop
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, maxsize))
+        self._closed = False
+
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.blocked = 0
+
+        self._thread = threading.Thread(target=self._run, name=f"event-bus-{name}", daemon=True)
+        self._thread.start()
+
+    def wants(self, event: Any) -> bool:
+        return self.event_names is None or event.event_name in self.event_names
+
+    def offer(self, event: Any):
+        """Queue an event according to the overflow policy"""
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait(event)
+            return
+        except queue.Full:
+            pass
+        if self.policy == 'block':
+            self.blocked += 1
+            self._queue.put(event)
+        elif self.policy == 'drop_newest':
+            self.dropped += 1
+        else:
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self.dropped += 1
+
+    def _next_batch(self) -> Optional[List[Any]]:
+        """Up to batch_size events; None once stopped and drained"""
+        item = self._queue.get()
+        if item is _STOP:
+            self._queue.task_done()
+            return None
+        batch = [item]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Deliver what we have, then stop
+                self._queue.task_done()
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _call(self, payload: Any):
+        result = self.callback(payload)
+        if asyncio.iscoroutine(result):
+            if self.loop is None:
+                asyncio.run(result)
+            else:
+                asyncio.run_coroutine_threadsafe(result, self.loop).result()
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            payloads = [batch] if self.batch else batch
+            for payload in payloads:
+                try:
+                    self._call(payload)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Event subscriber {self.name} failed: {e}")
+            self.delivered += len(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def pending(self) -> int:
+        """Events queued or being delivered"""
+        # Counted from put() until task_done() after delivery, so an event
+        # taken off the queue is never missed between the two
+        with self._queue.mutex:
+            return self._queue.unfinished_tasks
+
+    def close(self, timeout: Optional[float] = None):
+        """Deliver what is queued, then stop the consumer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'pending': self.pending(),
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'blocked': self.blocked,
+            'errors': self.errors,
+            'policy': self.policy,
+        }
+
+
+class EventBus:
+    """
+    Fan-out of recorded events to live consumers off the simulation thread.
+
+    publish() only puts the event on each interested subscriber's bounded
+    queue; callbacks run on the subscriber's own thread (or asyncio loop),
+    so a slow dashboard or processor never holds up agent execution. When a
+    queue is full the subscriber's policy decides: 'block' applies
+    backpressure to the simulation, 'drop_newest' / 'drop_oldest' lose
+    events and count them.
+    """
+
+    def __init__(self):
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable, name: Optional[str] = None, **options) -> Subscription:
+        """
+        Attach a consumer.
+
+        Args:
+            callback: Called with each event, or with a list of events when
+                batch=True; may be a coroutine function
+            name: Label for logs and stats (defaults to the callback name)
+            **options: event_names, maxsize, batch_size, max_wait, policy,
+                batch, loop (see Subscription)
+
+        Returns:
+            The Subscription, for unsubscribe() and stats
+        """
+        name = name or getattr(callback, '__name__', 'subscriber')
+        subscription = Subscription(callback, name, **options)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+        logger.debug(f"Subscribed {name} to events ({subscription.policy})")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription, timeout: Optional[float] = None):
+        """Detach a consumer after delivering its queued events"""
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+        subscription.close(timeout)
+
+    def publish(self, event: Any):
+        """Queue an event for every subscriber interested in it"""
+        for subscription in self._subscriptions:
+            if subscription.wants(event):
+                subscription.offer(event)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queue is empty; False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while any(s.pending() for s in self._subscriptions):
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Deliver queued events and stop all consumers"""
+        with self._lock:
+            subscriptions, self._subscriptions = self._subscriptions, []
+        for subscription in subscriptions:
+            subscription.close(timeout)
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {s.name: s.stats() for s in self._subscriptions}
@@ -2,6 +2,9 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 from ape import Contract
 from .event_logger import ContractEvent, EventLogger
+from .event_bus import EventBus, Subscription
+from .capture_policy import EventCapturePolicy
+from .receipt_cache import DecodedReceiptCache
 from src.framework.logging import get_logger
 import json
 from pathlib import Path
@@ -17,13 +20,26 @@ class ContractEventHandler:
         self, 
         event_logger: EventLogger, 
         simulation_run_id: int,
-        abis: Optional[List[Dict[str, Any]]] = None
+        abis: Optional[List[Dict[str, Any]]] = None,
+        receipt_cache: Optional[DecodedReceiptCache] = None,
+        bus: Optional[EventBus] = None,
+        capture: Optional[EventCapturePolicy] = None
     ):
         self.logger = event_logger
+        self.capture = capture
+        self.bus = bus if bus is not None else getattr(event_logger, 'bus', None)
         self.simulation_run_id = simulation_run_id
         self.abis = abis or []
+        self.receipt_cache = receipt_cache or DecodedReceiptCache(self.abis)
         self._event_processors = {}
 
+    @staticmethod
+    def _as_int(value: Any) -> Optional[int]:
+        """Receipt fields may be ints or hex strings"""
+        if isinstance(value, str):
+            return int(value, 16)
+        return value
+
     def _process_event_arg(self, arg: Any) -> Any:
         """Process event argument into a serializable format"""
         if arg is None:
@@ -76,10 +92,30 @@ class ContractEventHandler:
             return
             
         try:
-            decoded_logs = tx.decode_logs(abi=self.abis)
+            if not self.receipt_cache.claim(tx, 'event_handler'):
+                logger.debug(f"Events of {tx.txn_hash} already recorded")
+                return
+
+            if self.capture is None:
+                decoded_logs = self.receipt_cache.decode_logs(tx)
+            else:
+                # Filter raw logs first; rejected logs are never decoded
+                if not self.capture.captures_implementation(context.current_action if context else None):
+                    return
+                tx_hash = str(tx.txn_hash)
+                selected = set()
+                for log in tx.logs:
+                    index = self._as_int(log.get('logIndex'))
+                    if self.capture.captures(log, tx_hash, index):
+                        selected.add(index)
+                if not selected:
+                    return
+                decoded_logs = self.receipt_cache.decode_selected(tx, selected)
+            # Undecodable logs are skipped, so match raw logs by log index
+            raw_logs = {self._as_int(log.get('logIndex')): log for log in tx.logs}
             for i, decoded_log in enumerate(decoded_logs):
                 try:
-                    log = tx.logs[i]
+                    log = raw_logs.get(decoded_log.log_index, {})
                     topic0 = log.get('topics', [])[0] if log.get('topics') else None
                     topic0_string = '0x' + topic0.hex().upper() if topic0 else None
                     
@@ -97,8 +133,8 @@ class ContractEventHandler:
                         transaction_hash=str(tx.txn_hash),
                         tx_from=str(tx.sender),
                         tx_to=str(tx.receiver),
-                        tx_index=log.get('transactionIndex'),
-                        log_index=log.get('logIndex'),
+                        tx_index=decoded_log.transaction_index,
+                        log_index=decoded_log.log_index,
                         contract_address=str(decoded_log.contract_address),
                         topic0=topic0_string,
                         event_data=processed_event_data
@@ -125,6 +161,23 @@ class ContractEventHandler:
                 lambda evt: self.handle_contract_event(evt, contract)
             )
             
-    def register_event_processor(self, event_name: str, processor_func):
-        """Register a custom processor function for specific events"""
-        self._event_processors[event_name] = processor_func
\ No newline at end of file
+    def register_event_processor(
+        self,
+        event_name: str,
+        processor_func,
+        asynchronous: bool = False,
+        **options
+    ) -> Optional[Subscription]:
+        """
+        Register a custom processor function for specific events.
+
+        Processors run inline on the simulation thread, unless asynchronous
+        is set: they are then subscribed to the event bus for this event
+        and run on their own thread (options as in EventBus.subscribe).
+        """
+        if asynchronous:
+            if self.bus is None:
+                raise ValueError("No event bus to run asynchronous processors on")
+            return self.bus.subscribe(processor_func, event_names=[event_name], **options)
+        self._event_processors[event_name] = processor_func
+        return None
\ No newline at end of file
@@ -1,9 +1,16 @@
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 import json
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from pathlib import Path
+import threading
 import duckdb
+import pyarrow as pa
+from ..address_dictionary import AddressDictionary
+from ..background_writer import BackgroundWriter
+from .abi_registry import EventABIRegistry
+from .event_bus import EventBus, Subscription
+from .typed_tables import TypedEventTables
 from src.framework.logging import get_logger
 
 logger = get_logger(__name__)
@@ -24,19 +31,75 @@ class ContractEvent:
     event_data: Dict
     action_name: Optional[str] = None
 
+# Column layout of the events table, in insert order; addresses are
+# stored as AddressDictionary keys
+EVENT_COLUMNS = [
+    ('simulation_run_id', pa.int32()),
+    ('action_name', pa.string()),
+    ('event_name', pa.string()),
+    ('block_number', pa.int64()),
+    ('block_timestamp', pa.timestamp('us')),
+    ('transaction_hash', pa.string()),
+    ('tx_from_id', pa.int32()),
+    ('tx_to_id', pa.int32()),
+    ('tx_index', pa.int32()),
+    ('log_index', pa.int32()),
+    ('contract_address_id', pa.int32()),
+    ('topic0', pa.string()),
+    ('event_data', pa.string()),
+]
+EVENT_SCHEMA = pa.schema(EVENT_COLUMNS)
+
+
 class EventLogger:
-    """Efficient event logging system for contract events"""
+    """
+    Efficient event logging system for contract events.
+
+    Events are buffered column-wise and appended to the events table as one
+    Arrow batch every `batch_size` events, on flush() (called at iteration
+    boundaries) and when the run ends, instead of one INSERT and commit per
+    event.
+    """
     
-    def __init__(self, connection: duckdb.DuckDBPyConnection):
-        """Initialize with DuckDB connection"""
+    def __init__(
+        self,
+        connection: duckdb.DuckDBPyConnection,
+        batch_size: int = 1000,
+        registry: Optional[EventABIRegistry] = None,
+        addresses: Optional[AddressDictionary] = None,
+        bus: Optional[EventBus] = None
+    ):
+        """
+        Initialize with DuckDB connection.
+
+        With an ABI registry, events are also written to typed per-event
+        tables (see TypedEventTables). Recorded events are published to
+        `bus` for live subscribers.
+        """
         self.con = connection
         self.sql_dir = Path(__file__).parent.parent / "duckdb"
+        # Shared with the collector; an empty dictionary is falsy, hence the explicit check
+        self.addresses = addresses if addresses is not None else AddressDictionary(connection, self.sql_dir)
+        self.batch_size = max(1, batch_size)
+        self._queries: Dict[str, str] = {}
         self._initialize_table()
-        self._subscribers = []
+        self.bus = bus if bus is not None else EventBus()
+        self._buffer_lock = threading.Lock()
+        self._buffer = self._empty_buffer()
+        self._buffered = 0
+        # Batches taken from the buffer and not yet committed, oldest first
+        self._pending: List[Tuple[Dict[str, List], int, List, Optional[pa.Table]]] = []
+        self.typed_tables = TypedEventTables(connection, registry) if registry else None
+        # Set when a BackgroundWriter owns the connection
+        self.writer: Optional[BackgroundWriter] = None
+
+    @staticmethod
+    def _empty_buffer() -> Dict[str, List]:
+        return {name: [] for name, _ in EVENT_COLUMNS}
 
-    def subscribe(self, callback):
-        """Add a subscriber callback"""
-        self._subscribers.append(callback)
+    def subscribe(self, callback, **options) -> Subscription:
+        """Add a subscriber callback, run off the simulation thread (see EventBus.subscribe)"""
+        return self.bus.subscribe(callback, **options)
         
     def _initialize_table(self):
         """Ensure events table exists"""
@@ -46,51 +109,125 @@ class EventLogger:
             self.con.commit()
 
     def _read_query(self, filename: str) -> str:
-        """Read SQL query from file"""
-        query_file = self.sql_dir / "queries" / filename
-        with open(query_file, 'r') as f:
-            return f.read()
+        """Read SQL query from file, once"""
+        if filename not in self._queries:
+            query_file = self.sql_dir / "queries" / filename
+            with open(query_file, 'r') as f:
+                self._queries[filename] = f.read()
+        return self._queries[filename]
 
     def record_event(self, event: ContractEvent) -> bool:
-        """Record a contract event to the database"""
+        """Buffer a contract event; it is written on the next flush"""
         try:
-            sql = self._read_query("insert_event.sql")
-            
-            # Convert dataclass to dict and serialize JSON fields
-            data = asdict(event)
-            data['event_data'] = {key: str(value) for key, value in data['event_data'].items()}
-            
-            self.con.execute(sql, [
-                data['simulation_run_id'],
-                data['action_name'],
-                data['event_name'],
-                data['block_number'],
-                data['block_timestamp'],
-                data['transaction_hash'],
-                data['tx_from'],
-                data['tx_to'],
-                data['tx_index'],
-                data['log_index'],
-                data['contract_address'],
-                data['topic0'],
-                data['event_data']
-            ])
-            self.con.commit()
-            logger.info(f"Recorded contract event '{data['event_name']}' at block {data['block_number']}")
-
-            # Notify subscribers
-            for subscriber in self._subscribers:
-                try:
-                    subscriber(event)
-                except Exception as e:
-                    logger.error(f"Error notifying subscriber: {e}")
-                    
+            event_data = {key: str(value) for key, value in (event.event_data or {}).items()}
+
+            row = {
+                **{name: getattr(event, name, None) for name, _ in EVENT_COLUMNS},
+                'tx_from_id': self.addresses.key(event.tx_from),
+                'tx_to_id': self.addresses.key(event.tx_to),
+                'contract_address_id': self.addresses.key(event.contract_address),
+                'event_data': json.dumps(event_data),
+            }
+
+            with self._buffer_lock:
+                for name, _ in EVENT_COLUMNS:
+                    self._buffer[name].append(row[name])
+                self._buffered += 1
+                full = self._buffered >= self.batch_size
+            if self.typed_tables:
+                self.typed_tables.add(event)
+            logger.debug(f"Buffered contract event '{event.event_name}' at block {event.block_number}")
+
+            # Notify subscribers (queued, delivered on their own threads)
+            self.bus.publish(event)
+
+            if full:
+                self.flush()
             return True
             
         except Exception as e:
             logger.error(f"Failed to record event {event.event_name}: {e}")
             return False
 
+    def flush(self, strict: bool = False) -> int:
+        """
+        Append all buffered events in a single insert.
+
+        A batch that fails to write is kept and retried, ahead of newer
+        events, on the next flush. With a background writer attached, the
+        insert is queued on the writer thread and this returns without
+        waiting for it, unless strict.
+
+        Args:
+            strict: Wait for the write and raise if events remain unwritten
+
+        Returns:
+            Number of events flushed
+        """
+        with self._buffer_lock:
+            count = self._buffered
+            if count:
+                typed = self.typed_tables.take() if self.typed_tables else []
+                self._pending.append((self._buffer, count, typed, self.addresses.take()))
+                self._buffer, self._buffered = self._empty_buffer(), 0
+            if not self._pending:
+                return 0
+
+        if self.writer is not None and not self.writer.is_writer_thread():
+            future = self.writer.submit(self._write_pending, strict)
+            return future.result() if strict else count
+        return self._write_pending(strict)
+
+    def _write_pending(self, strict: bool = False) -> int:
+        """Write pending batches in order, stopping at the first that fails"""
+        written = 0
+        while True:
+            with self._buffer_lock:
+                if not self._pending:
+                    return written
+                batch = self._pending[0]
+            try:
+                self._write_batch(*batch)
+            except Exception as e:
+                unwritten = sum(pending[1] for pending in self._pending)
+                logger.error(f"Failed to write {batch[1]} buffered events, {unwritten} kept for the next flush: {e}")
+                if strict:
+                    raise
+                return written
+            with self._buffer_lock:
+                self._pending.pop(0)
+            written += batch[1]
+
+    def _write_batch(
+        self,
+        buffer: Dict[str, List],
+        count: int,
+        typed: List = None,
+        new_addresses: Optional[pa.Table] = None
+    ):
+        """Insert one columnar batch of events, plus the addresses it introduced and its typed per-event rows, in one transaction"""
+        self.con.begin()
+        try:
+            self.addresses.write(new_addresses)
+            batch = pa.table(buffer, schema=EVENT_SCHEMA)
+            columns = ', '.join(name for name, _ in EVENT_COLUMNS)
+            self.con.register('_event_batch', batch)
+            try:
+                self.con.execute(f"INSERT INTO events ({columns}) SELECT {columns} FROM _event_batch")
+            finally:
+                self.con.unregister('_event_batch')
+            if typed:
+                self.typed_tables.write(typed)
+            self.con.commit()
+            logger.info(f"Recorded {count} contract events")
+
+        except Exception:
+            self.con.rollback()
+            # Tables created in the rolled back transaction are created again on retry
+            for table, _ in typed or []:
+                table.created = False
+            raise
+
     def get_events(
         self,
         simulation_run_id: int,
@@ -101,6 +238,7 @@ class EventLogger:
     ) -> List[Dict]:
         """Query events with filters"""
         try:
+            self.flush()
             sql = self._read_query("get_events.sql")
             params = [simulation_run_id]
             
@@ -128,6 +266,7 @@ class EventLogger:
     def get_event_stats(self, simulation_run_id: int) -> List[Dict]:
         """Get event statistics for a simulation run"""
         try:
+            self.flush()
             sql = self._read_query("get_event_stats.sql")
             return self.con.execute(sql, [simulation_run_id]).fetchdf().to_dict('records')
             
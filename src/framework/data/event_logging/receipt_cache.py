@@ -0,0 +1,124 @@
+from typing import Any, Collection, Dict, List, Optional
+from collections import OrderedDict
+import threading
+from .abi_registry import EventABIRegistry
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _as_int(value: Any) -> Optional[int]:
+    """Receipt fields may be ints or hex strings"""
+    if isinstance(value, str):
+        return int(value, 16)
+    return value
+
+
+class DecodedReceiptCache:
+    """
+    Bounded LRU of decoded transaction logs, keyed by tx hash.
+
+    Shared by every consumer of a receipt (event logging, simulation state
+    updates) so that each receipt is decoded once. It also records which
+    consumers have already processed a receipt, letting callers that may see
+    the same receipt twice (e.g. MasterClient and the generated clients) skip
+    repeated work.
+    """
+
+    def __init__(
+        self,
+        abis: Optional[List[Any]] = None,
+        maxsize: int = 256,
+        registry: Optional[EventABIRegistry] = None
+    ):
+        self.abis = abis or []
+        self.registry = registry
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(tx: Any) -> str:
+        return str(getattr(tx, 'txn_hash', None) or id(tx))
+
+    def _entry(self, key: str) -> Dict[str, Any]:
+        """Get or create an entry, marking it most recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = {'logs': None, 'consumers': set()}
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _decode(self, tx: Any) -> List[Any]:
+        """Decode all logs of a receipt"""
+        if self.registry is not None:
+            return self.registry.decode_logs(tx)
+        return list(tx.decode_logs(abi=self.abis))
+
+    def get(self, tx: Any) -> Optional[List[Any]]:
+        """Decoded logs of a receipt if already decoded, without decoding"""
+        with self._lock:
+            entry = self._entries.get(self._key(tx))
+            if entry is None or entry['logs'] is None:
+                return None
+            self.hits += 1
+            return entry['logs']
+
+    def decode_logs(self, tx: Any) -> List[Any]:
+        """Decoded logs of a receipt, decoding on first request only"""
+        key = self._key(tx)
+        with self._lock:
+            entry = self._entry(key)
+            if entry['logs'] is not None:
+                self.hits += 1
+                return entry['logs']
+        logs = self._decode(tx)
+        with self._lock:
+            self.misses += 1
+            self._entry(key)['logs'] = logs
+        return logs
+
+    def decode_selected(self, tx: Any, log_indexes: Collection[Optional[int]]) -> List[Any]:
+        """
+        Decoded logs of a receipt, limited to the given log indexes.
+
+        Uses the cached decoding when there is one; otherwise, with a
+        registry, only the selected logs are decoded (and not cached, being
+        partial).
+        """
+        logs = self.get(tx)
+        if logs is None and self.registry is None:
+            logs = self.decode_logs(tx)
+        if logs is not None:
+            return [log for log in logs if log.log_index in log_indexes]
+        ecosystem = tx.provider.network.ecosystem
+        decoded = []
+        for log in tx.logs:
+            if _as_int(log.get('logIndex')) in log_indexes:
+                decoded.extend(self.registry.decode_log(log, ecosystem))
+        return decoded
+
+    def claim(self, tx: Any, consumer: str) -> bool:
+        """
+        Record that `consumer` is processing this receipt.
+
+        Returns True the first time a consumer claims a receipt and False on
+        every later call, so the caller can return early.
+        """
+        with self._lock:
+            consumers = self._entry(self._key(tx))['consumers']
+            if consumer in consumers:
+                return False
+            consumers.add(consumer)
+            return True
+
+    def clear(self):
+        """Drop all cached receipts"""
+        with self._lock:
+            self._entries.clear()
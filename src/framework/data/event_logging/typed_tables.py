@@ -0,0 +1,207 @@
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from decimal import Decimal
+import json
+import sys
+import threading
+import duckdb
+import pyarrow as pa
+from .abi_registry import EventABIRegistry
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Columns every typed event table starts with
+BASE_COLUMNS: List[Tuple[str, str, pa.DataType]] = [
+    ('simulation_run_id', 'INTEGER', pa.int32()),
+    ('block_number', 'BIGINT', pa.int64()),
+    ('block_timestamp', 'TIMESTAMP', pa.timestamp('us')),
+    ('transaction_hash', 'VARCHAR', pa.string()),
+    ('log_index', 'INTEGER', pa.int32()),
+    ('contract_address', 'VARCHAR', pa.string()),
+]
+
+# DECIMAL(38, 0) is the widest exact integer type shared by DuckDB and Arrow
+MAX_DECIMAL = 10 ** 38
+
+
+def column_types(abi_type: str) -> Tuple[str, pa.DataType]:
+    """
+    DuckDB and Arrow column types for a Solidity ABI type.
+
+    Integers wider than 64 bits (uint256 amounts) are stored as
+    DECIMAL(38, 0); see TypedEventTable for values that do not fit. Arrays
+    and tuples are kept as JSON, bytes as hex text.
+    """
+    if abi_type == 'address' or abi_type == 'string':
+        return 'VARCHAR', pa.string()
+    if abi_type == 'bool':
+        return 'BOOLEAN', pa.bool_()
+    if abi_type.endswith(']') or abi_type.startswith('('):
+        return 'JSON', pa.string()
+    if abi_type.startswith('uint'):
+        bits = int(abi_type[4:] or 256)
+        if bits <= 64:
+            return 'UBIGINT', pa.uint64()
+        return 'DECIMAL(38, 0)', pa.decimal128(38, 0)
+    if abi_type.startswith('int'):
+        bits = int(abi_type[3:] or 256)
+        if bits <= 64:
+            return 'BIGINT', pa.int64()
+        return 'DECIMAL(38, 0)', pa.decimal128(38, 0)
+    return 'VARCHAR', pa.string()
+
+
+class TypedEventTable:
+    """
+    Layout and row buffer of the typed table of one event signature.
+
+    Wide integer arguments get a DECIMAL(38, 0) column plus a `<arg>_raw`
+    VARCHAR column that is only filled when the value exceeds 38 digits
+    (e.g. Circles token ids, which are uint256 addresses).
+    """
+
+    def __init__(self, name: str, event_abi: Any):
+        self.name = name
+        self.columns: List[Tuple[str, str, pa.DataType]] = list(BASE_COLUMNS)
+        self.args: List[Tuple[str, str]] = []  # (argument name, column name)
+        taken = {column for column, _, _ in BASE_COLUMNS}
+        for i, item in enumerate(event_abi.inputs):
+            arg = item.name or f"arg{i}"
+            column = arg if arg not in taken else f"arg_{arg}"
+            sql_type, arrow_type = column_types(getattr(item, 'canonical_type', item.type))
+            self.columns.append((column, sql_type, arrow_type))
+            self.args.append((arg, column))
+            taken.add(column)
+            if pa.types.is_decimal(arrow_type):
+                self.columns.append((f"{column}_raw", 'VARCHAR', pa.string()))
+                taken.add(f"{column}_raw")
+        self.schema = pa.schema([(column, arrow_type) for column, _, arrow_type in self.columns])
+        self.rows: Dict[str, List[Any]] = self._empty()
+        self.created = False
+
+    def _empty(self) -> Dict[str, List[Any]]:
+        return {column: [] for column, _, _ in self.columns}
+
+    def create_sql(self) -> str:
+        columns = ',\n    '.join(f'"{column}" {sql_type}' for column, sql_type, _ in self.columns)
+        return f'CREATE TABLE IF NOT EXISTS "{self.name}" (\n    {columns}\n)'
+
+    @staticmethod
+    def _convert(value: Any, arrow_type: pa.DataType) -> Any:
+        if value is None:
+            return None
+        if pa.types.is_decimal(arrow_type):
+            value = int(value)
+            return Decimal(value) if abs(value) < MAX_DECIMAL else None
+        if pa.types.is_integer(arrow_type):
+            return int(value)
+        if pa.types.is_boolean(arrow_type):
+            return value if isinstance(value, bool) else str(value).lower() == 'true'
+        if isinstance(value, (list, tuple, dict)):
+            return json.dumps(value, default=str)
+        return sys.intern(str(value))
+
+    def append(self, event: Any):
+        data = event.event_data or {}
+        self.rows['simulation_run_id'].append(event.simulation_run_id)
+        self.rows['block_number'].append(event.block_number)
+        self.rows['block_timestamp'].append(event.block_timestamp)
+        self.rows['transaction_hash'].append(event.transaction_hash)
+        self.rows['log_index'].append(event.log_index)
+        self.rows['contract_address'].append(sys.intern(str(event.contract_address)))
+        for arg, column in self.args:
+            value = data.get(arg)
+            arrow_type = self.schema.field(column).type
+            self.rows[column].append(self._convert(value, arrow_type))
+            if pa.types.is_decimal(arrow_type):
+                overflow = value is not None and abs(int(value)) >= MAX_DECIMAL
+                self.rows[f"{column}_raw"].append(str(int(value)) if overflow else None)
+
+    def take(self) -> Optional[pa.Table]:
+        """Buffered rows as an Arrow table, emptying the buffer"""
+        if not self.rows['block_number']:
+            return None
+        rows, self.rows = self.rows, self._empty()
+        return pa.table(rows, schema=self.schema)
+
+
+class TypedEventTables:
+    """
+    One typed table per event signature, next to the generic events table.
+
+    Table layouts come from the topic0 ABI registry: addresses and strings
+    are VARCHAR, small integers native, uint256 amounts DECIMAL(38, 0), so
+    aggregations such as total transferred per token run as columnar scans
+    without parsing JSON. Tables are created on the first event of a
+    signature and written in batches alongside the events table.
+    """
+
+    def __init__(self, connection: duckdb.DuckDBPyConnection, registry: EventABIRegistry, prefix: str = "event_"):
+        self.con = connection
+        self.registry = registry
+        self.prefix = prefix
+        self._tables: Dict[Tuple[str, FrozenSet[str]], Optional[TypedEventTable]] = {}
+        self._lock = threading.Lock()
+
+    def table_name(self, event_name: str, topic: str, n_indexed: int) -> str:
+        """
+        Table of an event signature: event_<Name>, suffixed with topic0 and
+        indexed-argument count when several signatures share the name.
+        """
+        variants = sum(
+            1 for t in self.registry.topics(event_name)
+            for abi in self.registry.variants(t).values() if abi.name == event_name
+        )
+        if variants <= 1:
+            return f"{self.prefix}{event_name}"
+        return f"{self.prefix}{event_name}_{topic[2:10]}_{n_indexed}"
+
+    def _resolve(self, event_name: str, arg_names: FrozenSet[str]) -> Optional[TypedEventTable]:
+        """Typed table matching an event's name and argument names"""
+        key = (event_name, arg_names)
+        if key not in self._tables:
+            table = None
+            for topic in self.registry.topics(event_name):
+                for n_indexed, event_abi in self.registry.variants(topic).items():
+                    if event_abi.name == event_name and {i.name for i in event_abi.inputs} == set(arg_names):
+                        table = TypedEventTable(self.table_name(event_name, topic, n_indexed), event_abi)
+                        break
+                if table:
+                    break
+            if table is None:
+                logger.debug(f"No ABI for {event_name}({', '.join(sorted(arg_names))}), skipping typed table")
+            self._tables[key] = table
+        return self._tables[key]
+
+    def add(self, event: Any):
+        """Buffer an event in the table of its signature"""
+        with self._lock:
+            table = self._resolve(event.event_name, frozenset((event.event_data or {}).keys()))
+            if table is not None:
+                table.append(event)
+
+    def take(self) -> List[Tuple[TypedEventTable, pa.Table]]:
+        """All buffered rows, per table"""
+        with self._lock:
+            batches = []
+            for table in self._tables.values():
+                if table is None:
+                    continue
+                batch = table.take()
+                if batch is not None:
+                    batches.append((table, batch))
+            return batches
+
+    def write(self, batches: List[Tuple[TypedEventTable, pa.Table]]):
+        """Insert batches taken with take(); the caller commits"""
+        for table, batch in batches:
+            if not table.created:
+                self.con.execute(table.create_sql())
+                table.created = True
+            self.con.register('_typed_event_batch', batch)
+            try:
+                columns = ', '.join(f'"{column}"' for column, _, _ in table.columns)
+                self.con.execute(f'INSERT INTO "{table.name}" ({columns}) SELECT {columns} FROM _typed_event_batch')
+            finally:
+                self.con.unregister('_typed_event_batch')
+            logger.debug(f"Recorded {batch.num_rows} rows in {table.name}")
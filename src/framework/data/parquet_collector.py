@@ -0,0 +1,733 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+from pathlib import Path
+from collections import defaultdict
+import copy
+import json
+import re
+import threading
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+from .address_dictionary import ADDRESS_SCHEMA, AddressDictionary
+from .arrow_queries import Filter, arrow_reader, build_scan
+from .base_collector import BaseDataCollector
+from .event_logging import ContractEvent, ContractEventHandler, DecodedReceiptCache, EventBus, EventCapturePolicy, Subscription
+from .state_snapshots import StateSnapshotEncoder, replay
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Layout of each streamed table, matching the DuckDB tables (addresses are
+# AddressDictionary keys). simulation_run_id is not stored in the files: it
+# is the Hive partition (<table>/simulation_run_id=<id>/); addresses are
+# partitioned by the run that first saw them.
+PARQUET_SCHEMAS: Dict[str, pa.Schema] = {
+    'addresses': ADDRESS_SCHEMA,
+    'events': pa.schema([
+        ('action_name', pa.string()),
+        ('event_name', pa.string()),
+        ('block_number', pa.int64()),
+        ('block_timestamp', pa.timestamp('us')),
+        ('transaction_hash', pa.string()),
+        ('tx_from_id', pa.int32()),
+        ('tx_to_id', pa.int32()),
+        ('tx_index', pa.int32()),
+        ('log_index', pa.int32()),
+        ('contract_address_id', pa.int32()),
+        ('topic0', pa.string()),
+        ('event_data', pa.string()),
+    ]),
+    'state_snapshots': pa.schema([
+        ('block_number', pa.int64()),
+        ('block_timestamp', pa.timestamp('us')),
+        ('kind', pa.string()),
+        ('compression', pa.string()),
+        ('raw_size', pa.int64()),
+        ('payload', pa.binary()),
+    ]),
+    'agents': pa.schema([
+        ('agent_id', pa.string()),
+        ('name', pa.string()),
+        ('description', pa.string()),
+        ('total_accounts', pa.int32()),
+        ('max_executions', pa.int32()),
+    ]),
+    'agent_action_configs': pa.schema([
+        ('agent_id', pa.string()),
+        ('action_type', pa.string()),
+        ('probability', pa.float64()),
+        ('cooldown_blocks', pa.int32()),
+        ('constraints', pa.string()),
+    ]),
+    'agent_addresses': pa.schema([
+        ('agent_id', pa.string()),
+        ('address_id', pa.int32()),
+        ('is_primary', pa.bool_()),
+    ]),
+    'agent_action_history': pa.schema([
+        ('agent_id', pa.string()),
+        ('address_id', pa.int32()),
+        ('action_type', pa.string()),
+        ('block_number', pa.int64()),
+        ('timestamp', pa.timestamp('us')),
+        ('success', pa.bool_()),
+        ('selection_ms', pa.float64()),
+        ('call_generation_ms', pa.float64()),
+        ('transaction_ms', pa.float64()),
+        ('state_update_ms', pa.float64()),
+        ('gas_used', pa.int64()),
+        ('n_calls', pa.int32()),
+    ]),
+    'network_stats': pa.schema([
+        ('timestamp', pa.timestamp('us')),
+        ('block_number', pa.int64()),
+        ('total_humans', pa.int32()),
+        ('total_active_trusts', pa.int32()),
+        ('total_supply', pa.string()),
+        ('average_balance', pa.string()),
+        ('trust_density', pa.float64()),
+    ]),
+}
+
+RUN_SCHEMA = pa.schema([
+    ('run_id', pa.int32()),
+    ('start_timestamp', pa.timestamp('us')),
+    ('end_timestamp', pa.timestamp('us')),
+    ('parameters', pa.string()),
+    ('description', pa.string()),
+])
+
+# Exported datasets: source table or view, partition columns (as in
+# DataCollector.export_to_parquet, with address keys resolved)
+EXPORT_TABLES = {
+    'events': ('events_view', ['simulation_run_id', 'event_name']),
+    'state_snapshots': ('state_snapshots', ['simulation_run_id']),
+    'agents': ('agents', ['simulation_run_id']),
+    'agent_action_configs': ('agent_action_configs', ['simulation_run_id']),
+    'agent_addresses': ('agent_addresses_view', ['simulation_run_id']),
+    'agent_action_history': ('agent_action_history_view', ['simulation_run_id']),
+    'network_stats': ('network_stats', ['simulation_run_id']),
+}
+
+
+class RollingParquetWriter:
+    """
+    Append-only Parquet output of one table partition.
+
+    Rows are buffered column-wise and written as one row group every
+    `row_group_size` rows; a new file is started every `max_rows_per_file`
+    rows. Files are only ever appended to and closed, never rewritten, and
+    become readable once closed (the open file has no footer yet).
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        schema: pa.Schema,
+        row_group_size: int = 100_000,
+        max_rows_per_file: int = 5_000_000,
+        compression: str = "zstd"
+    ):
+        self.directory = directory
+        self.schema = schema
+        self.row_group_size = max(1, row_group_size)
+        self.max_rows_per_file = max(self.row_group_size, max_rows_per_file)
+        self.compression = compression
+        self.rows_written = 0
+        self._lock = threading.Lock()
+        self._columns = self._empty()
+        self._buffered = 0
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._file_rows = 0
+        self._part = len(list(directory.glob("part-*.parquet"))) if directory.exists() else 0
+
+    def _empty(self) -> Dict[str, List]:
+        return {name: [] for name in self.schema.names}
+
+    def append(self, row: Dict[str, Any]):
+        """Buffer one row; a row group is written when the buffer is full"""
+        with self._lock:
+            for name in self.schema.names:
+                self._columns[name].append(row.get(name))
+            self._buffered += 1
+            if self._buffered >= self.row_group_size:
+                self._write_row_group()
+
+    def _write_row_group(self):
+        if not self._buffered:
+            return
+        table = pa.table(self._columns, schema=self.schema)
+        self._columns, self._buffered = self._empty(), 0
+        if self._writer is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"part-{self._part:05d}.parquet"
+            self._writer = pq.ParquetWriter(str(path), self.schema, compression=self.compression)
+            self._part += 1
+            self._file_rows = 0
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self._file_rows += table.num_rows
+        self.rows_written += table.num_rows
+        if self._file_rows >= self.max_rows_per_file:
+            self._close_file()
+
+    def _close_file(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    @property
+    def open_path(self) -> Optional[Path]:
+        """File currently being written, if any"""
+        if self._writer is None:
+            return None
+        return self.directory / f"part-{self._part - 1:05d}.parquet"
+
+    def roll(self):
+        """Write buffered rows and close the current file, so all rows so far are readable"""
+        with self._lock:
+            self._write_row_group()
+            self._close_file()
+
+    def flush(self):
+        """Write buffered rows as a (possibly short) row group"""
+        with self._lock:
+            self._write_row_group()
+
+    def close(self):
+        """Write buffered rows and close the current file"""
+        self.roll()
+
+
+class ParquetDataCollector(BaseDataCollector):
+    """
+    Data collector streaming to Parquet files instead of DuckDB tables.
+
+    Events, state snapshots, agents, agent actions and network statistics
+    are appended to rolling Parquet files under
+    `<output_dir>/<table>/simulation_run_id=<id>/` with bounded row groups
+    and no random writes, which keeps very long runs I/O-bound on
+    sequential writes only. Addresses are stored as integer keys with an
+    `addresses` table, as in DataCollector. When a run ends the files are
+    registered as DuckDB views (in `db_path`, if given) under the table
+    names of DataCollector, together with its *_view views, so existing
+    queries and the explorer work on them unchanged. `db_path` should be a
+    catalog of its own: a DataCollector database already has tables of
+    those names.
+    """
+
+    def __init__(
+        self,
+        output_dir: str = "parquet_runs",
+        db_path: Optional[str] = None,
+        abis: Optional[List[Dict[str, Any]]] = None,
+        receipt_cache: Optional[DecodedReceiptCache] = None,
+        row_group_size: int = 100_000,
+        max_rows_per_file: int = 5_000_000,
+        compression: str = "zstd",
+        state_keyframe_interval: int = 50,
+        state_compression: Optional[str] = "zstd",
+        event_capture: Optional[EventCapturePolicy] = None
+    ):
+        self.root = Path(output_dir).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.abis = abis or []
+        self.receipt_cache = receipt_cache or DecodedReceiptCache(self.abis)
+        self.event_capture = event_capture
+        self.row_group_size = row_group_size
+        self.max_rows_per_file = max_rows_per_file
+        self.compression = compression
+        self.state_encoder = StateSnapshotEncoder(state_keyframe_interval, state_compression)
+        self.sql_dir = Path(__file__).parent / "duckdb"
+
+        self._current_run_id: Optional[int] = None
+        self._run_row: Dict[str, Any] = {}
+        self._writers: Dict[str, RollingParquetWriter] = {}
+        self.addresses = self._load_addresses()
+        self._last_timestamp = defaultdict(lambda: datetime.min)
+        self.sequence_number = defaultdict(int)
+        self.event_handler: Optional[ContractEventHandler] = None
+        self.event_bus = EventBus()
+        logger.info(f"Initialized ParquetDataCollector writing to {self.root}")
+
+    def _get_unique_timestamp(self, base_timestamp: datetime, table_name: str) -> datetime:
+        """Generate a unique timestamp for a table"""
+        if base_timestamp <= self._last_timestamp[table_name]:
+            self.sequence_number[table_name] += 1
+            unique_timestamp = self._last_timestamp[table_name] + timedelta(microseconds=self.sequence_number[table_name])
+        else:
+            self.sequence_number[table_name] = 0
+            unique_timestamp = base_timestamp
+        self._last_timestamp[table_name] = unique_timestamp
+        return unique_timestamp
+
+    def _validate_ethereum_address(self, address: str) -> bool:
+        """Validate Ethereum address format."""
+        if not address:
+            return False
+        return (
+            address.startswith('0x') and
+            len(address) == 42 and
+            all(c in '0123456789abcdefABCDEF' for c in address[2:])
+        )
+
+    def _writer(self, table: str) -> RollingParquetWriter:
+        """Writer of a table's partition for the current run"""
+        if not self._current_run_id:
+            raise ValueError("No active simulation run")
+        if table not in self._writers:
+            self._writers[table] = RollingParquetWriter(
+                self.root / table / f"simulation_run_id={self._current_run_id}",
+                PARQUET_SCHEMAS[table],
+                row_group_size=self.row_group_size,
+                max_rows_per_file=self.max_rows_per_file,
+                compression=self.compression
+            )
+        return self._writers[table]
+
+    def _load_addresses(self) -> AddressDictionary:
+        """Address dictionary seeded with the keys of earlier runs"""
+        con = duckdb.connect()
+        files = self._closed_files('addresses')
+        if files:
+            con.execute(f"CREATE TABLE addresses AS SELECT address_id, address FROM read_parquet({self._file_list(files)})")
+        return AddressDictionary(con, self.sql_dir)
+
+    def _write_addresses(self):
+        """Append addresses keyed since the last call"""
+        batch = self.addresses.take()
+        if batch is None:
+            return
+        writer = self._writer('addresses')
+        for row in batch.to_pylist():
+            writer.append(row)
+
+    def _write_run_row(self):
+        """(Re)write the one-row file describing the current run"""
+        directory = self.root / "simulation_runs" / f"run_id={self._current_run_id}"
+        directory.mkdir(parents=True, exist_ok=True)
+        row = {name: [self._run_row.get(name)] for name in RUN_SCHEMA.names}
+        pq.write_table(pa.table(row, schema=RUN_SCHEMA).drop(['run_id']), str(directory / "run.parquet"))
+
+    def _next_run_id(self) -> int:
+        runs = self.root / "simulation_runs"
+        ids = [int(p.name.split('=', 1)[1]) for p in runs.glob("run_id=*")] if runs.exists() else []
+        return max(ids, default=0) + 1
+
+    def start_simulation_run(self, parameters: Dict = None, description: str = None) -> int:
+        """Start a new simulation run and return its ID."""
+        if self._current_run_id:
+            self.end_simulation_run()
+        self._current_run_id = self._next_run_id()
+        self._run_row = {
+            'run_id': self._current_run_id,
+            'start_timestamp': datetime.now(),
+            'parameters': json.dumps(parameters) if parameters else None,
+            'description': description
+        }
+        self._write_run_row()
+        self.state_encoder.reset()
+        self.event_handler = ContractEventHandler(
+            self, self._current_run_id, self.abis, self.receipt_cache, self.event_bus,
+            capture=self.event_capture
+        )
+        logger.info(f"Started simulation run {self._current_run_id}")
+        return self._current_run_id
+
+    def end_simulation_run(self):
+        """Close the run's files and register them as DuckDB views"""
+        if not self._current_run_id:
+            logger.warning("No active simulation run to end")
+            return
+        try:
+            for writer in self._writers.values():
+                writer.close()
+            rows = {table: writer.rows_written for table, writer in self._writers.items()}
+            self._writers = {}
+            self._run_row['end_timestamp'] = datetime.now()
+            self._write_run_row()
+            logger.info(f"Ended simulation run {self._current_run_id}: {rows}")
+            self._current_run_id = None
+
+            if self.db_path:
+                con = duckdb.connect(self.db_path)
+                try:
+                    self.register_views(con)
+                finally:
+                    con.close()
+
+        except Exception as e:
+            logger.error(f"Failed to end simulation run: {e}")
+            raise
+
+    def register_views(self, con: duckdb.DuckDBPyConnection, temporary: bool = False) -> List[str]:
+        """
+        Create one view per streamed table over its Parquet files.
+
+        Args:
+            con: DuckDB connection to create the views in
+            temporary: Create temp views (for in-memory reads)
+
+        Returns:
+            Names of the views created
+        """
+        kind = "TEMP VIEW" if temporary else "VIEW"
+        created = []
+        for table in ['simulation_runs', *PARQUET_SCHEMAS]:
+            files = self._closed_files(table)
+            if not files:
+                continue
+            columns = "address_id, address" if table == 'addresses' else "*"
+            try:
+                con.execute(f"""
+                    CREATE OR REPLACE {kind} {table} AS
+                    SELECT {columns} FROM read_parquet({self._file_list(files)}, hive_partitioning = true, union_by_name = true)
+                """)
+                created.append(table)
+            except duckdb.CatalogException as e:
+                # e.g. db_path also holds DataCollector tables of the same name
+                logger.warning(f"Could not register Parquet view {table}: {e}")
+
+        # The DuckDB collector's address-resolving views, over the views above
+        sql = (self.sql_dir / "schema" / "address_views.up.sql").read_text()
+        for statement in filter(str.strip, sql.split(';')):
+            view = re.search(r"VIEW\s+(\w+)", statement).group(1)
+            try:
+                con.execute(statement.replace("CREATE OR REPLACE VIEW", f"CREATE OR REPLACE {kind}"))
+                created.append(view)
+            except duckdb.CatalogException as e:
+                # Nothing recorded yet for one of the tables it joins
+                logger.debug(f"Skipped Parquet view {view}: {e}")
+        logger.info(f"Registered Parquet views: {', '.join(created)}")
+        return created
+
+    @staticmethod
+    def _file_list(files: List[Path]) -> str:
+        """SQL list literal of file paths"""
+        return '[' + ', '.join("'" + path.as_posix().replace("'", "''") + "'" for path in files) + ']'
+
+    def _closed_files(self, table: str) -> List[Path]:
+        """Parquet files of a table that are complete (not still being written)"""
+        open_paths = {writer.open_path for writer in self._writers.values()}
+        return sorted(path for path in (self.root / table).glob("*/*.parquet") if path not in open_paths)
+
+    def _reader(self) -> duckdb.DuckDBPyConnection:
+        """In-memory DuckDB connection over everything written so far"""
+        # Close the run's open files first: they are unreadable until closed
+        for writer in list(self._writers.values()):
+            writer.roll()
+        con = duckdb.connect()
+        self.register_views(con, temporary=True)
+        return con
+
+    def setup_contract_listeners(self, contracts: Dict[str, Any]):
+        """Set up event listeners for contracts"""
+        if not self.event_handler:
+            logger.error("Event handler not initialized - must start simulation first")
+            return
+        for name, contract in contracts.items():
+            try:
+                self.event_handler.setup_event_listeners(contract)
+            except Exception as e:
+                logger.error(f"Failed to set up listeners for {name}: {e}")
+
+    def subscribe_events(self, callback, **options) -> Subscription:
+        """Attach a live consumer of recorded events (see EventBus.subscribe)"""
+        return self.event_bus.subscribe(callback, **options)
+
+    def record_transaction_events(self, tx, context: Optional['SimulationContext'] = None) -> None:
+        """Forward transaction events to event handler"""
+        if self.event_handler:
+            self.event_handler.handle_transaction_events(tx, context)
+
+    def record_event(self, event: ContractEvent) -> bool:
+        """Append a contract event (called by ContractEventHandler)"""
+        try:
+            event_data = {key: str(value) for key, value in (event.event_data or {}).items()}
+            row = {name: getattr(event, name, None) for name in PARQUET_SCHEMAS['events'].names}
+            row.update(
+                tx_from_id=self.addresses.key(event.tx_from),
+                tx_to_id=self.addresses.key(event.tx_to),
+                contract_address_id=self.addresses.key(event.contract_address),
+                event_data=json.dumps(event_data)
+            )
+            self._write_addresses()
+            self._writer('events').append(row)
+            self.event_bus.publish(event)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to record event {event.event_name}: {e}")
+            return False
+
+    def record_agent(self, agent: 'BaseAgent'):
+        """Append an agent with its action configurations and addresses"""
+        self.record_agents([agent])
+
+    def record_agents(self, agents: List['BaseAgent']):
+        """Append many agents"""
+        try:
+            agent_writer = self._writer('agents')
+            config_writer = self._writer('agent_action_configs')
+            address_writer = self._writer('agent_addresses')
+            for agent in agents:
+                agent_writer.append({
+                    'agent_id': agent.agent_id,
+                    'name': agent.profile.name,
+                    'description': agent.profile.description,
+                    'total_accounts': len(agent.accounts),
+                    'max_executions': agent.profile.max_executions
+                })
+                for action_type, config in agent.profile.action_configs.items():
+                    config_writer.append({
+                        'agent_id': agent.agent_id,
+                        'action_type': action_type,
+                        'probability': config.probability,
+                        'cooldown_blocks': config.cooldown_blocks,
+                        'constraints': json.dumps(config.constraints)
+                    })
+                for i, address in enumerate(agent.accounts):
+                    address_writer.append({
+                        'agent_id': agent.agent_id,
+                        'address_id': self.addresses.key(address),
+                        'is_primary': i == 0
+                    })
+            self._write_addresses()
+            logger.debug(f"Recorded {len(agents)} agents")
+
+        except Exception as e:
+            logger.error(f"Failed to record {len(agents)} agents: {e}")
+            raise
+
+    def record_agent_address(self, agent_id: str, address: str, is_primary: bool = False):
+        """Append an address associated with an agent."""
+        self._writer('agent_addresses').append({
+            'agent_id': agent_id,
+            'address_id': self.addresses.key(address),
+            'is_primary': is_primary
+        })
+        self._write_addresses()
+
+    def record_agent_actions(self, actions: List[Dict[str, Any]]):
+        """Append executed agent actions with their timings"""
+        writer = self._writer('agent_action_history')
+        for action in actions:
+            writer.append({**action, 'address_id': self.addresses.key(action.get('address'))})
+        self._write_addresses()
+
+    def record_state(
+        self,
+        block_number: int,
+        block_timestamp: datetime,
+        state_data: Dict[str, Any],
+        changes: Optional[List[Tuple]] = None
+    ):
+        """Append a state snapshot, as a keyframe or a delta (see StateSnapshotEncoder)"""
+        try:
+            kind, compression, raw_size, payload = self.state_encoder.encode(state_data, changes)
+            self._writer('state_snapshots').append({
+                'block_number': block_number,
+                'block_timestamp': block_timestamp,
+                'kind': kind,
+                'compression': compression,
+                'raw_size': raw_size,
+                'payload': payload
+            })
+        except Exception as e:
+            self.state_encoder.reset()
+            logger.error(f"Failed to record state: {e}")
+            raise
+
+    def record_network_statistics(self, block_number: int, timestamp: datetime, stats: Dict[str, Any]):
+        """Append one row of network statistics"""
+        self._writer('network_stats').append({
+            'timestamp': self._get_unique_timestamp(timestamp, 'network_stats'),
+            'block_number': block_number,
+            **stats
+        })
+
+    def flush(self):
+        """Write buffered rows of every table as row groups"""
+        for writer in list(self._writers.values()):
+            writer.flush()
+
+    def scan(
+        self,
+        source: str,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        run_id: Optional[int] = None,
+        order_by: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 122880
+    ) -> pa.RecordBatchReader:
+        """
+        Stream a table or view as Arrow record batches.
+
+        Projection and predicates are pushed into the Parquet scan, which
+        skips row groups by their statistics and partitions by run.
+        """
+        try:
+            con = self._reader()
+            sql, params = build_scan(con, source, columns, filters, run_id, order_by, limit)
+            return arrow_reader(con, sql, params, batch_size)
+        except Exception as e:
+            logger.error(f"Failed to scan {source}: {e}")
+            raise
+
+    def get_events(self, event_name: Optional[str] = None,
+                  start_time: Optional[datetime] = None,
+                  end_time: Optional[datetime] = None,
+                  limit: int = 1000) -> List[Dict]:
+        """Events of the current run"""
+        if not self._current_run_id:
+            logger.warning("No active simulation run")
+            return []
+        try:
+            con = self._reader()
+            where, params = ["simulation_run_id = ?"], [self._current_run_id]
+            for clause, value in (("event_name = ?", event_name),
+                                  ("block_timestamp >= ?", start_time),
+                                  ("block_timestamp <= ?", end_time)):
+                if value is not None:
+                    where.append(clause)
+                    params.append(value)
+            sql = f"SELECT * FROM events_view WHERE {' AND '.join(where)} ORDER BY block_timestamp DESC LIMIT ?"
+            result = con.execute(sql, params + [limit]).fetchdf()
+            result['event_data'] = result['event_data'].apply(json.loads)
+            return result.to_dict('records')
+        except Exception as e:
+            logger.error(f"Failed to query events: {e}")
+            return []
+
+    def get_event_statistics(self) -> List[Dict]:
+        """Event statistics of the current run"""
+        if not self._current_run_id:
+            logger.warning("No active simulation run")
+            return []
+        try:
+            sql = (self.sql_dir / "queries" / "get_event_stats.sql").read_text()
+            return self._reader().execute(sql, [self._current_run_id]).fetchdf().to_dict('records')
+        except Exception as e:
+            logger.error(f"Failed to get event stats: {e}")
+            return []
+
+    def get_simulation_results(self, run_id: int) -> Dict:
+        """Run description and network statistics over time"""
+        try:
+            con = self._reader()
+            run = con.execute("SELECT * FROM simulation_runs WHERE run_id = ?", [run_id]).fetchdf().to_dict('records')
+            if not run:
+                raise ValueError(f"No results found for run_id {run_id}")
+            evolution = []
+            if self.root.joinpath('network_stats').exists():
+                evolution = con.execute(
+                    "SELECT * FROM network_stats WHERE simulation_run_id = ? ORDER BY block_number", [run_id]
+                ).fetchall()
+            return {"simulation_info": run[0], "network_evolution": evolution}
+        except Exception as e:
+            logger.error(f"Failed to retrieve simulation results: {e}")
+            raise
+
+    def get_agent_history(self, agent_id: str, run_id: Optional[int] = None) -> Dict:
+        """Agent profile and addresses"""
+        run_id = run_id or self._current_run_id
+        con = self._reader()
+        profile = con.execute(
+            "SELECT * FROM agents WHERE agent_id = ? AND simulation_run_id = ?", [agent_id, run_id]
+        ).fetchdf().to_dict('records')
+        if not profile:
+            raise ValueError(f"No agent found with ID {agent_id} in run {run_id}")
+        addresses = con.execute(
+            "SELECT address, is_primary FROM agent_addresses_view WHERE agent_id = ? AND simulation_run_id = ?",
+            [agent_id, run_id]
+        ).fetchall()
+        return {"profile": profile[0], "addresses": addresses}
+
+    def get_network_graph(self, run_id: Optional[int] = None) -> Tuple[List, List]:
+        """Not recorded by this backend; rebuild graphs from state snapshots"""
+        logger.warning("ParquetDataCollector does not record network graphs")
+        return [], []
+
+    def get_state_history(self, run_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """States of a run, rebuilt from its snapshots"""
+        try:
+            run_id = run_id or self._current_run_id
+            if not run_id:
+                raise ValueError("No simulation run specified")
+            sql = (self.sql_dir / "queries" / "get_state_history.sql").read_text()
+            history = []
+            state = None
+            for block_number, block_timestamp, *snapshot in self._reader().execute(sql, [run_id]).fetchall():
+                state = replay([snapshot], state)
+                history.append({
+                    'block_number': block_number,
+                    'block_timestamp': block_timestamp,
+                    'state_data': copy.deepcopy(state)
+                })
+            return history
+        except Exception as e:
+            logger.error(f"Failed to get state history: {e}")
+            return []
+
+    def export_to_parquet(self, output_dir: str = "analysis_results", run_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Export the streamed tables as partitioned Parquet datasets.
+
+        The data is Parquet already; this rewrites it to output_dir with the
+        same layout as DataCollector.export_to_parquet, optionally for one run.
+        """
+        try:
+            output_path = Path(output_dir)
+            output_path.mkdir(parents=True, exist_ok=True)
+            con = self._reader()
+            where = f" WHERE simulation_run_id = {int(run_id)}" if run_id is not None else ""
+            metadata = {
+                "export_timestamp": datetime.now().isoformat(),
+                "source": str(self.root),
+                "format": "parquet",
+                "compression": self.compression,
+                "run_id": run_id,
+                "table_statistics": {}
+            }
+            for table, (source, partitions) in EXPORT_TABLES.items():
+                if not self._closed_files(table):
+                    continue
+                table_path = output_path / table
+                con.execute(f"""
+                    COPY (SELECT * FROM {source}{where}) TO '{table_path.as_posix()}' (
+                        FORMAT PARQUET,
+                        PARTITION_BY ({', '.join(partitions)}),
+                        COMPRESSION {self.compression},
+                        ROW_GROUP_SIZE {int(self.row_group_size)},
+                        OVERWRITE_OR_IGNORE
+                    )
+                """)
+                metadata["table_statistics"][table] = {
+                    "row_count": con.execute(f"SELECT COUNT(*) FROM {source}{where}").fetchone()[0],
+                    "partition_by": partitions,
+                    "export_path": str(table_path)
+                }
+            with open(output_path / "export_metadata.json", "w") as f:
+                json.dump(metadata, f, indent=2)
+            logger.info(f"Exported {len(metadata['table_statistics'])} tables to Parquet in {output_dir}")
+            return metadata
+        except Exception as e:
+            logger.error(f"Failed to export data: {e}")
+            raise
+
+    def close(self):
+        """Close open files, ending the current run if any"""
+        try:
+            if self._current_run_id:
+                self.end_simulation_run()
+            self.event_bus.close()
+            logger.info("Closed Parquet collector")
+        except Exception as e:
+            logger.error(f"Error closing Parquet collector: {e}")
+            raise
+
+    @property
+    def current_run_id(self) -> Optional[int]:
+        """Get current simulation run ID"""
+        return self._current_run_id
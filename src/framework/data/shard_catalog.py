@@ -0,0 +1,134 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+import time
+import duckdb
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ShardCatalog:
+    """
+    Catalog of per-run DuckDB shards.
+
+    Each run writes to its own database file (`<shard_dir>/<run_id>.duckdb`),
+    so several simulations can write at once. The catalog database only
+    lists the shards; it is opened for the moment it takes to allocate a run
+    id, and waits while another process holds it.
+
+    connect() attaches every shard read-only and exposes each table and
+    view through a union view across shards. Shards still being written by
+    a running simulation are locked and left out until the run closes them.
+    """
+
+    def __init__(
+        self,
+        catalog_path: str,
+        shard_dir: str = "runs",
+        sql_dir: Optional[Path] = None,
+        lock_timeout: float = 30.0
+    ):
+        self.catalog_path = Path(catalog_path)
+        self.shard_dir = Path(shard_dir)
+        self.sql_dir = sql_dir or Path(__file__).parent / "duckdb"
+        self.lock_timeout = lock_timeout
+
+    def _connect_catalog(self, read_only: bool = False) -> duckdb.DuckDBPyConnection:
+        """Open the catalog, retrying while another process holds its lock"""
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            try:
+                return duckdb.connect(str(self.catalog_path), read_only=read_only)
+            except duckdb.IOException as e:
+                if time.monotonic() > deadline:
+                    raise
+                logger.debug(f"Catalog {self.catalog_path} busy, retrying: {e}")
+                time.sleep(0.1)
+
+    def allocate_run(self) -> Tuple[int, Path]:
+        """
+        Reserve the next run id and its shard path.
+
+        Returns:
+            (run_id, shard_path)
+        """
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        con = self._connect_catalog()
+        try:
+            con.execute((self.sql_dir / "schema" / "run_shards.up.sql").read_text())
+            run_id = con.execute("SELECT COALESCE(MAX(run_id), 0) + 1 FROM run_shards").fetchone()[0]
+            shard_path = (self.shard_dir / f"{run_id}.duckdb").resolve()
+            con.execute(
+                "INSERT INTO run_shards (run_id, path, created_at) VALUES (?, ?, ?)",
+                [run_id, str(shard_path), datetime.now()]
+            )
+            con.commit()
+        finally:
+            con.close()
+        logger.info(f"Allocated run {run_id} in shard {shard_path}")
+        return run_id, shard_path
+
+    def shards(self) -> List[Tuple[int, str]]:
+        """(run_id, path) of every registered shard"""
+        if not self.catalog_path.exists():
+            return []
+        con = self._connect_catalog(read_only=True)
+        try:
+            return con.execute("SELECT run_id, path FROM run_shards ORDER BY run_id").fetchall()
+        except duckdb.CatalogException:
+            return []
+        finally:
+            con.close()
+
+    def connect(
+        self,
+        run_ids: Optional[Iterable[int]] = None,
+        exclude: Iterable[int] = ()
+    ) -> duckdb.DuckDBPyConnection:
+        """
+        In-memory connection with all readable shards attached read-only
+        (as run_<id>) and one union view per table or view name.
+
+        The union views live in the in-memory database rather than the temp
+        schema, so that views inside a shard keep resolving to the shard's
+        own tables.
+
+        Args:
+            run_ids: Only attach the shards of these runs (all when None)
+            exclude: Runs whose shards to leave out, e.g. one this process
+                has open for writing
+        """
+        wanted = set(run_ids) if run_ids is not None else None
+        excluded = set(exclude)
+        con = duckdb.connect()
+        attached = []
+        for run_id, path in self.shards():
+            if (wanted is not None and run_id not in wanted) or run_id in excluded:
+                continue
+            try:
+                con.execute(f"ATTACH '{path}' AS run_{run_id} (READ_ONLY)")
+                attached.append(run_id)
+            except duckdb.Error as e:
+                logger.warning(f"Skipping shard of run {run_id} ({path}): {e}")
+
+        columns: Dict[str, Dict[str, List[str]]] = {}
+        for database, name, column in con.execute("""
+            SELECT database_name, table_name, column_name
+            FROM duckdb_columns()
+            WHERE database_name LIKE 'run_%' AND schema_name = 'main'
+            ORDER BY database_name, table_name, column_index
+        """).fetchall():
+            columns.setdefault(name, {}).setdefault(database, []).append(column)
+
+        for name, databases in columns.items():
+            selects = []
+            for database, cols in databases.items():
+                run_id = int(database[len('run_'):])
+                # Tables keyed by run inside a shard only (addresses, configs) get the run added
+                prefix = "" if {'simulation_run_id', 'run_id'} & set(cols) else f"{run_id} AS simulation_run_id, "
+                selects.append(f'SELECT {prefix}* FROM {database}.main."{name}"')
+            con.execute(f'CREATE OR REPLACE VIEW "{name}" AS ' + "\nUNION ALL BY NAME\n".join(selects))
+
+        logger.info(f"Attached {len(attached)} run shards with {len(columns)} union views")
+        return con
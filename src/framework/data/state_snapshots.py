@@ -0,0 +1,221 @@
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+from datetime import date, datetime
+import json
+import pyarrow as pa
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+KEYFRAME = 'keyframe'
+DELTA = 'delta'
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Normalize state into plain JSON types.
+
+    Dict keys become strings, sets become sorted lists and dates ISO
+    strings, so that two snapshots of the same state compare equal.
+    """
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted((to_jsonable(v) for v in value), key=str)
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return '0x' + value.hex()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def diff_state(old: Any, new: Any) -> Dict[str, List]:
+    """
+    Changes turning `old` into `new` (both normalized).
+
+    Returns:
+        {'set': [[path, value]], 'del': [path], 'append': [[path, items]]}
+        where a path is the list of keys leading to the changed value
+    """
+    delta = {'set': [], 'del': [], 'append': []}
+
+    def walk(a: Any, b: Any, path: List[str]):
+        if isinstance(a, dict) and isinstance(b, dict):
+            for key in a.keys() - b.keys():
+                delta['del'].append(path + [key])
+            for key, value in b.items():
+                if key not in a:
+                    delta['set'].append([path + [key], value])
+                elif a[key] != value:
+                    walk(a[key], value, path + [key])
+        elif isinstance(a, list) and isinstance(b, list) and len(b) > len(a) and b[:len(a)] == a:
+            delta['append'].append([path, b[len(a):]])
+        else:
+            delta['set'].append([path, b])
+
+    walk(old, new, [])
+    return delta
+
+
+def delta_from_paths(state: Dict[str, Any], paths: Iterable[Tuple[Hashable, ...]]) -> Dict[str, List]:
+    """
+    Delta setting the values at `paths` to what they are in `state`.
+
+    Only the given paths are looked up, so the cost follows the number of
+    changes rather than the size of the state. A path whose value no
+    longer exists becomes a delete of its first missing key.
+
+    Args:
+        state: Live (not normalized) state, walked through dicts only
+        paths: Key tuples as reported to StateChanges
+
+    Returns:
+        Delta in the format of diff_state
+    """
+    delta = {'set': [], 'del': [], 'append': []}
+    for path in sorted(set(paths), key=len):
+        node = state
+        for depth, key in enumerate(path):
+            if not isinstance(node, dict) or key not in node:
+                delta['del'].append([str(k) for k in path[:depth + 1]])
+                break
+            node = node[key]
+        else:
+            delta['set'].append([[str(k) for k in path], to_jsonable(node)])
+    return delta
+
+
+def apply_delta(state: Any, delta: Dict[str, List]) -> Any:
+    """Apply a delta from diff_state to a normalized state, in place"""
+    def parent(path: List[str]) -> Any:
+        node = state
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        return node
+
+    for path in delta.get('del', []):
+        node = state
+        for key in path[:-1]:
+            node = node.get(key) if isinstance(node, dict) else None
+        if isinstance(node, dict):
+            node.pop(path[-1], None)
+    for path, value in delta.get('set', []):
+        if not path:
+            state = value
+            continue
+        parent(path)[path[-1]] = value
+    for path, items in delta.get('append', []):
+        target = state
+        for key in path:
+            target = target[key]
+        target.extend(items)
+    return state
+
+
+class StateChanges:
+    """
+    Paths of the simulation state written since the last snapshot.
+
+    Whatever mutates the state (reducer appliers, balance refreshes) calls
+    touch() with the keys leading to the value it set or deleted, and the
+    snapshot taken next encodes only those values.
+    """
+
+    def __init__(self):
+        self._paths: set = set()
+
+    def touch(self, *path: Hashable):
+        """Mark the value at `path` as changed"""
+        self._paths.add(path)
+
+    def take(self) -> List[Tuple[Hashable, ...]]:
+        """Changed paths, clearing them"""
+        paths, self._paths = list(self._paths), set()
+        return paths
+
+
+class StateSnapshotEncoder:
+    """
+    Encodes successive simulation states as keyframes and deltas.
+
+    Every `keyframe_interval`-th snapshot stores the full state; the ones in
+    between store only what changed since the previous snapshot (trust edges,
+    balances, ...), so storage follows activity rather than network size.
+    Payloads are JSON, optionally zstd-compressed.
+    """
+
+    def __init__(self, keyframe_interval: int = 50, compression: Optional[str] = 'zstd'):
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.compression = compression if compression and pa.Codec.is_available(compression) else None
+        if compression and not self.compression:
+            logger.warning(f"Compression {compression} unavailable, storing state snapshots uncompressed")
+        self.reset()
+
+    def reset(self):
+        """Start over with a keyframe, e.g. for a new run"""
+        self._previous: Any = None
+        self._count = 0
+
+    def encode(
+        self,
+        state: Dict[str, Any],
+        changes: Optional[Iterable[Tuple[Hashable, ...]]] = None
+    ) -> Tuple[str, Optional[str], int, bytes]:
+        """
+        Encode the next snapshot.
+
+        Args:
+            state: Live simulation state
+            changes: Paths written since the previous snapshot (see
+                StateChanges). Deltas are then built from these paths
+                alone; without them the whole state is diffed against the
+                previous snapshot.
+
+        Returns:
+            (kind, compression, raw_size, payload)
+        """
+        keyframe = self._count % self.keyframe_interval == 0 or (changes is None and self._previous is None)
+        if keyframe:
+            kind, body = KEYFRAME, to_jsonable(state)
+            self._previous = body if changes is None else None
+        elif changes is not None:
+            # A later diff would need the full state this skips building
+            kind, body = DELTA, delta_from_paths(state, changes)
+            self._previous = None
+        else:
+            current = to_jsonable(state)
+            kind, body = DELTA, diff_state(self._previous, current)
+            self._previous = current
+        self._count += 1
+
+        raw = json.dumps(body, separators=(',', ':')).encode()
+        if self.compression:
+            payload = pa.compress(raw, codec=self.compression, asbytes=True)
+        else:
+            payload = raw
+        return kind, self.compression, len(raw), payload
+
+    @staticmethod
+    def decode(payload: bytes, compression: Optional[str], raw_size: int) -> Any:
+        """Payload back to its JSON body"""
+        if compression:
+            payload = pa.decompress(payload, decompressed_size=raw_size, codec=compression, asbytes=True)
+        return json.loads(payload)
+
+
+def replay(rows: List[Tuple[str, Optional[str], int, bytes]], state: Any = None) -> Any:
+    """
+    Rebuild a state from snapshot rows in block order.
+
+    Args:
+        rows: (kind, compression, raw_size, payload), starting at a keyframe
+            unless `state` is given
+        state: Normalized state the first delta applies to
+    """
+    for kind, compression, raw_size, payload in rows:
+        body = StateSnapshotEncoder.decode(payload, compression, raw_size)
+        state = body if kind == KEYFRAME else apply_delta(state, body)
+    return state
@@ -5,15 +5,20 @@ from datetime import datetime
 import yaml
 from abc import ABC, abstractmethod
 from ethpm_types.abi import EventABI
-import json
 
 from ape import chain
-from src.framework.data import DataCollector
+from src.framework.data import BaseDataCollector, DataCollector, ParquetDataCollector
+from src.framework.data.event_logging import DecodedReceiptCache, EventABIRegistry, EventCapturePolicy
 from src.framework.agents.agent_manager import AgentManager
+from src.framework.agents.scheduler import AgentScheduler
 from src.framework.core import NetworkBuilder, NetworkEvolver, SimulationContext
 from src.framework.logging import get_logger
 from src.framework.state.decoder import StateDecoder
 from src.framework.state.event_indexer import EventIndexer
+from src.framework.state.reducers import ReducerPipeline
+from src.framework.state.network_stats import NetworkStatsTracker
+from src.framework.data.event_archive import EventArchive
+from src.framework.data.state_snapshots import StateChanges
 from src.protocols.interfaces.master import MasterClient
 
 
@@ -129,6 +134,10 @@ BASE_CONTRACT_CONFIGS: Dict[str, Dict[str, Any]] = {}
 class BaseSimulation(ABC):
     """Base simulation class that can be extended for specific simulations"""
 
+    # Whether every state write is reported to self.state_changes, so that
+    # snapshots encode only those; otherwise each snapshot diffs the whole state
+    REPORTS_STATE_CHANGES = False
+
     def __init__(
         self,
         config: BaseSimulationConfig,
@@ -143,8 +152,26 @@ class BaseSimulation(ABC):
         self.simulation_start_time = datetime.now()
 
         # Load all ABIs first so they're available for everything else
+        self.abi_registry = self._load_abi_registry()
         self.abis = self._load_contract_abis()
 
+        # Decoded logs shared by the collector and state updates
+        self.receipt_cache = DecodedReceiptCache(
+            self.abis,
+            maxsize=self.config.network_config.get('receipt_cache_size', 256),
+            registry=self.abi_registry
+        )
+
+        # Network statistics kept up to date by the reducers, if a simulation tracks them
+        self.network_stats: Optional[NetworkStatsTracker] = None
+
+        # State paths the reducers wrote since the last snapshot, encoded as its delta
+        self.state_changes = StateChanges()
+
+        # Event-driven state updates; simulations subscribe their reducers
+        self.reducers = ReducerPipeline(self.abi_registry)
+        self.register_reducers(self.reducers)
+
         # Initialize infrastructure
         self.collector = self._initialize_collector()
         self.agent_manager = self._initialize_agent_manager()
@@ -187,7 +214,15 @@ class BaseSimulation(ABC):
         if not event_configs:
             return indexed_events
 
-        event_indexer = EventIndexer(event_configs, self.abis)
+        index_settings = config.network_config.get('event_index', {})
+        archive_dir = index_settings.get('archive_dir')
+        event_indexer = EventIndexer(
+            event_configs,
+            self.abis,
+            block_window=index_settings.get('block_window', 10_000),
+            max_workers=index_settings.get('max_workers', 8),
+            archive=EventArchive(archive_dir) if archive_dir else None
+        )
         
         for contract_id, event_config in event_configs.items():
             try:
@@ -295,7 +330,10 @@ class BaseSimulation(ABC):
                     continue
 
                 # Initialize contract state decoder and decode state
-                decoder = StateDecoder(contract_address)
+                decoder = StateDecoder(
+                    contract_address,
+                    max_workers=state_config.get('max_workers', 16)
+                )
                 decoded_state = decoder.decode_state(state_config['variables'])
                 initialized_states[contract_id] = {
                     'address': contract_address,
@@ -325,36 +363,27 @@ class BaseSimulation(ABC):
         # Then do any simulation-specific updates
         super().update_state_from_transaction(tx, context)
 
-    def _load_contract_abis(self) -> List[EventABI]:
-        """Load all contract ABIs from the abi folder and subfolders and convert them to EventABI objects."""
-        all_abis = []
+    def register_reducers(self, pipeline: ReducerPipeline) -> None:
+        """Subscribe state reducers to events. Override in specific simulations"""
+        pass
+
+    def seed_network_stats(self) -> None:
+        """Seed self.network_stats from the built network. Override in specific simulations"""
+        pass
+
+    def _load_abi_registry(self) -> EventABIRegistry:
+        """Load the topic0-indexed event registry, reusing the on-disk cache when the ABIs are unchanged"""
+        abi_base_path = self.project_root / "src" / "protocols" / "abis"
+        cache_path = self.config.network_config.get('abi_registry_cache', '.cache/event_abi_registry.json')
         try:
-            # Base ABI folder path
-            abi_base_path = self.project_root / "src" / "protocols" / "abis"
-            
-            # Recursively find all JSON files under the ABI folder
-            for abi_path in abi_base_path.rglob("*.json"):
-                try:
-                    with open(abi_path) as f:
-                        contract_abi = json.load(f)
-                        # Filter for event ABIs and convert to EventABI objects
-                        event_abis = [
-                            EventABI(
-                                name=item['name'],
-                                inputs=item.get('inputs', []),
-                                anonymous=item.get('anonymous', False)
-                            )
-                            for item in contract_abi
-                            if item.get('type') == 'event'
-                        ]
-                        all_abis.extend(event_abis)
-                        logger.info(f"Loaded {len(event_abis)} events from ABI file: {abi_path}")
-                except Exception as e:
-                    logger.error(f"Failed to load ABI from {abi_path}: {e}")
+            return EventABIRegistry.load(abi_base_path, self.project_root / cache_path)
         except Exception as e:
-            logger.error(f"Error while traversing ABI folder: {e}")
+            logger.error(f"Failed to load ABI registry: {e}")
+            return EventABIRegistry()
 
-        return all_abis
+    def _load_contract_abis(self) -> List[EventABI]:
+        """Unique event ABIs across all contract ABI files, one per topic0"""
+        return self.abi_registry.abis
 
 
     def get_initial_state(self) -> Dict[str, Any]:
@@ -362,13 +391,41 @@ class BaseSimulation(ABC):
         # Override in specific simulations to use decoded state
         return self.initial_state
 
-    def _initialize_collector(self) -> Optional[DataCollector]:
+    def _initialize_collector(self) -> Optional[BaseDataCollector]:
         """Initialize data collector if not in fast mode"""
         if self.fast_mode:
             return None
+        event_capture = EventCapturePolicy.from_config(
+            self.config.network_config.get('event_capture'), self.abi_registry
+        )
+        if self.config.network_config.get('collector_backend', 'duckdb') == 'parquet':
+            parquet_dir = self.config.network_config.get('parquet_dir', 'parquet_runs')
+            return ParquetDataCollector(
+                output_dir=parquet_dir,
+                # Not db_path: a DuckDB-backend database there already has tables of the view names
+                db_path=self.config.network_config.get('parquet_db_path') or str(Path(parquet_dir) / 'catalog.duckdb'),
+                abis=self.abis,
+                receipt_cache=self.receipt_cache,
+                row_group_size=self.config.network_config.get('parquet_row_group_size', 100_000),
+                state_keyframe_interval=self.config.network_config.get('state_keyframe_interval', 50),
+                state_compression=self.config.network_config.get('state_compression', 'zstd'),
+                event_capture=event_capture
+            )
         return DataCollector(
             db_path=self.config.network_config.get('db_path', 'simulation.duckdb'),
-            abis=self.abis 
+            abis=self.abis,
+            receipt_cache=self.receipt_cache,
+            event_batch_size=self.config.network_config.get('event_batch_size', 1000),
+            abi_registry=self.abi_registry,
+            typed_events=self.config.network_config.get('typed_event_tables', True),
+            state_keyframe_interval=self.config.network_config.get('state_keyframe_interval', 50),
+            state_compression=self.config.network_config.get('state_compression', 'zstd'),
+            async_writes=self.config.network_config.get('async_writes', False),
+            write_queue_size=self.config.network_config.get('write_queue_size', 1000),
+            bulk_load=self.config.network_config.get('bulk_load', False),
+            analyze_after_run=self.config.network_config.get('analyze_after_run', True),
+            shard_dir=self.config.network_config.get('run_shards_dir'),
+            event_capture=event_capture
         )
 
     def _initialize_agent_manager(self):
@@ -396,7 +453,9 @@ class BaseSimulation(ABC):
             clients=self.clients,
             agent_manager=self.agent_manager,
             collector=self.collector,
-            gas_limits=self.config.network_config.get('gas_limits')
+            gas_limits=self.config.network_config.get('gas_limits'),
+            scheduler=AgentScheduler() if self.config.network_config.get('cooldown_scheduler', True) else None,
+            fast_forward=self.config.network_config.get('fast_forward', False)
         )
         evolver.initialize_contract_states(self.contract_states)
         evolver.set_simulation(self)
@@ -432,6 +491,7 @@ class BaseSimulation(ABC):
 
             if not self._build_initial_network():
                 return False
+            self.seed_network_stats()
             if not self._run_iterations():
                 return False
 
@@ -443,6 +503,9 @@ class BaseSimulation(ABC):
 
         except Exception as e:
             logger.error(f"Simulation failed: {e}", exc_info=True)
+            if self.collector:
+                # Keep the events recorded before the failure
+                self.collector.flush()
             return False
 
     def _build_initial_network(self) -> bool:
@@ -471,6 +534,7 @@ class BaseSimulation(ABC):
 
     def _record_current_state(self):
         """Record current state in the data collector"""
+        changes = self.state_changes.take()
         if not self.collector:
             return
             
@@ -488,21 +552,44 @@ class BaseSimulation(ABC):
             self.collector.record_state(
                 block_number=chain.blocks.head.number,
                 block_timestamp=datetime.fromtimestamp(chain.blocks.head.timestamp),
-                state_data=state_data
+                state_data=state_data,
+                # network_state is small and rewritten every iteration
+                changes=changes + [('network_state',)] if self.REPORTS_STATE_CHANGES else None
             )
             
         except Exception as e:
             logger.error(f"Failed to record state: {e}", exc_info=True)
 
+    def _record_network_stats(self):
+        """Record one row of network statistics from the incrementally kept counters"""
+        if not self.collector or self.network_stats is None:
+            return
+
+        try:
+            timestamp = chain.blocks.head.timestamp
+            self.collector.record_network_statistics(
+                block_number=chain.blocks.head.number,
+                timestamp=datetime.fromtimestamp(timestamp),
+                stats=self.network_stats.snapshot(timestamp)
+            )
+
+        except Exception as e:
+            logger.error(f"Failed to record network statistics: {e}", exc_info=True)
+
     def _run_iterations(self) -> bool:
         """Run simulation iterations"""
         logger.info(f"Running {self.config.iterations} iterations")
         
+        max_jump = self.config.network_config.get('fast_forward_max_blocks', 1000)
+
         for i in range(self.config.iterations):
-            if not self.evolver.advance_time(
-                self.config.blocks_per_iteration,
-                self.config.block_time
-            ):
+            blocks = self.config.blocks_per_iteration
+            if self.evolver.fast_forward:
+                blocks = self.evolver.blocks_to_next_activity(blocks, max_jump)
+                if blocks > self.config.blocks_per_iteration:
+                    logger.debug(f"Fast-forwarding {blocks} idle blocks")
+
+            if not self.evolver.advance_time(blocks, self.config.block_time):
                 logger.error(f"Failed to advance time at iteration {i+1}")
                 return False
                 
@@ -510,6 +597,9 @@ class BaseSimulation(ABC):
             self.iteration_stats.append(stats)
 
             self._record_current_state()
+            self._record_network_stats()
+            if self.collector:
+                self.collector.flush()
 
             self._log_iteration_summary(i + 1, stats)
             
@@ -1,17 +1,128 @@
 from typing import Any, Dict, List, Optional, Union, NamedTuple, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from eth_typing import HexStr
 from eth_utils import keccak, to_checksum_address
 from ape import chain, Contract
 from src.framework.logging import get_logger
+from src.framework.state.storage_reader import StorageReader
 import logging
 
 logger = get_logger(__name__)
 
-class TrustMarker(NamedTuple):
-    """Structure for trust marker data"""
-    previous: str  # address
-    expiry: int    # uint96
+SENTINEL = "0x0000000000000000000000000000000000000001"
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+@dataclass
+class StructField:
+    """A field packed into a single storage word"""
+    name: str
+    type: str = 'address'
+    offset: int = 0  # bit offset from the least significant end of the word
+
+    @property
+    def bits(self) -> int:
+        if self.type == 'address':
+            return 160
+        if self.type == 'bool':
+            return 8
+        if self.type.startswith('uint'):
+            return int(self.type[4:] or 256)
+        if self.type.startswith('int'):
+            return int(self.type[3:] or 256)
+        if self.type.startswith('bytes') and self.type[5:].isdigit():
+            return int(self.type[5:]) * 8
+        raise ValueError(f"Unsupported struct field type: {self.type}")
+
+    def decode(self, word: int) -> Any:
+        """Extract this field from a storage word"""
+        bits = self.bits
+        raw = (word >> self.offset) & ((1 << bits) - 1)
+        if self.type == 'address':
+            return to_checksum_address('0x' + raw.to_bytes(20, byteorder='big').hex())
+        if self.type == 'bool':
+            return bool(raw)
+        if self.type.startswith('int') and raw >> (bits - 1):
+            return raw - (1 << bits)
+        if self.type.startswith('bytes'):
+            return HexStr(raw.to_bytes(bits // 8, byteorder='big').hex())
+        return raw
+
+
+@dataclass
+class IterationSpec:
+    """
+    Declarative description of an iterable (linked-list) mapping.
+
+    Each entry is a storage word laid out as `struct`, and `next_field` points
+    to the key of the next entry. Traversal starts at `sentinel` and stops when
+    the sentinel (or the zero address) is reached again.
+
+    With `level: 2` the list lives in `mapping(address => mapping(address => T))`
+    and one list is walked per outer key, taken from `keys`: the name of another
+    state variable, a literal list of addresses, or an inline level-1 spec with
+    its own `slot`.
+    """
+    level: int = 1
+    sentinel: str = SENTINEL
+    keys: Any = None
+    include_sentinel_key: bool = False
+    struct: List[StructField] = field(default_factory=lambda: [StructField('next')])
+    next_field: str = 'next'
+    value_field: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> 'IterationSpec':
+        """Create from `iteration` section of a state variable config"""
+        struct = [
+            StructField(**item) if isinstance(item, dict) else StructField(name=item)
+            for item in config.get('struct', [])
+        ] or [StructField('next')]
+        spec = cls(
+            level=config.get('level', 1),
+            sentinel=to_checksum_address(config.get('sentinel', SENTINEL)),
+            keys=config.get('keys'),
+            include_sentinel_key=config.get('include_sentinel_key', False),
+            struct=struct,
+            next_field=config.get('next_field', struct[0].name),
+            value_field=config.get('value_field')
+        )
+        if spec.level not in (1, 2):
+            raise ValueError(f"Unsupported iteration level: {spec.level}")
+        if spec.level == 2 and spec.keys is None:
+            raise ValueError("Level 2 iteration requires a 'keys' source")
+        if spec.next_field not in {f.name for f in spec.struct}:
+            raise ValueError(f"Next field '{spec.next_field}' not in struct layout")
+        return spec
+
+    def format_entries(self, entries: List[Tuple[str, Dict[str, Any]]]) -> Union[List[str], Dict[str, Any]]:
+        """Shape decoded (key, fields) pairs into the stored value"""
+        if self.value_field:
+            return {
+                key: fields[self.value_field]
+                for key, fields in entries
+                if fields[self.value_field]
+            }
+        if len(self.struct) == 1:
+            return [key for key, _ in entries]
+        return {key: fields for key, fields in entries}
+
+
+# Iteration layouts for configs written before `iteration` sections existed
+LEGACY_ITERATION_SPECS: Dict[str, Dict[str, Any]] = {
+    'avatars': {},
+    'trustMarkers': {
+        'level': 2,
+        'keys': {'slot': 26},
+        'include_sentinel_key': True,
+        'struct': [
+            {'name': 'previous', 'type': 'address', 'offset': 0},
+            {'name': 'expiry', 'type': 'uint96', 'offset': 160},
+        ],
+        'value_field': 'expiry',
+    },
+}
+
 
 @dataclass
 class StateVariable:
@@ -20,15 +131,20 @@ class StateVariable:
     type: str
     slot: int
     iterable: bool = False  # If this is a mapping that should be iterated
+    iteration: Optional[IterationSpec] = None
 
 class StateDecoder:
     """Decodes Ethereum contract state variables"""
     
-    def __init__(self, contract_address: str):
+    def __init__(self, contract_address: str, max_workers: int = 16):
         self.contract_address = contract_address
+        self.max_workers = max_workers
         # Constants
-        self.SENTINEL = "0x0000000000000000000000000000000000000001"
-        self.ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+        self.SENTINEL = SENTINEL
+        self.ZERO_ADDRESS = ZERO_ADDRESS
+        self._reader: Optional[StorageReader] = None
+        self._variables: Dict[str, Dict[str, Any]] = {}
+        self._decoded: Dict[str, Any] = {}
 
     def decode_state(self, variables: Dict[str, Dict[str, Any]], block_identifier: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -41,32 +157,51 @@ class StateDecoder:
         Returns:
             Dict of decoded values
         """
+        # Pin every read of this pass to one block
+        self._reader = StorageReader(self.contract_address, block_identifier, self.max_workers)
+        self._variables = variables
+        self._decoded = {}
+
         result = {}
-        for name, settings in variables.items():
+        for name in variables:
             try:
-                var = StateVariable(
-                    name=name,
-                    type=settings['type'],
-                    slot=settings['slot'],
-                    iterable=settings.get('iterable', False)
-                )
-                logger.info(f"Decoding {var}")
-                value = self._decode_variable(var, block_identifier)
-                result[name] = value
+                result[name] = self._resolve_variable(name)
             except Exception as e:
                 logger.error(f"Error decoding {name}: {e}")
                 result[name] = None
+
+        logger.info(f"Decoded {len(result)} variables with {self._reader.rpc_count} storage reads")
         return result
 
+    def _resolve_variable(self, name: str) -> Any:
+        """Decode a configured variable once, reusing earlier results"""
+        if name not in self._decoded:
+            var = self._build_variable(name, self._variables[name])
+            logger.info(f"Decoding {var}")
+            self._decoded[name] = self._decode_variable(var, self._reader.block_identifier)
+        return self._decoded[name]
+
+    def _build_variable(self, name: str, settings: Dict[str, Any]) -> StateVariable:
+        """Create a StateVariable from its config entry"""
+        iterable = settings.get('iterable', False)
+        iteration = None
+        if iterable:
+            iteration_config = settings.get('iteration', LEGACY_ITERATION_SPECS.get(name))
+            if iteration_config is None:
+                raise ValueError(f"Mapping {name} has no 'iteration' section")
+            iteration = IterationSpec.from_dict(iteration_config)
+        return StateVariable(
+            name=name,
+            type=settings['type'],
+            slot=settings['slot'],
+            iterable=iterable,
+            iteration=iteration
+        )
+
     def _decode_variable(self, var: StateVariable, block_identifier: Optional[int] = None) -> Any:
         """Decode a single variable based on its type"""
         if var.iterable:
-            if var.name == 'avatars':
-                return self._decode_avatar_mapping(var, block_identifier)
-            elif var.name == 'trustMarkers':
-                return self._decode_trust_markers_mapping(var, block_identifier)
-            else:
-                raise ValueError(f"Mapping {var.name} iteration not supported")
+            return self._decode_iterable_mapping(var, block_identifier)
             
         if var.type == 'uint256':
             return self._decode_uint256(var.slot, block_identifier)
@@ -84,28 +219,16 @@ class StateDecoder:
         else:
             raise ValueError(f"Unsupported type: {var.type}")
 
-    def _decode_avatar_mapping(self, var: StateVariable, block_identifier: Optional[int] = None) -> List[str]:
-        """Decode the avatars linked list mapping"""
-        results = []
-        current = self.SENTINEL
-
-        while True:
-            next_addr = self._read_mapping(var.slot, current, block_identifier)
-            if next_addr == self.SENTINEL:
-                break
-            results.append(next_addr)
-            current = next_addr
-            
-        return results
-
-
-    def _decode_trust_markers_mapping(
+    def _decode_iterable_mapping(
         self,
-        var: StateVariable, 
+        var: StateVariable,
         block_identifier: Optional[int] = None
-    ) -> Dict[str, Dict[str, int]]:
+    ) -> Union[List[str], Dict[str, Any]]:
         """
-        Decode the trust markers double mapping into a dictionary-of-dictionaries:
+        Decode a linked-list mapping described by its IterationSpec.
+
+        Level 1 returns the list itself. Level 2 returns a dict keyed by outer
+        key, e.g. for trustMarkers:
             {
             <truster_address>: {
                 <trustee_address>: <expiry_int>,
@@ -113,105 +236,120 @@ class StateDecoder:
             },
             ...
             }
-
-        We ignore the 'previous' field from the on-chain struct and only store `expiry`.
+        Outer keys with an empty list are left out.
         """
-        results: Dict[str, Dict[str, int]] = {}
+        spec = var.iteration
+        if spec.level == 1:
+            lists = self._traverse_lists(var.slot, spec, [None], block_identifier)
+            return spec.format_entries(lists[None])
 
-        # Decode the avatars list first so we know which "trusters" to iterate
-        avatars = self._decode_avatar_mapping(
-            StateVariable(name='avatars', type='mapping(address => address)', slot=26, iterable=True),
-            block_identifier
-        )
-        # We also append the SENTINEL so the iteration code below matches your existing pattern:
-        avatars.append(self.SENTINEL)
+        outer_keys = list(self._resolve_keys(spec.keys, block_identifier))
+        if spec.include_sentinel_key:
+            outer_keys.append(spec.sentinel)
 
-        for truster in avatars:
-            # 1) Read the sentinel marker for this truster
-            sentinel_marker = self._read_trust_marker(var.slot, truster, self.SENTINEL, block_identifier)
+        lists = self._traverse_lists(var.slot, spec, outer_keys, block_identifier)
+        results = {}
+        for outer_key, entries in lists.items():
+            value = spec.format_entries(entries)
+            if value:
+                results[outer_key] = value
+        return results
 
-            # If the sentinel marker has zero_address as "previous", that means no trust list
-            if sentinel_marker.previous == self.ZERO_ADDRESS:
-                continue
+    def _resolve_keys(self, source: Any, block_identifier: Optional[int] = None) -> List[str]:
+        """Resolve the outer key source of a level-2 iteration"""
+        if isinstance(source, str):
+            keys = self._resolve_variable(source)
+        elif isinstance(source, dict):
+            spec = IterationSpec.from_dict(source)
+            keys = self._traverse_lists(source['slot'], spec, [None], block_identifier)[None]
+            keys = [key for key, _ in keys]
+        else:
+            keys = source
 
-            # 2) Follow the linked list starting from sentinel_marker.previous
-            current = sentinel_marker.previous
-            visited = set()
+        if isinstance(keys, dict):
+            keys = list(keys.keys())
+        return [to_checksum_address(key) for key in keys or []]
 
-            while current != self.SENTINEL and current not in visited:
-                visited.add(current)
-                current_marker = self._read_trust_marker(var.slot, truster, current, block_identifier)
-                
-                # If expiry > 0, record it
-                if current_marker.expiry > 0:
-                    if truster not in results:
-                        results[truster] = {}
-                    # Store trustee => expiry
-                    results[truster][current] = current_marker.expiry
+    def _traverse_lists(
+        self,
+        base_slot: int,
+        spec: IterationSpec,
+        outer_keys: List[Optional[str]],
+        block_identifier: Optional[int] = None
+    ) -> Dict[Optional[str], List[Tuple[str, Dict[str, Any]]]]:
+        """
+        Walk one linked list per outer key, advancing all of them together.
 
-                # Move to the next in the linked list
-                current = current_marker.previous
+        Every round reads the current entry of each unfinished list in a single
+        batch, so the number of round trips is bounded by the longest list
+        rather than the total number of entries.
+        """
+        reader = self._get_reader(block_identifier)
+        prefixes = {
+            outer_key: self._mapping_prefix(base_slot, outer_key)
+            for outer_key in outer_keys
+        }
+        entries: Dict[Optional[str], List[Tuple[str, Dict[str, Any]]]] = {k: [] for k in outer_keys}
+        visited: Dict[Optional[str], set] = {k: set() for k in outer_keys}
+        cursors: Dict[Optional[str], str] = {k: spec.sentinel for k in outer_keys}
+        stop = {spec.sentinel, ZERO_ADDRESS}
 
-        return results
+        while cursors:
+            active = list(cursors.items())
+            words = reader.read_slots(
+                self._mapping_location(prefixes[outer_key], key)
+                for outer_key, key in active
+            )
+            for (outer_key, key), word in zip(active, words):
+                value = int.from_bytes(word, byteorder='big')
+                fields = {f.name: f.decode(value) for f in spec.struct}
+                if key != spec.sentinel:
+                    entries[outer_key].append((key, fields))
 
+                next_key = fields[spec.next_field]
+                if next_key in stop or next_key in visited[outer_key]:
+                    del cursors[outer_key]
+                else:
+                    visited[outer_key].add(next_key)
+                    cursors[outer_key] = next_key
 
-    def _read_trust_marker(self, base_slot: int, truster: str, trustee: str, block_identifier: Optional[int] = None) -> TrustMarker:
-        """
-        Read a TrustMarker struct from storage using the correct struct layout:
-          struct TrustMarker {
-              address previous; // lower 160 bits, i.e. rightmost 20 bytes
-              uint96  expiry;   // upper 96 bits, i.e. leftmost 12 bytes
-          }
-        """
-        # Calculate storage slot
-        truster_bytes = bytes.fromhex(truster[2:].rjust(40, '0'))
-        truster_padded = truster_bytes.rjust(32, b'\x00')
+        return entries
+
+    @staticmethod
+    def _mapping_prefix(base_slot: int, outer_key: Optional[str]) -> bytes:
+        """Slot of the inner mapping for an outer key (or the base slot itself)"""
         slot_padded = base_slot.to_bytes(32, byteorder='big')
-        
-        intermediate_hash = keccak(truster_padded + slot_padded)
-        
-        trustee_bytes = bytes.fromhex(trustee[2:].rjust(40, '0'))
-        trustee_padded = trustee_bytes.rjust(32, b'\x00')
-        
-        final_hash = keccak(trustee_padded + intermediate_hash)
-        location = int.from_bytes(final_hash, byteorder='big')
-        
-        # Read storage slot
-        data = self._read_slot(location, block_identifier)
-        
-        # Parse TrustMarker struct:
-        # The first 12 bytes => expiry (uint96, stored in upper bits)
-        # The last 20 bytes => previous address
-        expiry = int.from_bytes(data[:12], byteorder='big')
-        previous = to_checksum_address(data[12:].hex())
-        
-        logger.debug(f"Storage slot for {truster}->{trustee}:")
-        logger.debug(f"  Location: {hex(location)}")
-        logger.debug(f"  Raw data: {data.hex()}")
-        logger.debug(f"  Parsed:")
-        logger.debug(f"    Previous: {previous}")
-        logger.debug(f"    Expiry: {expiry}")
-        
-        return TrustMarker(previous=previous, expiry=expiry)
+        if outer_key is None:
+            return slot_padded
+        outer_padded = bytes.fromhex(outer_key[2:].rjust(40, '0')).rjust(32, b'\x00')
+        return keccak(outer_padded + slot_padded)
+
+    @staticmethod
+    def _mapping_location(prefix: bytes, key: str) -> int:
+        """Storage location of `key` in the mapping rooted at `prefix`"""
+        key_padded = bytes.fromhex(key[2:].rjust(40, '0')).rjust(32, b'\x00')
+        return int.from_bytes(keccak(key_padded + prefix), byteorder='big')
 
     def _get_double_mapping_location(self, base_slot: int, truster: str, trustee: str) -> int:
         """
         Helper to compute the double mapping's final storage slot:
           trustMarkers[truster][trustee]
         """
-        truster_bytes = bytes.fromhex(truster[2:].rjust(40, '0')).rjust(32, b'\x00')
-        base_slot_bytes = base_slot.to_bytes(32, byteorder='big')
-        intermediate_hash = keccak(truster_bytes + base_slot_bytes)
-        
-        trustee_bytes = bytes.fromhex(trustee[2:].rjust(40, '0')).rjust(32, b'\x00')
-        final_hash = keccak(trustee_bytes + intermediate_hash)
-        return int.from_bytes(final_hash, byteorder='big')
+        return self._mapping_location(self._mapping_prefix(base_slot, truster), trustee)
+
+    def _get_reader(self, block_identifier: Optional[int] = None) -> StorageReader:
+        """Reader for the requested block, reusing the pinned one when possible"""
+        if self._reader is None or (
+            block_identifier is not None and block_identifier != self._reader.block_identifier
+        ):
+            self._reader = StorageReader(self.contract_address, block_identifier, self.max_workers)
+        return self._reader
 
     # Keep existing methods unchanged below
 
     def _read_slot(self, slot: int, block_identifier: Optional[int] = None) -> bytes:
         """Read a storage slot from the contract"""
-        return chain.provider.get_storage(self.contract_address, slot, block_identifier)
+        return self._get_reader(block_identifier).read_slot(slot)
 
     def _decode_uint256(self, slot: int, block_identifier: Optional[int] = None) -> int:
         """Decode a uint256 from storage"""
@@ -1,29 +1,63 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+import threading
 from ape import chain, networks
 from ape.types.events import LogFilter
 from datetime import datetime
+from eth_utils import keccak
 from src.framework.logging import get_logger
 from src.framework.data.event_logging import ContractEvent
+from src.framework.data.event_archive import EventArchive
 from eth_pydantic_types import HexBytes
 import logging
 
 logger = get_logger(__name__, logging.INFO)
 
+DEFAULT_START_BLOCK = 36873405
+DEFAULT_BLOCK_WINDOW = 10_000
+DEFAULT_MAX_WORKERS = 8
+
 @dataclass
 class EventConfig:
     """Configuration for event indexing"""
     name: str
     topics: Optional[List[str]] = None
+    start_block: Optional[int] = None
+
 
 class EventIndexer:
-    """Indexes historical events from contracts"""
-    
-    def __init__(self, config: Dict[str, Any], abis: List[Dict[str, Any]]):
+    """
+    Indexes historical events from contracts.
+
+    The block range of each event is split into fixed-size windows that are
+    fetched concurrently. Block timestamps and tx sender/receiver are then
+    resolved once per block (header cache + bulk block receipts) instead of
+    once per log.
+
+    With an EventArchive attached, fetched ranges are written to Parquet
+    and results are read back through the archive, so reruns start where the last run stopped and each block
+    range is only ever fetched from the node once. Without one nothing is
+    persisted, so every run indexes the full range.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        abis: List[Dict[str, Any]],
+        block_window: int = DEFAULT_BLOCK_WINDOW,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        archive: Optional[EventArchive] = None
+    ):
         """Initialize with configuration"""
         self.config = config
         self.abis = abis
+        self.archive = archive
+        self.block_window = block_window
+        self.max_workers = max_workers
         self._indexed_events: Dict[str, List[Dict]] = {}
+        self._block_cache: Dict[int, Dict[str, Any]] = {}
+        self._cache_lock = threading.Lock()
 
     def _convert_to_hex(self, value: Any) -> str:
         """Safely convert a value to hex string"""
@@ -35,6 +69,50 @@ class EventIndexer:
             return f"0x{value}"
         return str(value)
 
+    def _partition(self, start_block: int, stop_block: int, window: int) -> List[Tuple[int, int]]:
+        """Split [start_block, stop_block] into inclusive windows"""
+        return [
+            (block, min(block + window - 1, stop_block))
+            for block in range(start_block, stop_block + 1, window)
+        ]
+
+    def _fetch_window(self, address: str, event_abi: Any, window: Tuple[int, int]) -> List[Any]:
+        """Fetch the logs of one block window"""
+        log_filter = LogFilter(
+            addresses=[address],
+            events=[event_abi],
+            start_block=window[0],
+            stop_block=window[1]
+        )
+        return list(networks.provider.get_contract_logs(log_filter))
+
+    def _fetch_block(self, block_number: int) -> Dict[str, Any]:
+        """Fetch header timestamp and tx sender/receiver for one block"""
+        block = chain.provider.get_block(block_number)
+        txs: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+        try:
+            receipts = chain.provider.make_request('eth_getBlockReceipts', [hex(block_number)])
+            for receipt in receipts or []:
+                index = int(receipt['transactionIndex'], 16) if isinstance(receipt['transactionIndex'], str) \
+                    else receipt['transactionIndex']
+                txs[index] = (receipt.get('from'), receipt.get('to'))
+        except Exception as e:
+            logger.debug(f"Bulk receipts unavailable for block {block_number}, falling back: {e}")
+            for index, tx in enumerate(block.transactions):
+                txs[index] = (str(tx.sender), str(tx.receiver))
+        return {'timestamp': block.timestamp, 'txs': txs}
+
+    def _load_blocks(self, block_numbers: List[int]):
+        """Populate the block cache for all blocks not yet seen"""
+        missing = sorted({n for n in block_numbers if n not in self._block_cache})
+        if not missing:
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for number, data in zip(missing, executor.map(self._fetch_block, missing)):
+                with self._cache_lock:
+                    self._block_cache[number] = data
+        logger.debug(f"Cached {len(missing)} block headers ({len(self._block_cache)} total)")
+
     def index_contract_events(self, contract_id: str, client: Any, address: str) -> Dict[str, List[Dict]]:
         """Index events for a specific contract"""
         try:
@@ -42,18 +120,17 @@ class EventIndexer:
                 logger.debug(f"No event config for contract {contract_id}")
                 return {}
 
-            event_configs = self._get_event_configs(self.config[contract_id])
+            contract_config = self.config[contract_id]
+            event_configs = self._get_event_configs(contract_config)
             indexed_events = {}
-            
+
             # Get current block number
             current_block = chain.blocks.head.number
-            
-            # Get provider
-            provider = networks.provider
-            
+            window = contract_config.get('block_window', self.block_window)
+
             for event in event_configs:
                 logger.info(f"Indexing historical {event.name} events for {contract_id}")
-                
+
                 try:
                     # Get matching event ABI
                     event_abi = next((abi for abi in self.abis if abi.name == event.name), None)
@@ -61,49 +138,32 @@ class EventIndexer:
                         logger.warning(f"No ABI found for event {event.name}")
                         continue
 
-                    # Create proper LogFilter
-                    log_filter = LogFilter(
-                        addresses=[address],
-                        events=[event_abi],
-                        start_block=36873405,
-                        stop_block=current_block
-                    )
-                    
-                    indexed_events[event.name] = []
-                    
-                    # Get logs using provider
-                    logs = provider.get_contract_logs(log_filter)
-                    
-                    # Process logs
-                    for log in logs:
-                        try:
-                            # Get transaction from chain
-                            block = chain.blocks[log.block_number]
-                            tx = block.transactions[log.transaction_index]
-
-                            # Create ContractEvent
-                            contract_event = ContractEvent(
-                                simulation_run_id=0,  # Not relevant for historical
-                                event_name=event.name,
-                                block_number=log.block_number,
-                                block_timestamp=datetime.fromtimestamp(block.timestamp),
-                                transaction_hash=self._convert_to_hex(log.transaction_hash),
-                                tx_from=str(tx.sender),
-                                tx_to=str(tx.receiver),
-                                tx_index=log.transaction_index,
-                                log_index=log.log_index,
-                                contract_address=str(address),
-                                topic0=None,  # Skip topic0 as we don't have access to it
-                                event_data=log.event_arguments
-                            )
-                            
-                            indexed_events[event.name].append(contract_event)
-                            
-                        except Exception as e:
-                            logger.error(f"Failed to process log: {e}", exc_info=True)
-                            continue
-                        
-                    logger.info(f"Indexed {len(indexed_events[event.name])} {event.name} events from block 0 to {current_block}")
+                    first_block = event.start_block or contract_config.get('start_block', DEFAULT_START_BLOCK)
+                    # Resume only where earlier events can be read back: the
+                    # archive is authoritative for what has been indexed
+                    resume = self.archive.covered_until(address, event.name, first_block) if self.archive else None
+                    start_block = first_block if resume is None else max(first_block, resume + 1)
+
+                    new_events = []
+                    if start_block > current_block:
+                        logger.info(f"{event.name} for {contract_id} already indexed up to block {resume}")
+                    else:
+                        windows = self._partition(start_block, current_block, window)
+                        logs, last_block = self._fetch_windows(address, event_abi, windows)
+                        new_events = self._build_events(event.name, address, event_abi, logs)
+
+                        if last_block is not None and self.archive:
+                            self.archive.write(address, event.name, event_abi, new_events, start_block, last_block)
+
+                        logger.info(
+                            f"Indexed {len(new_events)} {event.name} events "
+                            f"from block {start_block} to {last_block} in {len(windows)} windows"
+                        )
+
+                    if self.archive:
+                        indexed_events[event.name] = self.archive.read(address, event.name, first_block)
+                    else:
+                        indexed_events[event.name] = new_events
 
                 except Exception as e:
                     logger.error(f"Failed to index {event.name} events: {e}", exc_info=True)
@@ -115,6 +175,75 @@ class EventIndexer:
             logger.error(f"Failed to index events for {contract_id}: {e}", exc_info=True)
             return {}
 
+    def _build_events(self, event_name: str, address: str, event_abi: Any, logs: List[Any]) -> List[ContractEvent]:
+        """Turn fetched logs into ContractEvents using the block cache"""
+        self._load_blocks([log.block_number for log in logs])
+        topic0 = '0x' + keccak(text=event_abi.selector).hex().upper()
+        events = []
+
+        for log in logs:
+            try:
+                block = self._block_cache[log.block_number]
+                tx_from, tx_to = block['txs'].get(log.transaction_index, (None, None))
+
+                # Create ContractEvent
+                events.append(ContractEvent(
+                    simulation_run_id=0,  # Not relevant for historical
+                    event_name=event_name,
+                    block_number=log.block_number,
+                    block_timestamp=datetime.fromtimestamp(block['timestamp']),
+                    transaction_hash=self._convert_to_hex(log.transaction_hash),
+                    tx_from=str(tx_from) if tx_from else None,
+                    tx_to=str(tx_to) if tx_to else None,
+                    tx_index=log.transaction_index,
+                    log_index=log.log_index,
+                    contract_address=str(address),
+                    topic0=topic0,
+                    event_data=log.event_arguments
+                ))
+
+            except Exception as e:
+                logger.error(f"Failed to process log: {e}", exc_info=True)
+                continue
+
+        return events
+
+    def _fetch_windows(
+        self,
+        address: str,
+        event_abi: Any,
+        windows: List[Tuple[int, int]]
+    ) -> Tuple[List[Any], Optional[int]]:
+        """
+        Fetch all windows concurrently.
+
+        Returns the logs of the leading run of successful windows, in chain
+        order, together with the last block of that run. Logs after the first
+        failed window are dropped so the archived range never skips a gap.
+        """
+        results: List[Optional[List[Any]]] = [None] * len(windows)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._fetch_window, address, event_abi, w)
+                for w in windows
+            ]
+            for i, future in enumerate(futures):
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to fetch blocks {windows[i][0]}-{windows[i][1]}: {e}")
+
+        logs: List[Any] = []
+        last_block = None
+        for w, window_logs in zip(windows, results):
+            if window_logs is None:
+                break
+            logs.extend(window_logs)
+            last_block = w[1]
+
+        logs.sort(key=lambda log: (log.block_number, log.log_index))
+        return logs, last_block
+
     def _get_event_configs(self, contract_config: Dict) -> List[EventConfig]:
         """Get event configs from contract config"""
         events = contract_config.get('events', [])
@@ -122,4 +251,4 @@ class EventIndexer:
             EventConfig(name=event) if isinstance(event, str)
             else EventConfig(**event)
             for event in events
-        ]
\ No newline at end of file
+        ]
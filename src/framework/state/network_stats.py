@@ -0,0 +1,113 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import heapq
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class NetworkStatsTracker:
+    """
+    Network statistics maintained incrementally from state changes.
+
+    Seeded once from the Hub state, then updated per change (trust upserts,
+    balance updates, registrations) by the state appliers, so taking a
+    snapshot for the network_stats table costs O(1) instead of scanning the
+    whole state. Trusts expiring with time are retired from a min-heap of
+    expiries when a snapshot is taken.
+
+    Balances are summed as stored (not demurraged to the snapshot day).
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.humans: Set[str] = set()
+        self._trusts: Dict[Tuple[str, str], int] = {}  # (truster, trustee) -> expiry
+        self._active: Set[Tuple[str, str]] = set()
+        self._expiries: List[Tuple[int, str, str]] = []
+        self._balances: Dict[Tuple[str, int], int] = {}
+        self._holdings: Dict[str, int] = {}  # account -> number of tokens held
+        self.total_supply = 0
+
+    def seed(self, hub_state: Dict[str, Any], timestamp: int, humans: Optional[Iterable[str]] = None):
+        """
+        Start over from a full Hub state (one pass).
+
+        Args:
+            hub_state: CirclesHub state with avatars, trustMarkers and token_balances
+            timestamp: Current block timestamp, for trust expiry
+            humans: The human avatars; avatars also hold groups and
+                organizations, while later humans only come from
+                RegisterHuman. Every avatar is counted when None.
+        """
+        self.reset()
+        for avatar in (hub_state.get('avatars') or []) if humans is None else humans:
+            self.add_human(avatar)
+        for truster, trustees in (hub_state.get('trustMarkers') or {}).items():
+            for trustee, expiry in trustees.items():
+                self.set_trust(truster, trustee, expiry, timestamp)
+        for account, tokens in (hub_state.get('token_balances') or {}).items():
+            for token_id, info in tokens.items():
+                self.set_balance(account, token_id, info['balance'])
+        logger.debug(
+            f"Seeded network stats: {len(self.humans)} humans, {len(self._active)} active trusts, "
+            f"{len(self._balances)} balances"
+        )
+
+    def add_human(self, address: str):
+        self.humans.add(address)
+
+    def set_trust(self, truster: str, trustee: str, expiry: int, timestamp: int):
+        """Record that truster trusts trustee until expiry (an expiry in the past untrusts)"""
+        key = (truster, trustee)
+        expiry = int(expiry)
+        self._trusts[key] = expiry
+        if truster != trustee and expiry > timestamp:
+            self._active.add(key)
+            heapq.heappush(self._expiries, (expiry, truster, trustee))
+        else:
+            self._active.discard(key)
+
+    def set_balance(self, account: str, token_id: int, balance: int):
+        """Record the current balance of (account, token_id); zero removes it"""
+        key = (account, int(token_id))
+        balance = int(balance)
+        previous = self._balances.pop(key, 0)
+        self.total_supply += balance - previous
+        if previous > 0:
+            self._holdings[account] -= 1
+            if not self._holdings[account]:
+                del self._holdings[account]
+        if balance > 0:
+            self._balances[key] = balance
+            self._holdings[account] = self._holdings.get(account, 0) + 1
+
+    def _expire(self, timestamp: int):
+        """Drop trusts whose expiry has passed"""
+        while self._expiries and self._expiries[0][0] <= timestamp:
+            expiry, truster, trustee = heapq.heappop(self._expiries)
+            key = (truster, trustee)
+            # Skip heap entries superseded by a later upsert
+            if self._trusts.get(key) == expiry:
+                self._active.discard(key)
+
+    def snapshot(self, timestamp: int) -> Dict[str, Any]:
+        """
+        Current statistics, in network_stats column order.
+
+        Returns:
+            total_humans, total_active_trusts, total_supply and average_balance
+            (decimal strings), trust_density
+        """
+        self._expire(timestamp)
+        humans = len(self.humans)
+        holders = len(self._holdings)
+        possible = humans * (humans - 1)
+        return {
+            'total_humans': humans,
+            'total_active_trusts': len(self._active),
+            'total_supply': str(self.total_supply),
+            'average_balance': str(self.total_supply // holders if holders else 0),
+            'trust_density': len(self._active) / possible if possible else 0.0,
+        }
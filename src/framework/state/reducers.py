@@ -0,0 +1,141 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
+from dataclasses import dataclass
+from src.framework.data.event_logging import DecodedReceiptCache, EventABIRegistry
+from src.framework.data.event_logging.abi_registry import topic_hex
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class LogEvent:
+    """A decoded log handed to reducers"""
+    name: str
+    args: Dict[str, Any]
+    contract_address: str
+    log_index: Optional[int]
+    tx: Any
+
+
+# A reducer turns one event into zero or more state deltas
+Reducer = Callable[[LogEvent], Optional[Iterable[Any]]]
+# An applier writes all deltas of one type produced by a transaction
+Applier = Callable[['SimulationContext', List[Any]], None]
+
+
+def _as_int(value: Any) -> Optional[int]:
+    """Receipt fields may be ints or hex strings"""
+    if isinstance(value, str):
+        return int(value, 16)
+    return value
+
+
+class ReducerPipeline:
+    """
+    Routes receipt logs to the reducers subscribed to their topic0.
+
+    Reducers receive already-decoded event arguments and return state
+    deltas; appliers registered per delta type then write every delta of a
+    transaction in one go. Logs without a subscriber are never decoded, so
+    the per-transaction cost follows the number of relevant logs.
+    """
+
+    def __init__(self, abi_registry: EventABIRegistry):
+        self.abi_registry = abi_registry
+        self._reducers: Dict[str, List[Reducer]] = {}
+        self._appliers: Dict[Type, Applier] = {}
+
+    def subscribe(self, event: str, reducer: Reducer):
+        """
+        Subscribe a reducer to an event.
+
+        Args:
+            event: Event name (all known signatures) or a topic0 hex string
+            reducer: Callable receiving a LogEvent and returning deltas
+        """
+        if event.startswith('0x'):
+            topics = [topic_hex(event)]
+        else:
+            topics = self.abi_registry.topics(event)
+            if not topics:
+                logger.warning(f"No ABI found for event {event}, reducer not registered")
+        for topic in topics:
+            self._reducers.setdefault(topic, []).append(reducer)
+
+    def register_applier(self, delta_type: Type, applier: Applier):
+        """Register the function writing deltas of delta_type; appliers run in registration order"""
+        self._appliers[delta_type] = applier
+
+    def _relevant_logs(self, tx: Any) -> Dict[Optional[int], str]:
+        """log index -> topic0 for every log with at least one subscriber"""
+        relevant = {}
+        for log in tx.logs:
+            topics = log.get('topics') or []
+            if not topics:
+                continue
+            topic = topic_hex(topics[0])
+            if topic in self._reducers:
+                relevant[_as_int(log.get('logIndex'))] = topic
+        return relevant
+
+    def reduce(self, tx: Any, receipt_cache: Optional[DecodedReceiptCache] = None) -> List[Any]:
+        """
+        Collect the state deltas produced by a transaction.
+
+        Decoded logs are taken from the receipt cache when another consumer
+        already decoded the receipt; otherwise only the relevant logs are
+        decoded.
+        """
+        relevant = self._relevant_logs(tx)
+        if not relevant:
+            return []
+
+        decoded_logs = receipt_cache.get(tx) if receipt_cache else None
+        if decoded_logs is None:
+            ecosystem = tx.provider.network.ecosystem
+            decoded_logs = []
+            for log in tx.logs:
+                if _as_int(log.get('logIndex')) in relevant:
+                    decoded_logs.extend(self.abi_registry.decode_log(log, ecosystem))
+
+        deltas = []
+        for decoded_log in decoded_logs:
+            topic = relevant.get(decoded_log.log_index)
+            if topic is None:
+                continue
+            event = LogEvent(
+                name=decoded_log.event_name,
+                args=dict(decoded_log.event_arguments),
+                contract_address=str(decoded_log.contract_address),
+                log_index=decoded_log.log_index,
+                tx=tx
+            )
+            for reducer in self._reducers[topic]:
+                try:
+                    deltas.extend(reducer(event) or [])
+                except Exception as e:
+                    logger.error(f"Reducer {getattr(reducer, '__name__', reducer)} failed on {event.name}: {e}")
+        return deltas
+
+    def apply(self, deltas: List[Any], context: 'SimulationContext'):
+        """Hand each applier the deltas of its type"""
+        for delta_type, applier in self._appliers.items():
+            batch = [delta for delta in deltas if isinstance(delta, delta_type)]
+            if not batch:
+                continue
+            try:
+                applier(context, batch)
+            except Exception as e:
+                logger.error(f"Failed to apply {len(batch)} {delta_type.__name__} deltas: {e}", exc_info=True)
+
+    def run(
+        self,
+        tx: Any,
+        context: 'SimulationContext',
+        receipt_cache: Optional[DecodedReceiptCache] = None
+    ) -> List[Any]:
+        """Reduce a transaction and apply the resulting deltas"""
+        deltas = self.reduce(tx, receipt_cache)
+        if deltas:
+            self.apply(deltas, context)
+        return deltas
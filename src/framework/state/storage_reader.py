@@ -0,0 +1,73 @@
+from typing import Dict, Iterable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from ape import chain
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class StorageReader:
+    """
+    Batched storage reader for a single contract.
+
+    Slots are fetched concurrently on a thread pool and cached per reader, so
+    a traversal that revisits a slot (or shares prefixes with another
+    traversal) never issues the same RPC twice. All reads are pinned to one
+    block so that parallel traversals observe a consistent snapshot.
+    """
+
+    def __init__(
+        self,
+        contract_address: str,
+        block_identifier: Optional[int] = None,
+        max_workers: int = 16
+    ):
+        self.contract_address = contract_address
+        self.block_identifier = (
+            block_identifier if block_identifier is not None
+            else chain.blocks.head.number
+        )
+        self.max_workers = max(1, max_workers)
+        self._cache: Dict[int, bytes] = {}
+        self._rpc_count = 0
+
+    def _fetch(self, slot: int) -> bytes:
+        """Fetch one slot from the provider"""
+        data = chain.provider.get_storage(self.contract_address, slot, self.block_identifier)
+        return bytes(data).rjust(32, b'\x00')
+
+    def read_slot(self, slot: int) -> bytes:
+        """Read a single storage slot"""
+        return self.read_slots([slot])[0]
+
+    def read_slots(self, slots: Iterable[int]) -> List[bytes]:
+        """
+        Read many storage slots in one batch.
+
+        Args:
+            slots: Slot locations to read
+
+        Returns:
+            32-byte words in the same order as `slots`
+        """
+        slots = list(slots)
+        missing = list({slot for slot in slots if slot not in self._cache})
+
+        if len(missing) == 1:
+            self._cache[missing[0]] = self._fetch(missing[0])
+        elif missing:
+            workers = min(self.max_workers, len(missing))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for slot, data in zip(missing, executor.map(self._fetch, missing)):
+                    self._cache[slot] = data
+        self._rpc_count += len(missing)
+
+        if missing:
+            logger.debug(f"Fetched {len(missing)} slots from {self.contract_address} ({self._rpc_count} total)")
+
+        return [self._cache[slot] for slot in slots]
+
+    @property
+    def rpc_count(self) -> int:
+        """Number of storage RPCs issued by this reader"""
+        return self._rpc_count
@@ -1,5 +1,6 @@
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+import time
 from eth_typing import HexStr
 from eth_pydantic_types import HexBytes
 from ape import Contract, chain
@@ -63,7 +64,16 @@ class MasterClient:
                 return False, "Implementation not found"
 
             # Get calls from implementation
+            started = time.perf_counter()
             calls = implementation.get_calls(context)
+            metrics = {
+                'call_generation_ms': (time.perf_counter() - started) * 1000,
+                'transaction_ms': 0.0,
+                'state_update_ms': 0.0,
+                'gas_used': 0,
+                'n_calls': len(calls) if calls else 0
+            }
+            context.action_metrics = metrics
             if not calls:
                 return False, "No calls generated"
 
@@ -83,14 +93,19 @@ class MasterClient:
                 try:
                     if hasattr(client, call.method):
                         method = getattr(client, call.method)
+                        started = time.perf_counter()
                         result = method(**call.params, context=context)
+                        metrics['transaction_ms'] += (time.perf_counter() - started) * 1000
                         
                         # If result is a transaction receipt, store it
                         if hasattr(result, 'status') and hasattr(result, 'decode_logs'):
                             all_receipts.append(result)
+                            metrics['gas_used'] += getattr(result, 'gas_used', 0) or 0
                             # Update state immediately after each successful call
                             if context and context.simulation:
+                                started = time.perf_counter()
                                 context.simulation.update_state_from_transaction(result, context)
+                                metrics['state_update_ms'] += (time.perf_counter() - started) * 1000
                         elif not result:
                             success=False
                                 
@@ -0,0 +1,195 @@
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+from src.framework.data.state_snapshots import StateChanges
+from src.framework.state.network_stats import NetworkStatsTracker
+from src.framework.state.reducers import LogEvent, ReducerPipeline
+from src.framework.logging import get_logger
+
+logger = get_logger(__name__)
+
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+
+
+@dataclass
+class TrustUpsert:
+    """truster trusts trustee until expiry"""
+    truster: str
+    trustee: str
+    expiry: int
+
+
+@dataclass
+class HumanRegistration:
+    """avatar registered as a human"""
+    avatar: str
+
+
+@dataclass
+class BalanceTouch:
+    """The Hub balance of (account, token_id) changed"""
+    account: str
+    token_id: int
+
+
+@dataclass
+class LBPRegistration:
+    """A pool was registered with the Balancer vault"""
+    pool_id: Any
+    pool_address: str
+    owner: str
+
+
+@dataclass
+class LBPTokens:
+    """Tokens were registered for a pool"""
+    pool_id: Any
+    tokens: List[str]
+
+
+def _same_address(a: Any, b: Any) -> bool:
+    return str(a).lower() == str(b).lower()
+
+
+def trust_reducer(hub_address: str):
+    """Trust(truster, trustee, expiryTime) on the Hub -> TrustUpsert"""
+    def reduce_trust(event: LogEvent) -> List[TrustUpsert]:
+        if not _same_address(event.contract_address, hub_address):
+            return []
+        truster = event.args.get('truster')
+        trustee = event.args.get('trustee')
+        expiry = event.args.get('expiryTime')
+        if truster and trustee and expiry:
+            return [TrustUpsert(truster, trustee, expiry)]
+        return []
+    return reduce_trust
+
+
+def register_human_reducer(hub_address: str):
+    """RegisterHuman(avatar, inviter) on the Hub -> HumanRegistration"""
+    def reduce_register_human(event: LogEvent) -> List[HumanRegistration]:
+        if not _same_address(event.contract_address, hub_address):
+            return []
+        avatar = event.args.get('avatar')
+        return [HumanRegistration(avatar)] if avatar else []
+    return reduce_register_human
+
+
+def transfer_reducer(hub_address: str):
+    """TransferSingle/TransferBatch on the Hub -> BalanceTouch per side and id"""
+    def reduce_transfer(event: LogEvent) -> List[BalanceTouch]:
+        if not _same_address(event.contract_address, hub_address):
+            return []
+        ids = event.args.get('ids')
+        if ids is None:
+            ids = [event.args.get('id')]
+        touches = []
+        for account in (event.args.get('from'), event.args.get('to')):
+            if not account or _same_address(account, ZERO_ADDRESS):
+                continue
+            touches.extend(BalanceTouch(account, token_id) for token_id in ids)
+        return touches
+    return reduce_transfer
+
+
+def reduce_pool_registered(event: LogEvent) -> List[LBPRegistration]:
+    """PoolRegistered(poolId, poolAddress, ...) -> LBPRegistration"""
+    return [LBPRegistration(
+        pool_id=event.args.get('poolId'),
+        pool_address=event.args.get('poolAddress'),
+        owner=event.tx.sender
+    )]
+
+
+def reduce_tokens_registered(event: LogEvent) -> List[LBPTokens]:
+    """TokensRegistered(poolId, tokens, ...) -> LBPTokens"""
+    return [LBPTokens(pool_id=event.args.get('poolId'), tokens=list(event.args.get('tokens') or []))]
+
+
+def apply_trusts(
+    context: 'SimulationContext',
+    deltas: List[TrustUpsert],
+    stats: Optional[NetworkStatsTracker] = None,
+    changes: Optional[StateChanges] = None
+):
+    """Upsert trustMarkers in the CirclesHub state"""
+    circles_state = context.network_state['contract_states']['CirclesHub']['state']
+    path = ('contract_states', 'CirclesHub', 'state', 'trustMarkers')
+    if not isinstance(circles_state.get('trustMarkers'), dict):
+        circles_state['trustMarkers'] = {}
+        if changes is not None:
+            changes.touch(*path)
+    timestamp = context.chain.blocks.head.timestamp if stats is not None else None
+    for delta in deltas:
+        circles_state['trustMarkers'].setdefault(delta.truster, {})[delta.trustee] = delta.expiry
+        if changes is not None:
+            changes.touch(*path, delta.truster, delta.trustee)
+        if stats is not None:
+            stats.set_trust(delta.truster, delta.trustee, delta.expiry, timestamp)
+        logger.debug(f"Updated trustMarkers: {delta.truster} trusts {delta.trustee} until {delta.expiry}")
+
+
+def lbp_state(
+    context: 'SimulationContext',
+    factory_address: str,
+    changes: Optional[StateChanges] = None
+) -> Dict[str, Any]:
+    """LBPs map of the BalancerV2LBPFactory state, created on first use"""
+    contract_states = context.network_state['contract_states']
+    if not isinstance(contract_states.get('BalancerV2LBPFactory'), dict):
+        contract_states['BalancerV2LBPFactory'] = {'address': factory_address, 'state': {}}
+    factory_state = contract_states['BalancerV2LBPFactory'].setdefault('state', {})
+    if not isinstance(factory_state.get('LBPs'), dict):
+        factory_state['LBPs'] = {}
+        if changes is not None:
+            # Covers the factory entry too, whichever level was missing
+            changes.touch('contract_states', 'BalancerV2LBPFactory')
+    return factory_state['LBPs']
+
+
+def register_circles_reducers(pipeline: ReducerPipeline, simulation: Any):
+    """Subscribe the Circles state reducers and their appliers"""
+    hub_address = simulation.CONTRACT_CONFIGS['circles']['address']
+    factory_address = simulation.CONTRACT_CONFIGS['balancerv2lbpfactory']['address']
+
+    lbps_path = ('contract_states', 'BalancerV2LBPFactory', 'state', 'LBPs')
+
+    def apply_lbp_registrations(context: 'SimulationContext', deltas: List[LBPRegistration]):
+        lbps = lbp_state(context, factory_address, simulation.state_changes)
+        for delta in deltas:
+            if delta.pool_id not in lbps:
+                lbps[delta.pool_id] = {'poolAddress': delta.pool_address, 'tokens': [], 'owner': delta.owner}
+                simulation.state_changes.touch(*lbps_path, delta.pool_id)
+                logger.debug(f"Registered LBP {delta.pool_address}")
+
+    def apply_lbp_tokens(context: 'SimulationContext', deltas: List[LBPTokens]):
+        lbps = lbp_state(context, factory_address, simulation.state_changes)
+        for delta in deltas:
+            if delta.pool_id in lbps:
+                lbps[delta.pool_id]['tokens'] = delta.tokens
+                simulation.state_changes.touch(*lbps_path, delta.pool_id, 'tokens')
+
+    def apply_trust_upserts(context: 'SimulationContext', deltas: List[TrustUpsert]):
+        apply_trusts(context, deltas, simulation.network_stats, simulation.state_changes)
+
+    def apply_registrations(context: 'SimulationContext', deltas: List[HumanRegistration]):
+        if simulation.network_stats is not None:
+            for delta in deltas:
+                simulation.network_stats.add_human(delta.avatar)
+
+    def apply_balances(context: 'SimulationContext', deltas: List[BalanceTouch]):
+        pairs = {(delta.account, delta.token_id) for delta in deltas}
+        simulation._refresh_token_balances(context, sorted(pairs))
+
+    pipeline.subscribe('Trust', trust_reducer(hub_address))
+    pipeline.subscribe('RegisterHuman', register_human_reducer(hub_address))
+    pipeline.subscribe('TransferSingle', transfer_reducer(hub_address))
+    pipeline.subscribe('TransferBatch', transfer_reducer(hub_address))
+    pipeline.subscribe('PoolRegistered', reduce_pool_registered)
+    pipeline.subscribe('TokensRegistered', reduce_tokens_registered)
+
+    # Appliers run in this order, so pools exist before their tokens are set
+    pipeline.register_applier(TrustUpsert, apply_trust_upserts)
+    pipeline.register_applier(HumanRegistration, apply_registrations)
+    pipeline.register_applier(LBPRegistration, apply_lbp_registrations)
+    pipeline.register_applier(LBPTokens, apply_lbp_tokens)
+    pipeline.register_applier(BalanceTouch, apply_balances)
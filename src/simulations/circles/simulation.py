@@ -1,11 +1,14 @@
 from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import random
-from eth_pydantic_types import HexBytes
 from ape import networks, chain
 
 from src.framework.simulation.base import BaseSimulation, BaseSimulationConfig
+from src.framework.state.network_stats import NetworkStatsTracker
+from src.framework.state.reducers import ReducerPipeline
+from src.simulations.circles.reducers import register_circles_reducers
 from src.framework.logging import get_logger
 from src.protocols.interfaces.circleshub import CirclesHubClient
 from src.protocols.interfaces.circleserc20lift import CirclesERC20LiftClient
@@ -51,6 +54,9 @@ class CirclesSimulationConfig(BaseSimulationConfig):
 
 class CirclesSimulation(BaseSimulation):
     """Implementation of a Rings-based simulation"""
+
+    # The reducers and balance refreshes report what they write
+    REPORTS_STATE_CHANGES = True
     
     CONTRACT_CONFIGS = {
         'circles': {
@@ -129,6 +135,7 @@ class CirclesSimulation(BaseSimulation):
         }
         
         super().__init__(config, contract_configs, fast_mode)
+        self.network_stats = NetworkStatsTracker()
             
         # Load pools data
         self._pools_data = self._load_pools_data()
@@ -327,142 +334,52 @@ class CirclesSimulation(BaseSimulation):
         }
 
 
+    def register_reducers(self, pipeline: ReducerPipeline) -> None:
+        """Trust, balance and LBP state follow Hub and vault events"""
+        register_circles_reducers(pipeline, self)
+
+    def seed_network_stats(self) -> None:
+        """Start the network statistics from the Hub state of the built network"""
+        hub_state = self.contract_states.get('CirclesHub', {}).get('state', {})
+        humans = self._human_avatars(hub_state.get('avatars') or [])
+        self.network_stats.seed(hub_state, chain.blocks.head.timestamp, humans)
+
+    def _human_avatars(self, avatars: List[str]) -> Optional[List[str]]:
+        """
+        The avatars registered as humans, asked of the Hub concurrently.
+
+        Avatars include groups and organizations, while later registrations
+        only come from RegisterHuman. The isHuman calls run on a thread pool
+        sized like the Hub's state decoder.
+        """
+        client = self.clients.get('circleshub')
+        if client is None or not avatars:
+            return None
+        max_workers = self.config.state_variables.get('CirclesHub', {}).get('max_workers', 16)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(avatars)))) as executor:
+            flags = list(executor.map(client.isHuman, avatars))
+        logger.debug(f"Checked {len(avatars)} avatars for humans on {max_workers} workers")
+        return [avatar for avatar, human in zip(avatars, flags) if human]
+
     def update_state_from_transaction(self, tx, context: 'SimulationContext') -> None:
         """Update simulation state based on transaction data."""
+        # MasterClient and the generated clients may both hand us the same receipt
+        if not self.receipt_cache.claim(tx, 'state_update'):
+            logger.debug(f"State already updated from {tx.txn_hash}")
+            return
+
         try:
-            circles_state = context.network_state['contract_states']['CirclesHub']['state']
-            involved_addresses = set()
-            client = context.get_client('circleshub')
-            if not client:
+            if not context.get_client('circleshub'):
                 return
 
-            def clean_address(value: Any) -> Optional[str]:
-                if not value:
-                    return None
-                if isinstance(value, (bytes, HexBytes)):
-                    value = value.hex()
-                if not isinstance(value, str):
-                    return None
-                value = value.replace('0x', '')
-                if len(value) == 64:
-                    value = value[-40:]
-                elif len(value) != 40:
-                    return None
-                if not all(c in '0123456789abcdefABCDEF' for c in value):
-                    return None
-                return f"0x{value}"[:42]
-
-            # First process Trust events and update trustMarkers
-            decoded_logs = tx.decode_logs(abi=self.abis)
-            trusts_updated = False
-            
-            for decoded_log in decoded_logs:
-                if decoded_log.event_name == 'Trust':
-                    event_data = decoded_log.event_arguments
-                    truster = event_data.get('truster')
-                    trustee = event_data.get('trustee')
-                    expiry = event_data.get('expiryTime')
-             
-                    if truster and trustee and expiry:
-                        # Update trust markers
-                        if not isinstance(circles_state.get('trustMarkers'), dict):
-                            circles_state['trustMarkers'] = {}
-                        if truster not in circles_state['trustMarkers']:
-                            circles_state['trustMarkers'][truster] = {}
-                        
-                        circles_state['trustMarkers'][truster][trustee] = expiry
-                        trusts_updated = True
-                        logger.debug(f"Updated trustMarkers: {truster} trusts {trustee} until {expiry}")
-                        
-                        # Add both addresses to involved set
-                        involved_addresses.add(truster)
-                        involved_addresses.add(trustee)
-
-                elif decoded_log.event_name == 'PoolRegistered':
-                    
-                    if not isinstance(context.network_state['contract_states'].get('BalancerV2LBPFactory'), dict):
-                        lbpfactory_state = context.network_state['contract_states']['BalancerV2LBPFactory'] =  {
-                            'address': self.CONTRACT_CONFIGS['balancerv2lbpfactory']['address'],
-                            'state': {}
-                            }
-                        
-                    lbpfactory_state = context.network_state['contract_states']['BalancerV2LBPFactory']['state']
-
-                    event_data = decoded_log.event_arguments
-                    poolId = event_data.get('poolId')
-                    poolAddress = event_data.get('poolAddress')
-
-                   
-                    if not isinstance(lbpfactory_state.get('LBPs'), dict):
-                        lbpfactory_state['LBPs'] = {}
-                    if poolId not in lbpfactory_state['LBPs']:
-                        lbpfactory_state['LBPs'][poolId] = {
-                            'poolAddress': poolAddress,
-                            'tokens': [],
-                            'owner': tx.sender
-                        }
-                        print(lbpfactory_state['LBPs'][poolId])
-                       
-
-                elif decoded_log.event_name == 'TokensRegistered':
-                    lbpfactory_state = context.network_state['contract_states']['BalancerV2LBPFactory']['state']
+            deltas = self.reducers.run(tx, context, self.receipt_cache)
+            logger.debug(f"Applied {len(deltas)} state deltas from {tx.txn_hash}")
 
-                    event_data = decoded_log.event_arguments
-                    poolId = event_data.get('poolId')
-                    tokens = event_data.get('tokens')
-                    lbpfactory_state['LBPs'][poolId]['tokens'] = tokens
-
-            
-            # Now collect all other involved addresses from the transaction
-            for decoded_log in decoded_logs:
-                event_data = decoded_log.event_arguments
-                for value in event_data.values():
-                    if isinstance(value, (str, bytes, HexBytes)):
-                        addr = clean_address(value)
-                        if addr:
-                            involved_addresses.add(addr)
-                    elif isinstance(value, (list, tuple)):
-                        for item in value:
-                            addr = clean_address(item)
-                            if addr:
-                                involved_addresses.add(addr)
-
-            if hasattr(tx, 'sender'):
-                addr = clean_address(tx.sender)
-                if addr:
-                    involved_addresses.add(addr)
-            if hasattr(tx, 'receiver'):
-                addr = clean_address(tx.receiver)
-                if addr:
-                    involved_addresses.add(addr)
-
-            logger.debug(f"Found involved addresses: {involved_addresses}")
-
-            # For each involved address, also get their trusted addresses
+            # Strategies can ask for balances that no Hub event touched
             additional_addresses = context.network_state.get('additional_balance_checks', [])
-            addresses_to_check = set(involved_addresses) | set(additional_addresses)
-
-            # Always check trust relationships for involved addresses 
-            """ 
-            for address in list(involved_addresses):
-                # Get addresses this account trusts
-                trust_markers = circles_state.get('trustMarkers', {}).get(address, {})
-                for trustee, expiry in trust_markers.items():
-                    if expiry > context.chain.blocks.head.timestamp:  # Only include active trusts
-                        addresses_to_check.add(trustee)
-                
-                # Get addresses that trust this account
-                for truster, trustees in circles_state.get('trustMarkers', {}).items():
-                    if address in trustees:
-                        if trustees[address] > context.chain.blocks.head.timestamp:
-                            addresses_to_check.add(truster)
-            """
-            logger.debug(f"Checking balances for addresses: {addresses_to_check}")
-            
-            # Update token balances for all affected addresses
-            if addresses_to_check:
-                self._update_token_balances(context, addresses_to_check)
-                        
+            if additional_addresses:
+                self._update_token_balances(context, set(additional_addresses))
+
         except Exception as e:
             logger.error(f"Failed to update state from transaction: {str(e)}", exc_info=True)
 
@@ -478,13 +395,7 @@ class CirclesSimulation(BaseSimulation):
         For each involved address, check their balance of all involved addresses' tokens.
         """
         client = context.get_client('circleshub')
-        if not client:
-            return
-
-        circles_state = context.network_state['contract_states']['CirclesHub']['state']
-        token_balances = circles_state.setdefault('token_balances', {})
-
-        if not addresses:
+        if not client or not addresses:
             return
 
         try:
@@ -503,53 +414,62 @@ class CirclesSimulation(BaseSimulation):
                 for token_addr, token_id in token_ids.items():  # tokens to check
                     balance_checks.append((address, token_id))
 
-            # Process in smaller batches to avoid gas issues
-            BATCH_SIZE = 50  # Adjust this number if needed
-            for i in range(0, len(balance_checks), BATCH_SIZE):
-                batch = balance_checks[i:i + BATCH_SIZE]
-                
-                accounts_list = []
-                ids_list = []
-                mapping = []
+            self._refresh_token_balances(context, balance_checks)
 
-                # Build lists for this batch
-                for account, token_id in batch:
-                    accounts_list.append(account)
-                    ids_list.append(token_id)
-                    mapping.append((account, token_id))
+        except Exception as e:
+            logger.error(f"Failed to update token balances: {e}", exc_info=True)
 
-                try:
-                    logger.debug(f"Querying batch of {len(accounts_list)} balances")
-                    balances = client.balanceOfBatch(accounts_list, ids_list)
-                    
-                    if balances is None:  # Handle failed query
-                        logger.warning(f"Failed to get balances for batch {i}")
-                        continue
-                        
-                    date_object = datetime.fromtimestamp(context.chain.blocks.head.timestamp).date()
-
-                    for (address, t_id), bal in zip(mapping, balances):
-                        if bal > 0:
-                            if address not in token_balances:
-                                token_balances[address] = {}
-                            token_balances[address][t_id] = {
-                                'balance': bal, 
-                                'last_day_updated': date_object
-                            }
-                            logger.debug(f"Updated balance for {address} token {t_id}: {bal}")
-                        else:
-                            # Clean up zero balances
-                            if address in token_balances and t_id in token_balances[address]:
-                                del token_balances[address][t_id]
-                                if not token_balances[address]:
-                                    del token_balances[address]
+    def _refresh_token_balances(self, context: 'SimulationContext', balance_checks: List[tuple]) -> None:
+        """Re-read the Hub balance of each (account, token_id) pair and store it in CirclesHub state"""
+        client = context.get_client('circleshub')
+        if not client or not balance_checks:
+            return
 
-                except Exception as e:
-                    logger.warning(f"Failed to process batch {i}: {e}")
+        circles_state = context.network_state['contract_states']['CirclesHub']['state']
+        path = ('contract_states', 'CirclesHub', 'state', 'token_balances')
+        if 'token_balances' not in circles_state:
+            self.state_changes.touch(*path)
+        token_balances = circles_state.setdefault('token_balances', {})
+
+        # Process in smaller batches to avoid gas issues
+        BATCH_SIZE = 50  # Adjust this number if needed
+        for i in range(0, len(balance_checks), BATCH_SIZE):
+            batch = balance_checks[i:i + BATCH_SIZE]
+            accounts_list = [account for account, _ in batch]
+            ids_list = [t_id for _, t_id in batch]
+
+            try:
+                logger.debug(f"Querying batch of {len(accounts_list)} balances")
+                balances = client.balanceOfBatch(accounts_list, ids_list)
+                
+                if balances is None:  # Handle failed query
+                    logger.warning(f"Failed to get balances for batch {i}")
                     continue
+                    
+                date_object = datetime.fromtimestamp(context.chain.blocks.head.timestamp).date()
 
-        except Exception as e:
-            logger.error(f"Failed to update token balances: {e}", exc_info=True)
+                for (address, t_id), bal in zip(batch, balances):
+                    if self.network_stats is not None:
+                        self.network_stats.set_balance(address, t_id, bal)
+                    self.state_changes.touch(*path, address, t_id)
+                    if bal > 0:
+                        if address not in token_balances:
+                            token_balances[address] = {}
+                        token_balances[address][t_id] = {
+                            'balance': bal, 
+                            'last_day_updated': date_object
+                        }
+                        logger.debug(f"Updated balance for {address} token {t_id}: {bal}")
+                    else:
+                        # Clean up zero balances
+                        if address in token_balances and t_id in token_balances[address]:
+                            del token_balances[address][t_id]
+                            if not token_balances[address]:
+                                del token_balances[address]
+
+            except Exception as e:
+                logger.warning(f"Failed to process batch {i}: {e}")
+                continue
 
     def _update_token_balances2(
         self, 
@@ -0,0 +1,98 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.framework.data.collector import DataCollector
+from src.framework.data.event_logging import ContractEvent
+
+SENDER = "0x" + "01" * 20
+RECEIVER = "0x" + "ab" * 20
+CONTRACT = "0x" + "cd" * 20
+
+
+def _event(run_id: int, block: int) -> ContractEvent:
+    return ContractEvent(
+        simulation_run_id=run_id,
+        event_name="Transfer",
+        block_number=block,
+        block_timestamp=datetime.now(),
+        transaction_hash=f"0x{block:064x}",
+        tx_from=SENDER,
+        tx_to=RECEIVER,
+        tx_index=0,
+        log_index=block,
+        contract_address=CONTRACT,
+        topic0="0x" + "0" * 64,
+        event_data={"value": block},
+    )
+
+
+def _agent(index: int) -> SimpleNamespace:
+    profile = SimpleNamespace(name="holder", description="", max_executions=1, action_configs={})
+    return SimpleNamespace(agent_id=f"agent-{index}", profile=profile, accounts={f"0x{index:040x}": None})
+
+
+@pytest.mark.parametrize("options", [{}, {"async_writes": True}, {"bulk_load": True}, {"shard_dir": "shards"}])
+def test_events_resolve_addresses_after_agents(tmp_path, options):
+    if "shard_dir" in options:
+        options = {**options, "shard_dir": str(tmp_path / options["shard_dir"])}
+    collector = DataCollector(str(tmp_path / "sim.duckdb"), **options)
+    try:
+        run_id = collector.start_simulation_run()
+        collector.record_agents([_agent(i) for i in range(3)])
+        collector.event_logger.record_event(_event(run_id, 1))
+        collector.flush()
+
+        rows = collector.con.execute(
+            "SELECT lower(tx_from), lower(tx_to), lower(contract_address) FROM events_view"
+        ).fetchall()
+        assert rows == [(SENDER, RECEIVER, CONTRACT)]
+        agents = collector.con.execute("SELECT lower(address) FROM agent_addresses_view ORDER BY agent_id").fetchall()
+        assert agents == [(f"0x{i:040x}",) for i in range(3)]
+    finally:
+        collector.close()
+
+
+def test_subscribers_receive_recorded_events(tmp_path):
+    collector = DataCollector(str(tmp_path / "sim.duckdb"))
+    received = []
+    try:
+        run_id = collector.start_simulation_run()
+        collector.subscribe_events(received.append)
+        for block in range(3):
+            collector.event_logger.record_event(_event(run_id, block))
+        assert collector.event_bus.drain(timeout=5)
+        assert [event.block_number for event in received] == [0, 1, 2]
+    finally:
+        collector.close()
+
+
+def test_shard_mode_reads_and_exports_every_run(tmp_path):
+    collector = DataCollector(str(tmp_path / "catalog.duckdb"), shard_dir=str(tmp_path / "runs"))
+    try:
+        for _ in range(2):
+            run_id = collector.start_simulation_run()
+            for block in range(3):
+                collector.record_state(block, datetime.now(), {"run": run_id, "block": block})
+            collector.end_simulation_run()
+
+        # Run 1 lives in a shard that is no longer the open one
+        assert [s["state_data"]["run"] for s in collector.get_state_history(1)] == [1, 1, 1]
+        assert collector.reconstruct_state(1, run_id=1) == {"run": 1, "block": 1}
+        assert collector.scan("state_snapshots", run_id=1).read_all().num_rows == 3
+
+        metadata = collector.export_to_parquet(str(tmp_path / "export"))
+        assert metadata["table_statistics"]["state_snapshots"]["row_count"] == 6
+    finally:
+        collector.close()
+
+
+def test_default_runs_write_without_events_indexes(tmp_path):
+    collector = DataCollector(str(tmp_path / "sim.duckdb"))
+    try:
+        collector.start_simulation_run()
+        indexes = collector.con.execute("SELECT index_name FROM duckdb_indexes() WHERE table_name = 'events'").fetchall()
+        assert indexes == []
+    finally:
+        collector.close()
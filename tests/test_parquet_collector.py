@@ -0,0 +1,80 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import duckdb
+
+from src.framework.data.event_logging import ContractEvent
+from src.framework.data.parquet_collector import ParquetDataCollector
+
+SENDER = "0x" + "a" * 40
+RECEIVER = "0x" + "b" * 40
+CONTRACT = "0x" + "c" * 40
+QUERIES = Path(__file__).resolve().parents[1] / "app" / "queries"
+
+
+def _event(run_id: int, block: int) -> ContractEvent:
+    return ContractEvent(
+        simulation_run_id=run_id,
+        event_name="Transfer",
+        block_number=block,
+        block_timestamp=datetime.now(),
+        transaction_hash=f"0x{block:064x}",
+        tx_from=SENDER,
+        tx_to=RECEIVER,
+        tx_index=0,
+        log_index=block,
+        contract_address=CONTRACT,
+        topic0="0x" + "0" * 64,
+        event_data={"value": block},
+    )
+
+
+def test_reads_during_a_run_see_every_row(tmp_path):
+    collector = ParquetDataCollector(str(tmp_path / "runs"), row_group_size=10)
+    run_id = collector.start_simulation_run()
+    try:
+        # 25 rows leave a part file open with two row groups and no footer
+        for block in range(25):
+            collector.record_event(_event(run_id, block))
+            if block % 5 == 0:
+                collector.record_state(block, datetime.now(), {"block": block})
+        collector.flush()
+
+        assert len(collector.get_events(limit=100)) == 25
+        assert collector.get_event_statistics()[0]["count"] == 25
+        assert [s["state_data"]["block"] for s in collector.get_state_history()] == [0, 5, 10, 15, 20]
+        history = collector.get_state_history_arrow(start_block=8).read_all()
+        assert history["block_number"].to_pylist() == [10, 15, 20]
+        assert [json.loads(s)["block"] for s in history["state_data"].to_pylist()] == [10, 15, 20]
+
+        # Rows buffered after a read are picked up by the next one
+        for block in range(25, 30):
+            collector.record_event(_event(run_id, block))
+        assert collector.scan("events").read_all().num_rows == 30
+
+        metadata = collector.export_to_parquet(str(tmp_path / "export"))
+        assert metadata["table_statistics"]["events"]["row_count"] == 30
+    finally:
+        collector.close()
+
+
+def test_views_match_the_duckdb_schema(tmp_path):
+    catalog = str(tmp_path / "catalog.duckdb")
+    collector = ParquetDataCollector(str(tmp_path / "runs"), db_path=catalog)
+    run_id = collector.start_simulation_run()
+    profile = SimpleNamespace(name="arbitrage_user", description="", max_executions=10, action_configs={})
+    collector.record_agents([SimpleNamespace(agent_id="agent-1", profile=profile, accounts={SENDER: None})])
+    for block in range(3):
+        collector.record_event(_event(run_id, block))
+    collector.close()
+
+    con = duckdb.connect(catalog, read_only=True)
+    try:
+        # Written against the DuckDB collector's address keys
+        rows = con.execute((QUERIES / "agents" / "events_by_profile.sql").read_text()).fetchall()
+        assert rows == [("arbitrage_user", "Transfer", 3, 3)]
+        assert con.execute("SELECT DISTINCT lower(tx_from) FROM events_view").fetchall() == [(SENDER,)]
+    finally:
+        con.close()
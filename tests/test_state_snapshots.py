@@ -0,0 +1,32 @@
+from src.framework.data.state_snapshots import (
+    DELTA, KEYFRAME, StateChanges, StateSnapshotEncoder, replay, to_jsonable
+)
+
+
+def test_deltas_from_reported_changes_replay_to_the_live_state():
+    encoder = StateSnapshotEncoder(keyframe_interval=10, compression=None)
+    changes = StateChanges()
+    state = {
+        'contract_states': {'CirclesHub': {'state': {
+            'trustMarkers': {'a': {'b': 1}},
+            'token_balances': {'a': {1: {'balance': 5}}},
+        }}},
+        'network_state': {'current_block': 0},
+    }
+    hub = state['contract_states']['CirclesHub']['state']
+    rows = [encoder.encode(state, changes.take())]
+
+    hub['trustMarkers'].setdefault('c', {})['a'] = 2
+    changes.touch('contract_states', 'CirclesHub', 'state', 'trustMarkers', 'c', 'a')
+    hub['token_balances']['c'] = {7: {'balance': 3}}
+    changes.touch('contract_states', 'CirclesHub', 'state', 'token_balances', 'c', 7)
+    state['network_state']['current_block'] = 1
+    rows.append(encoder.encode(state, changes.take() + [('network_state',)]))
+
+    # A balance dropping to zero removes the account entry altogether
+    del hub['token_balances']['a']
+    changes.touch('contract_states', 'CirclesHub', 'state', 'token_balances', 'a', 1)
+    rows.append(encoder.encode(state, changes.take()))
+
+    assert [row[0] for row in rows] == [KEYFRAME, DELTA, DELTA]
+    assert replay(rows) == to_jsonable(state)